@@ -7,7 +7,46 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     STORAGE_PATH: str = "./storage"
+    OFFER_UPLOAD_MAX_BYTES: int = 50 * 1024 * 1024
+    OFFER_UPLOAD_CHUNK_BYTES: int = 1024 * 1024
+    OFFER_BLOB_GC_INTERVAL_SECONDS: int = 86400
+    OFFER_DOWNLOAD_OFFLOAD: str = ""  # "", "x-accel-redirect" or "x-sendfile"
+    OFFER_DOWNLOAD_ACCEL_PREFIX: str = "/protected-storage/"
+    OFFER_STORAGE_BACKEND: str = "local"  # "local" or "s3"
+    OFFER_PRESIGN_EXPIRES_SECONDS: int = 900
+    S3_ENDPOINT_URL: str = ""  # empty for AWS; e.g. http://minio:9000
+    S3_PUBLIC_ENDPOINT_URL: str = ""  # as browsers reach it, if different
+    S3_REGION: str = "us-east-1"
+    S3_BUCKET: str = "mrk-offers"
+    S3_ACCESS_KEY_ID: str = ""
+    S3_SECRET_ACCESS_KEY: str = ""
     CORS_ORIGINS: str = "http://localhost:3000"
+    LEAD_COUNT_CACHE_TTL_SECONDS: int = 30
+    LEAD_COUNT_CACHE_MAX_ENTRIES: int = 1024
+    DASHBOARD_RECONCILE_INTERVAL_SECONDS: int = 3600
+    ROLLUP_REFRESH_INTERVAL_SECONDS: int = 300
+    ROLLUP_WATERMARK_LAG_SECONDS: int = 300
+    FUNNEL_CACHE_TTL_SECONDS: int = 600
+    FUNNEL_CACHE_MAX_ENTRIES: int = 256
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 4096
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    INGEST_BATCH_SIZE: int = 50
+    INGEST_POLL_INTERVAL_SECONDS: float = 1.0
+    INGEST_MAX_ATTEMPTS: int = 8
+    INGEST_RETRY_BASE_SECONDS: int = 5
+    INGEST_RETRY_MAX_SECONDS: int = 3600
+    WHATSAPP_COALESCE_WINDOW_SECONDS: float = 10.0
+    PHONE_FILTER_ERROR_RATE: float = 0.01
+    PHONE_FILTER_MIN_CAPACITY: int = 100000
+    PHONE_FILTER_REBUILD_INTERVAL_SECONDS: int = 3600
+    WEBHOOK_BATCH_MAX_ITEMS: int = 1000
+    WEBHOOK_IDEMPOTENCY_TTL_SECONDS: int = 172800
+    WEBHOOK_IDEMPOTENCY_PURGE_INTERVAL_SECONDS: int = 3600
+    CAMPAIGN_MATCHER_MAX_AGE_SECONDS: int = 60
+    PROJECT_TYPES_MAX_AGE_SECONDS: int = 300
 
     class Config:
         env_file = ".env"
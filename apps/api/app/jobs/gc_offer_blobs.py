@@ -0,0 +1,31 @@
+"""
+Delete offer blobs no offer references.
+
+    python -m app.jobs.gc_offer_blobs            # unreferenced blobs
+    python -m app.jobs.gc_offer_blobs --orphans  # also stray files (walks the store)
+"""
+import asyncio
+import sys
+
+from app.database import async_session_factory
+from app.services.offer_store import collect_garbage, remove_orphan_files
+
+
+async def gc_offer_blobs() -> int:
+    async with async_session_factory() as db:
+        removed = await collect_garbage(db)
+        await db.commit()
+    return removed
+
+
+async def remove_orphans() -> int:
+    async with async_session_factory() as db:
+        removed = await remove_orphan_files(db)
+        await db.commit()
+    return removed
+
+
+if __name__ == "__main__":
+    print(f"Deleted {asyncio.run(gc_offer_blobs())} unreferenced offer blobs.")
+    if "--orphans" in sys.argv[1:]:
+        print(f"Deleted {asyncio.run(remove_orphans())} orphaned offer files.")
@@ -0,0 +1,91 @@
+"""
+Move offers stored before offer_blobs (STORAGE_PATH/offers/<uuid>.pdf) into
+the content-addressed store. Safe to re-run; offers already moved are skipped.
+
+    python -m app.jobs.import_legacy_offers
+
+Each legacy file is copied to the staging directory and the copy is stored,
+so a failed upload never touches the original. Offers are committed one by
+one and an original is deleted only once its offer row points at the blob;
+an offer that fails is logged and left for the next run.
+"""
+import asyncio
+import contextlib
+import hashlib
+import logging
+import os
+import uuid
+
+from sqlalchemy import select, update
+
+from app.database import async_session_factory
+from app.models.offer import Offer
+from app.services.offer_store import put_blob, staging_dir
+from app.services.uploads import PART_SUFFIX, StoredUpload
+
+logger = logging.getLogger("app.jobs.import_legacy_offers")
+
+
+def _stage_copy(path: str) -> StoredUpload:
+    """Copy ``path`` into the staging directory, hashing it on the way."""
+    os.makedirs(staging_dir(), exist_ok=True)
+    staged = os.path.join(staging_dir(), f"{uuid.uuid4().hex}{PART_SUFFIX}")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, "rb") as source, open(staged, "wb") as out:
+            while chunk := source.read(1024 * 1024):
+                digest.update(chunk)
+                size += len(chunk)
+                out.write(chunk)
+            out.flush()
+            os.fsync(out.fileno())
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(staged)
+        raise
+    return StoredUpload(staged, size, digest.hexdigest())
+
+
+async def import_legacy_offers(batch_size: int = 100) -> int:
+    imported = 0
+    last_id = None
+    async with async_session_factory() as db:
+        while True:
+            # Plain rows: nothing to expire when an offer's transaction rolls back
+            query = select(Offer.id, Offer.file_path).where(Offer.blob_sha256.is_(None))
+            if last_id is not None:
+                query = query.where(Offer.id > last_id)
+            result = await db.execute(query.order_by(Offer.id).limit(batch_size))
+            offers = result.all()
+            await db.commit()
+            if not offers:
+                break
+            last_id = offers[-1].id
+            for offer in offers:
+                if not os.path.exists(offer.file_path):
+                    logger.warning("Offer %s: file %s is missing", offer.id, offer.file_path)
+                    continue
+                try:
+                    stored = await asyncio.to_thread(_stage_copy, offer.file_path)
+                    key = await put_blob(db, stored)
+                    await db.execute(
+                        update(Offer)
+                        .where(Offer.id == offer.id)
+                        .values(file_path=key, blob_sha256=stored.sha256)
+                    )
+                    await db.commit()
+                except Exception:
+                    await db.rollback()
+                    logger.exception("Offer %s: import failed, will retry on next run", offer.id)
+                    continue
+                # The legacy file belonged to this offer alone
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(offer.file_path)
+                imported += 1
+    return imported
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(f"Imported {asyncio.run(import_legacy_offers())} legacy offers.")
@@ -0,0 +1,77 @@
+"""
+Webhook ingest worker: drains webhook_events in batches until stopped.
+
+    python -m app.jobs.ingest_worker                        # run the worker
+    python -m app.jobs.ingest_worker --requeue-dead-letters # retry dead letters
+
+Several workers can run side by side; batches are claimed with SKIP LOCKED.
+"""
+import asyncio
+import logging
+import signal
+import sys
+
+from app.config import settings
+from app.database import async_session_factory
+from app.services import periodic
+from app.services.ingest_queue import drain_batch, requeue_dead_letters
+from app.services.phone_filter import rebuild_phone_filter, seed_phone_filter
+from app.services.project_types import load_project_types
+
+logger = logging.getLogger("app.jobs.ingest_worker")
+
+
+async def run_worker(stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        try:
+            async with async_session_factory() as db:
+                claimed = await drain_batch(db)
+                await db.commit()
+        except Exception:
+            logger.exception("Ingest batch failed")
+            claimed = 0
+
+        if claimed < settings.INGEST_BATCH_SIZE:
+            # Queue drained: poll again shortly (or stop)
+            try:
+                await asyncio.wait_for(
+                    stop.wait(), timeout=settings.INGEST_POLL_INTERVAL_SECONDS
+                )
+            except asyncio.TimeoutError:
+                pass
+
+
+async def main() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await load_project_types()
+    await seed_phone_filter()
+    periodic.register(
+        "rebuild_phone_filter",
+        settings.PHONE_FILTER_REBUILD_INTERVAL_SECONDS,
+        rebuild_phone_filter,
+    )
+    periodic.start()
+    logger.info("Ingest worker started")
+    try:
+        await run_worker(stop)
+    finally:
+        await periodic.stop()
+    logger.info("Ingest worker stopped")
+
+
+async def requeue() -> int:
+    async with async_session_factory() as db:
+        count = await requeue_dead_letters(db)
+        await db.commit()
+    return count
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if "--requeue-dead-letters" in sys.argv[1:]:
+        print(f"Requeued {asyncio.run(requeue())} dead letters.")
+    else:
+        asyncio.run(main())
@@ -0,0 +1,16 @@
+"""Delete expired webhook idempotency keys."""
+import asyncio
+
+from app.database import async_session_factory
+from app.services.idempotency import purge_expired
+
+
+async def purge_idempotency_keys() -> int:
+    async with async_session_factory() as db:
+        deleted = await purge_expired(db)
+        await db.commit()
+    return deleted
+
+
+if __name__ == "__main__":
+    print(f"Deleted {asyncio.run(purge_idempotency_keys())} expired idempotency keys.")
@@ -0,0 +1,15 @@
+"""Correct drift in the dashboard counters from leads."""
+import asyncio
+
+from app.database import engine
+from app.services.lead_stats import reconcile_counters
+
+
+async def reconcile_dashboard_stats() -> None:
+    async with engine.connect() as conn:
+        await reconcile_counters(conn)
+
+
+if __name__ == "__main__":
+    asyncio.run(reconcile_dashboard_stats())
+    print("Dashboard counters reconciled.")
@@ -0,0 +1,16 @@
+"""Bring the daily/monthly lead rollups up to date."""
+import asyncio
+
+from app.database import async_session_factory
+from app.services.rollups import refresh_rollups
+
+
+async def refresh_lead_rollups() -> None:
+    async with async_session_factory() as db:
+        await refresh_rollups(db)
+        await db.commit()
+
+
+if __name__ == "__main__":
+    asyncio.run(refresh_lead_rollups())
+    print("Lead rollups refreshed.")
@@ -1,21 +1,71 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
+from app.jobs.gc_offer_blobs import gc_offer_blobs
+from app.jobs.reconcile_dashboard_stats import reconcile_dashboard_stats
+from app.jobs.purge_idempotency_keys import purge_idempotency_keys
+from app.jobs.refresh_lead_rollups import refresh_lead_rollups
 from app.routers import (
     activities,
+    analytics,
     auth,
     campaign_mappings,
     leads,
+    metrics,
     offers,
+    project_types,
     users,
     webhooks,
 )
+from app.services import passwords, periodic
+from app.services.phone_filter import rebuild_phone_filter, seed_phone_filter
+from app.services.project_types import load_project_types
+
+periodic.register(
+    "reconcile_dashboard_stats",
+    settings.DASHBOARD_RECONCILE_INTERVAL_SECONDS,
+    reconcile_dashboard_stats,
+)
+periodic.register(
+    "refresh_lead_rollups",
+    settings.ROLLUP_REFRESH_INTERVAL_SECONDS,
+    refresh_lead_rollups,
+)
+periodic.register(
+    "purge_idempotency_keys",
+    settings.WEBHOOK_IDEMPOTENCY_PURGE_INTERVAL_SECONDS,
+    purge_idempotency_keys,
+)
+periodic.register(
+    "gc_offer_blobs",
+    settings.OFFER_BLOB_GC_INTERVAL_SECONDS,
+    gc_offer_blobs,
+)
+periodic.register(
+    "rebuild_phone_filter",
+    settings.PHONE_FILTER_REBUILD_INTERVAL_SECONDS,
+    rebuild_phone_filter,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await load_project_types()
+    await seed_phone_filter()
+    periodic.start()
+    yield
+    await periodic.stop()
+    passwords.shutdown()
+
 
 app = FastAPI(
     title="MRK CRM API",
     description="Backend API for MRK Construction CRM",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 origins = [o.strip() for o in settings.CORS_ORIGINS.split(",")]
@@ -39,6 +89,13 @@ app.include_router(
     prefix="/campaign-mappings",
     tags=["campaign-mappings"],
 )
+app.include_router(
+    project_types.router,
+    prefix="/project-types",
+    tags=["project-types"],
+)
+app.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
+app.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 
 
 @app.get("/health")
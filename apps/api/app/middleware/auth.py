@@ -2,18 +2,17 @@ import uuid
 from typing import Optional
 
 from fastapi import Cookie, Depends, HTTPException, Request, status
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models.user import User
 from app.services.auth import decode_token
+from app.services.principals import Principal, load_principal
 
 
 async def get_current_user(
     request: Request,
     db: AsyncSession = Depends(get_db),
-) -> User:
+) -> Principal:
     token = request.cookies.get("access_token")
     if not token:
         auth_header = request.headers.get("Authorization")
@@ -48,8 +47,7 @@ async def get_current_user(
             detail="טוקן לא תקין",
         )
 
-    result = await db.execute(select(User).where(User.id == uid))
-    user = result.scalar_one_or_none()
+    user = await load_principal(db, uid)
 
     if user is None or not user.is_active:
         raise HTTPException(
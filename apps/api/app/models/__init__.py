@@ -1,17 +1,32 @@
 from app.models.activity import Activity
 from app.models.campaign_mapping import CampaignMapping
 from app.models.lead import Lead
+from app.models.lead_bot_payload import LeadBotPayload
+from app.models.lead_rollup import LeadRollupDaily, LeadRollupMonthly, RollupWatermark
+from app.models.lead_stat_counter import LeadStatCounter
 from app.models.lead_status_history import LeadStatusHistory
 from app.models.offer import Offer
+from app.models.offer_blob import OfferBlob
 from app.models.project_type import ProjectType
 from app.models.user import User
+from app.models.webhook_event import WebhookDeadLetter, WebhookEvent
+from app.models.webhook_idempotency_key import WebhookIdempotencyKey
 
 __all__ = [
     "User",
     "ProjectType",
     "Lead",
+    "LeadBotPayload",
+    "LeadStatCounter",
+    "LeadRollupDaily",
+    "LeadRollupMonthly",
+    "RollupWatermark",
     "LeadStatusHistory",
     "Activity",
     "Offer",
+    "OfferBlob",
     "CampaignMapping",
+    "WebhookEvent",
+    "WebhookDeadLetter",
+    "WebhookIdempotencyKey",
 ]
@@ -5,12 +5,15 @@ from datetime import datetime
 from sqlalchemy import (
     Boolean,
     DateTime,
+    FetchedValue,
     ForeignKey,
     Index,
     Numeric,
     SmallInteger,
     String,
+    Text,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import ENUM, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -46,9 +49,51 @@ class LeadStatus(str, enum.Enum):
 class Lead(Base):
     __tablename__ = "leads"
     __table_args__ = (
-        Index("ix_leads_normalized_phone", "normalized_phone"),
+        # Webhook dedup: latest lead of a phone + project type
+        Index(
+            "ix_leads_phone_project_created_at",
+            "normalized_phone",
+            "project_type_id",
+            text("created_at DESC"),
+        ),
         Index("ix_leads_project_type_status", "project_type_id", "status"),
         Index("ix_leads_closer_status", "closer_id", "status"),
+        # Keyset pagination: one (sort column, id) index per sort key
+        Index("ix_leads_created_at_id", "created_at", "id"),
+        Index("ix_leads_updated_at_id", "updated_at", "id"),
+        Index("ix_leads_status_id", "status", "id"),
+        Index("ix_leads_temperature_id", "temperature", "id"),
+        # "Stuck in stage" lookups
+        Index("ix_leads_status_entered_at", "status", "status_entered_at"),
+        # Search (pg_trgm): substring/fuzzy name, email and phone lookups
+        Index(
+            "ix_leads_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_leads_email_trgm",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_leads_normalized_phone_trgm",
+            "normalized_phone",
+            postgresql_using="gin",
+            postgresql_ops={"normalized_phone": "gin_trgm_ops"},
+        ),
+        # Phone prefix and suffix lookups
+        Index(
+            "ix_leads_normalized_phone_prefix",
+            "normalized_phone",
+            postgresql_ops={"normalized_phone": "varchar_pattern_ops"},
+        ),
+        Index(
+            "ix_leads_normalized_phone_suffix",
+            text("reverse(normalized_phone) text_pattern_ops"),
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -84,8 +129,7 @@ class Lead(Base):
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=True
     )
 
-    # Bot fields
-    bot_payload: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    # Bot fields (raw payloads live in lead_bot_payloads)
     bot_track: Mapped[str | None] = mapped_column(String(50), nullable=True)
     bot_completed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
@@ -117,6 +161,20 @@ class Lead(Base):
     reno_type: Mapped[str | None] = mapped_column(String(100), nullable=True)
     reno_has_plan: Mapped[str | None] = mapped_column(String(50), nullable=True)
 
+    # Hebrew-normalized name/city/campaign text, see app.services.hebrew.
+    # Set by the leads_search_text trigger (migration 004).
+    search_text: Mapped[str | None] = mapped_column(
+        Text,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+        deferred=True,
+    )
+
+    # When the lead entered its current status
+    status_entered_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -0,0 +1,48 @@
+from datetime import date, datetime
+
+from sqlalchemy import BigInteger, Date, DateTime, ForeignKey, SmallInteger, String
+from sqlalchemy.dialects.postgresql import ENUM
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.models.lead import LeadSource, LeadStatus
+
+
+class _LeadRollupColumns:
+    """Shared columns of the daily and monthly lead rollups.
+
+    - leads_created: leads created in the bucket, by their current status
+    - status_entries: transitions into ``status`` that happened in the bucket
+    """
+
+    bucket: Mapped[date] = mapped_column(Date, primary_key=True)
+    project_type_id: Mapped[int] = mapped_column(
+        SmallInteger, ForeignKey("project_types.id"), primary_key=True
+    )
+    source: Mapped[LeadSource] = mapped_column(
+        ENUM(LeadSource, name="lead_source", create_type=False), primary_key=True
+    )
+    status: Mapped[LeadStatus] = mapped_column(
+        ENUM(LeadStatus, name="lead_status", create_type=False), primary_key=True
+    )
+    leads_created: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    status_entries: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+
+
+class LeadRollupDaily(_LeadRollupColumns, Base):
+    __tablename__ = "lead_rollups_daily"
+
+
+class LeadRollupMonthly(_LeadRollupColumns, Base):
+    __tablename__ = "lead_rollups_monthly"
+
+
+class RollupWatermark(Base):
+    """Last refresh point of an incrementally maintained rollup."""
+
+    __tablename__ = "rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    watermark: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
@@ -0,0 +1,30 @@
+from datetime import date
+
+from sqlalchemy import BigInteger, Date, ForeignKey, SmallInteger
+from sqlalchemy.dialects.postgresql import ENUM
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.models.lead import LeadSource, LeadStatus
+
+
+class LeadStatCounter(Base):
+    """Lead counts by creation month, project type, source and current status.
+
+    Maintained incrementally alongside every lead insert and status change;
+    the dashboard reads these rows instead of scanning leads.
+    """
+
+    __tablename__ = "lead_stat_counters"
+
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+    project_type_id: Mapped[int] = mapped_column(
+        SmallInteger, ForeignKey("project_types.id"), primary_key=True
+    )
+    source: Mapped[LeadSource] = mapped_column(
+        ENUM(LeadSource, name="lead_source", create_type=False), primary_key=True
+    )
+    status: Mapped[LeadStatus] = mapped_column(
+        ENUM(LeadStatus, name="lead_status", create_type=False), primary_key=True
+    )
+    lead_count: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
@@ -27,6 +27,10 @@ class Offer(Base):
         UUID(as_uuid=True), ForeignKey("leads.id", ondelete="CASCADE"), nullable=False
     )
     file_path: Mapped[str] = mapped_column(String(500), nullable=False)
+    # Content-addressed blob; NULL for offers stored before offer_blobs
+    blob_sha256: Mapped[str | None] = mapped_column(
+        String(64), ForeignKey("offer_blobs.sha256"), nullable=True, index=True
+    )
     amount_estimated: Mapped[float | None] = mapped_column(
         Numeric(12, 2), nullable=True
     )
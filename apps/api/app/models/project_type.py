@@ -12,5 +12,5 @@ class ProjectType(Base):
     display_name_he: Mapped[str] = mapped_column(String(100), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
-    # Relationships
-    leads = relationship("Lead", back_populates="project_type", lazy="selectin")
+    # Relationships (never loaded implicitly: a project type has every lead of its type)
+    leads = relationship("Lead", back_populates="project_type", lazy="raise")
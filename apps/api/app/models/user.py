@@ -32,8 +32,8 @@ class User(Base):
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
-    # Relationships
-    activities = relationship("Activity", back_populates="creator", lazy="selectin")
+    # Relationships (never loaded implicitly: a user's history grows without bound)
+    activities = relationship("Activity", back_populates="creator", lazy="raise")
     status_changes = relationship(
-        "LeadStatusHistory", back_populates="changed_by_user", lazy="selectin"
+        "LeadStatusHistory", back_populates="changed_by_user", lazy="raise"
     )
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, LargeBinary
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class WebhookIdempotencyKey(Base):
+    """A processed webhook delivery, see app.services.idempotency."""
+
+    __tablename__ = "webhook_idempotency_keys"
+    __table_args__ = (
+        Index("ix_webhook_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    # sha256 digest of the provider event id or payload
+    key: Mapped[bytes] = mapped_column(LargeBinary(32), primary_key=True)
+    response: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
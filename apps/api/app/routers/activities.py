@@ -8,8 +8,8 @@ from app.database import get_db
 from app.middleware.auth import get_current_user
 from app.models.activity import Activity
 from app.models.lead import Lead
-from app.models.user import User
 from app.schemas.activity import ActivityCreate, ActivityResponse
+from app.services.principals import Principal
 
 router = APIRouter()
 
@@ -17,7 +17,7 @@ router = APIRouter()
 @router.get("/leads/{lead_id}/activities", response_model=list[ActivityResponse])
 async def list_activities(
     lead_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(Lead).where(Lead.id == lead_id))
@@ -44,7 +44,7 @@ async def list_activities(
 async def create_activity(
     lead_id: uuid.UUID,
     body: ActivityCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(Lead).where(Lead.id == lead_id))
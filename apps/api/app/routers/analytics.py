@@ -0,0 +1,109 @@
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.middleware.auth import get_current_user
+from app.models.lead import Lead, LeadStatus
+from app.models.user import UserRole
+from app.schemas.analytics import FunnelResponse, LeadAnalyticsResponse
+from app.schemas.lead import LEAD_SUMMARY_FIELDS, LeadSummary
+from app.services.funnel import funnel_report
+from app.services.principals import Principal
+from app.services.rbac import apply_lead_visibility
+from app.services.rollups import ROLLUP_DIMENSIONS, query_rollups
+
+router = APIRouter()
+
+
+def _check_range(date_from: date, date_to: date) -> None:
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="טווח תאריכים לא תקין",
+        )
+
+
+def _parse_group_by(group_by: Optional[str]) -> list[str]:
+    if not group_by:
+        return []
+    dimensions = [d.strip() for d in group_by.split(",") if d.strip()]
+    unknown = [d for d in dimensions if d not in ROLLUP_DIMENSIONS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"מימד קיבוץ לא נתמך: {', '.join(unknown)}",
+        )
+    return list(dict.fromkeys(dimensions))
+
+
+@router.get("/leads", response_model=LeadAnalyticsResponse)
+async def lead_analytics(
+    date_from: date = Query(...),
+    date_to: date = Query(...),
+    group_by: Optional[str] = Query(
+        None, description="Comma-separated: project_type, source, status, month"
+    ),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    _check_range(date_from, date_to)
+    dimensions = _parse_group_by(group_by)
+
+    rows = await query_rollups(db, date_from, date_to, dimensions)
+    leads_created = sum(row["leads_created"] for row in rows)
+    wins = sum(row["wins"] for row in rows)
+    conversion_rate = round(wins / leads_created * 100, 1) if leads_created else 0.0
+
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "group_by": dimensions,
+        "rows": rows,
+        "totals": {
+            "leads_created": leads_created,
+            "wins": wins,
+            "conversion_rate": conversion_rate,
+        },
+    }
+
+
+@router.get("/funnel", response_model=FunnelResponse)
+async def lead_funnel(
+    date_from: date = Query(...),
+    date_to: date = Query(...),
+    project_type: Optional[str] = Query(None),
+    closer_id: Optional[uuid.UUID] = Query(None),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    _check_range(date_from, date_to)
+    # Closers only see their own funnel
+    if current_user.role == UserRole.closer:
+        closer_id = current_user.id
+    return await funnel_report(db, date_from, date_to, project_type, closer_id)
+
+
+@router.get("/stuck", response_model=list[LeadSummary])
+async def stuck_leads(
+    lead_status: LeadStatus = Query(..., alias="status"),
+    older_than_days: int = Query(7, ge=0, le=3650),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Leads that entered ``status`` more than ``older_than_days`` ago, oldest first."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    query = (
+        select(*(getattr(Lead, field) for field in LEAD_SUMMARY_FIELDS))
+        .where(Lead.status == lead_status, Lead.status_entered_at < cutoff)
+        .order_by(Lead.status_entered_at, Lead.id)
+        .limit(limit)
+    )
+    query = apply_lead_visibility(query, current_user)
+    result = await db.execute(query)
+    return result.all()
@@ -11,8 +11,9 @@ from app.services.auth import (
     create_access_token,
     create_refresh_token,
     decode_token,
-    verify_password,
 )
+from app.services.passwords import verify_password
+from app.services.principals import Principal
 from app.config import settings
 
 router = APIRouter()
@@ -50,7 +51,7 @@ async def login(
     result = await db.execute(select(User).where(User.email == body.email))
     user = result.scalar_one_or_none()
 
-    if user is None or not verify_password(body.password, user.password_hash):
+    if user is None or not await verify_password(body.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="אימייל או סיסמה שגויים",
@@ -107,5 +108,8 @@ async def logout(response: Response):
 
 
 @router.get("/me", response_model=UserResponse)
-async def me(current_user: User = Depends(get_current_user)):
-    return current_user
+async def me(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    return await db.get(User, current_user.id)
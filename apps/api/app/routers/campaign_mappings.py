@@ -7,12 +7,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.middleware.auth import get_current_user
 from app.models.campaign_mapping import CampaignMapping
-from app.models.user import User
 from app.schemas.campaign_mapping import (
     CampaignMappingCreate,
     CampaignMappingResponse,
     CampaignMappingUpdate,
 )
+from app.services.principals import Principal
 from app.services.rbac import require_admin
 
 router = APIRouter()
@@ -20,7 +20,7 @@ router = APIRouter()
 
 @router.get("", response_model=list[CampaignMappingResponse])
 async def list_campaign_mappings(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     require_admin(current_user)
@@ -39,7 +39,7 @@ async def list_campaign_mappings(
 )
 async def create_campaign_mapping(
     body: CampaignMappingCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     require_admin(current_user)
@@ -59,7 +59,7 @@ async def create_campaign_mapping(
 async def update_campaign_mapping(
     mapping_id: uuid.UUID,
     body: CampaignMappingUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     require_admin(current_user)
@@ -83,7 +83,7 @@ async def update_campaign_mapping(
 @router.delete("/{mapping_id}")
 async def delete_campaign_mapping(
     mapping_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     require_admin(current_user)
@@ -6,51 +6,83 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import Select
 
 from app.database import get_db
 from app.middleware.auth import get_current_user
 from app.models.lead import Lead, LeadStatus
+from app.models.lead_bot_payload import LeadBotPayload
 from app.models.lead_status_history import LeadStatusHistory
-from app.models.project_type import ProjectType
 from app.models.user import User, UserRole
+from app.schemas.dashboard import DashboardStats
 from app.schemas.lead import (
+    LEAD_SUMMARY_FIELDS,
     LeadAssignCloser,
+    LeadBotPayloadResponse,
+    LeadBoardColumn,
+    LeadBoardResponse,
     LeadCreate,
     LeadListResponse,
     LeadResponse,
+    LeadSearchHit,
+    LeadSummary,
     LeadTransition,
     LeadUpdate,
 )
+from app.services.lead_counts import COUNT_MODES, estimated_count, exact_count
+from app.services.lead_stats import (
+    counter_bucket,
+    dashboard_stats,
+    record_bucket_change,
+    record_lead_created,
+    record_status_change,
+)
+from app.services.pagination import (
+    apply_keyset,
+    apply_sort,
+    decode_cursor,
+    next_cursor,
+    validate_sort,
+)
 from app.services.phone import normalize_phone
-from app.services.rbac import check_lead_list_access, check_lead_transition
+from app.services.phone_filter import remember_leads
+from app.services.principals import Principal
+from app.services.project_types import get_project_types
+from app.services.rbac import (
+    apply_lead_visibility,
+    check_lead_list_access,
+    check_lead_transition,
+)
+from app.services.search import search_condition, typeahead
 
 router = APIRouter()
 
+LEAD_VIEWS = ("full", "summary")
+LEAD_COLUMN_FIELDS = frozenset(Lead.__table__.columns.keys())
 
-@router.get("", response_model=LeadListResponse)
-async def list_leads(
-    project_type_key: Optional[str] = Query(None),
-    status_filter: Optional[str] = Query(None, alias="status"),
-    assignee: Optional[str] = Query(None),
-    search: Optional[str] = Query(None),
-    bot_completed: Optional[bool] = Query(None),
-    temperature: Optional[str] = Query(None),
-    source: Optional[str] = Query(None),
-    page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-):
-    query = select(Lead)
 
-    if project_type_key:
-        pt_result = await db.execute(
-            select(ProjectType).where(ProjectType.key == project_type_key)
+def _parse_fields(fields: str) -> list[str]:
+    """Validate a comma-separated sparse fieldset; ``id`` is always included."""
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in LEAD_COLUMN_FIELDS]
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"שדות לא מוכרים: {', '.join(unknown) or fields}",
         )
-        pt = pt_result.scalar_one_or_none()
-        if pt:
-            query = query.where(Lead.project_type_id == pt.id)
-
+    return list(dict.fromkeys(["id", *requested]))
+
+
+def _apply_filters(
+    query: Select,
+    status_filter: Optional[str] = None,
+    assignee: Optional[str] = None,
+    search: Optional[str] = None,
+    bot_completed: Optional[bool] = None,
+    temperature: Optional[str] = None,
+    source: Optional[str] = None,
+) -> Select:
+    """Apply the shared list/board query-string filters."""
     if status_filter:
         try:
             ls = LeadStatus(status_filter)
@@ -76,54 +108,209 @@ async def list_leads(
         except ValueError:
             pass
 
-    if search:
-        search_term = f"%{search}%"
-        normalized_search = normalize_phone(search) if search.replace("+", "").replace("-", "").replace(" ", "").isdigit() else None
-        conditions = [
-            Lead.full_name.ilike(search_term),
-        ]
-        if normalized_search:
-            conditions.append(Lead.normalized_phone.like(f"%{normalized_search}%"))
-        else:
-            conditions.append(Lead.email.ilike(search_term))
-        query = query.where(or_(*conditions))
+    if search and search.strip():
+        query = query.where(search_condition(search))
 
-    # RBAC filtering
-    if current_user.role == UserRole.closer:
-        query = query.where(Lead.closer_id == current_user.id)
-    elif current_user.role == UserRole.qualifier:
-        query = query.where(
-            or_(
-                Lead.qualifier_id == None,
-                Lead.qualifier_id == current_user.id,
-                Lead.status == LeadStatus.new_lead,
-            )
+    return query
+
+
+@router.get("", response_model=LeadListResponse)
+async def list_leads(
+    project_type_key: Optional[str] = Query(None),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    assignee: Optional[str] = Query(None),
+    search: Optional[str] = Query(None),
+    bot_completed: Optional[bool] = Query(None),
+    temperature: Optional[str] = Query(None),
+    source: Optional[str] = Query(None),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    sort: str = Query("created_at"),
+    order: str = Query("desc"),
+    cursor: Optional[str] = Query(None),
+    count: str = Query("exact"),
+    view: str = Query("full"),
+    fields: Optional[str] = Query(None),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    validate_sort(sort, order)
+    if count not in COUNT_MODES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"סוג ספירה לא תקין. ערכים אפשריים: {', '.join(COUNT_MODES)}",
         )
+    if view not in LEAD_VIEWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="תצוגה לא תקינה",
+        )
+    output_fields = _parse_fields(fields) if fields else None
 
-    # Count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
+    query = select(Lead)
+
+    if project_type_key:
+        project_type_id = (await get_project_types(db)).id_of(project_type_key)
+        if project_type_id is not None:
+            query = query.where(Lead.project_type_id == project_type_id)
+
+    query = _apply_filters(
+        query,
+        status_filter=status_filter,
+        assignee=assignee,
+        search=search,
+        bot_completed=bot_completed,
+        temperature=temperature,
+        source=source,
+    )
+
+    # RBAC filtering
+    query = apply_lead_visibility(query, current_user)
 
-    # Paginate
-    query = query.order_by(Lead.created_at.desc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
+    # Count
+    total: Optional[int] = None
+    if count == "exact":
+        cache_key = (
+            current_user.role.value,
+            current_user.id,
+            project_type_key,
+            status_filter,
+            assignee,
+            search,
+            bot_completed,
+            temperature,
+            source,
+        )
+        total = await exact_count(db, query, cache_key)
+    elif count == "estimate":
+        total = await estimated_count(db, query)
+
+    # Projection: summary and sparse views select plain columns, so the
+    # relationships are not loaded. The sort column is always selected
+    # because the next cursor is built from it.
+    if output_fields is None and view == "summary":
+        output_fields = list(LEAD_SUMMARY_FIELDS)
+    if output_fields is not None:
+        selected = list(dict.fromkeys([*output_fields, sort]))
+        query = query.with_only_columns(*(getattr(Lead, f) for f in selected))
+
+    # Paginate: seek past the cursor when given, otherwise fall back to OFFSET.
+    # One extra row is fetched to tell whether another page exists.
+    query = apply_sort(query, sort, order)
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort, order)
+        query = apply_keyset(query, sort, order, value, last_id)
+    else:
+        query = query.offset((page - 1) * page_size)
+    query = query.limit(page_size + 1)
     result = await db.execute(query)
-    leads = result.scalars().all()
+    if output_fields is None:
+        leads = list(result.scalars().all())
+        items = [LeadResponse.model_validate(lead) for lead in leads[:page_size]]
+    else:
+        leads = list(result.all())
+        if fields:
+            items = [
+                {f: row._mapping[f] for f in output_fields}
+                for row in leads[:page_size]
+            ]
+        else:
+            items = [LeadSummary.model_validate(row) for row in leads[:page_size]]
 
     return LeadListResponse(
-        items=[LeadResponse.model_validate(lead) for lead in leads],
+        items=items,
         total=total,
         page=page,
         page_size=page_size,
-        pages=math.ceil(total / page_size) if total > 0 else 0,
+        pages=math.ceil(total / page_size) if total else 0,
+        total_kind=count,
+        next_cursor=next_cursor(leads, page_size, sort, order),
+    )
+
+
+@router.get("/dashboard/stats", response_model=DashboardStats)
+async def get_dashboard_stats(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    return await dashboard_stats(db)
+
+
+@router.get("/typeahead", response_model=list[LeadSearchHit])
+async def lead_typeahead(
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    rows = await typeahead(db, current_user, q, limit)
+    return [LeadSearchHit.model_validate(row) for row in rows]
+
+
+@router.get("/board/{project_type_key}", response_model=LeadBoardResponse)
+async def lead_board(
+    project_type_key: str,
+    limit: int = Query(20, ge=1, le=200),
+    assignee: Optional[str] = Query(None),
+    search: Optional[str] = Query(None),
+    bot_completed: Optional[bool] = Query(None),
+    temperature: Optional[str] = Query(None),
+    source: Optional[str] = Query(None),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Top ``limit`` cards of every status column plus column totals, in one query."""
+    project_type_id = (await get_project_types(db)).id_of(project_type_key)
+    if project_type_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="סוג פרויקט לא נמצא",
+        )
+    ranked = select(
+        *(getattr(Lead, f) for f in LEAD_SUMMARY_FIELDS),
+        func.row_number()
+        .over(
+            partition_by=Lead.status,
+            order_by=(Lead.created_at.desc(), Lead.id.desc()),
+        )
+        .label("column_rank"),
+        func.count().over(partition_by=Lead.status).label("column_total"),
+    ).where(Lead.project_type_id == project_type_id)
+    ranked = _apply_filters(
+        ranked,
+        assignee=assignee,
+        search=search,
+        bot_completed=bot_completed,
+        temperature=temperature,
+        source=source,
+    )
+    ranked = apply_lead_visibility(ranked, current_user).subquery()
+
+    result = await db.execute(
+        select(ranked)
+        .where(ranked.c.column_rank <= limit)
+        .order_by(ranked.c.status, ranked.c.column_rank)
+    )
+
+    columns = {
+        lead_status: LeadBoardColumn(status=lead_status, total=0, items=[])
+        for lead_status in LeadStatus
+    }
+    for row in result.all():
+        column = columns[row.status]
+        column.total = row.column_total
+        column.items.append(LeadSummary.model_validate(row))
+
+    return LeadBoardResponse(
+        project_type_key=project_type_key,
+        columns=list(columns.values()),
     )
 
 
 @router.post("", response_model=LeadResponse, status_code=status.HTTP_201_CREATED)
 async def create_lead(
     body: LeadCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     normalized = normalize_phone(body.phone)
@@ -155,6 +342,8 @@ async def create_lead(
     )
     db.add(history)
     await db.flush()
+    await record_lead_created(db, lead)
+    remember_leads([(lead.normalized_phone, lead.project_type_id)])
 
     return lead
 
@@ -162,7 +351,7 @@ async def create_lead(
 @router.get("/{lead_id}", response_model=LeadResponse)
 async def get_lead(
     lead_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(Lead).where(Lead.id == lead_id))
@@ -175,11 +364,34 @@ async def get_lead(
     return lead
 
 
+@router.get("/{lead_id}/bot-payloads", response_model=list[LeadBotPayloadResponse])
+async def list_bot_payloads(
+    lead_id: uuid.UUID,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Raw bot payloads of a lead, newest version first (the drawer's bot tab)."""
+    if await db.scalar(select(Lead.id).where(Lead.id == lead_id)) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="ליד לא נמצא",
+        )
+
+    result = await db.execute(
+        select(LeadBotPayload)
+        .where(LeadBotPayload.lead_id == lead_id)
+        .order_by(LeadBotPayload.version.desc())
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
 @router.patch("/{lead_id}", response_model=LeadResponse)
 async def update_lead(
     lead_id: uuid.UUID,
     body: LeadUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(Lead).where(Lead.id == lead_id))
@@ -195,11 +407,17 @@ async def update_lead(
     if "phone" in update_data:
         update_data["normalized_phone"] = normalize_phone(update_data["phone"])
 
+    bucket = counter_bucket(lead)
     for key, value in update_data.items():
         setattr(lead, key, value)
 
     await db.flush()
+    # Keep the dashboard counters right if a counted dimension was edited
+    await record_bucket_change(db, bucket, lead)
     await db.refresh(lead)
+    if "phone" in update_data or "project_type_id" in update_data:
+        # The lead now answers webhook dedup under its new key
+        remember_leads([(lead.normalized_phone, lead.project_type_id)])
     return lead
 
 
@@ -207,7 +425,7 @@ async def update_lead(
 async def transition_lead(
     lead_id: uuid.UUID,
     body: LeadTransition,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(Lead).where(Lead.id == lead_id))
@@ -222,6 +440,7 @@ async def transition_lead(
 
     old_status = lead.status
     lead.status = body.to_status
+    lead.status_entered_at = func.now()
 
     history = LeadStatusHistory(
         lead_id=lead.id,
@@ -231,6 +450,7 @@ async def transition_lead(
     )
     db.add(history)
     await db.flush()
+    await record_status_change(db, lead, old_status, body.to_status)
     await db.refresh(lead)
     return lead
 
@@ -239,7 +459,7 @@ async def transition_lead(
 async def assign_closer(
     lead_id: uuid.UUID,
     body: LeadAssignCloser,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     if current_user.role not in (UserRole.admin, UserRole.qualifier):
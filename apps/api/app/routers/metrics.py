@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.middleware.auth import get_current_user
+from app.services import passwords
+from app.services.campaign_matcher import matcher_info
+from app.services.ingest_queue import queue_stats
+from app.services.phone_filter import filter_info
+from app.services.principals import Principal
+from app.services.project_types import registry_info
+from app.services.rbac import require_admin
+
+router = APIRouter()
+
+
+@router.get("")
+async def get_metrics(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """In-process counters of this API worker, plus the ingest queue state."""
+    require_admin(current_user)
+    return {
+        "password_hasher": passwords.metrics(),
+        "ingest_queue": await queue_stats(db),
+        "campaign_matcher": matcher_info(),
+        "phone_filter": filter_info(),
+        "project_types": registry_info(),
+    }
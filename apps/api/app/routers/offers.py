@@ -1,8 +1,16 @@
-import os
 import uuid
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
-from fastapi.responses import FileResponse
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Request,
+    UploadFile,
+    status,
+)
+from fastapi.responses import RedirectResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -11,8 +19,24 @@ from app.database import get_db
 from app.middleware.auth import get_current_user
 from app.models.lead import Lead
 from app.models.offer import Offer, OfferStatus
-from app.models.user import User
-from app.schemas.offer import OfferResponse, OfferUpdate
+from app.schemas.offer import (
+    OfferFromUpload,
+    OfferResponse,
+    OfferUpdate,
+    OfferUploadRequest,
+    OfferUploadTarget,
+)
+from app.services.downloads import file_response
+from app.services.offer_store import (
+    attach_blob,
+    blob_key,
+    put_blob,
+    staging_dir,
+    upload_target,
+)
+from app.services.principals import Principal
+from app.services.storage import get_storage
+from app.services.uploads import receive_pdf
 
 router = APIRouter()
 
@@ -20,7 +44,7 @@ router = APIRouter()
 @router.get("/leads/{lead_id}/offers", response_model=list[OfferResponse])
 async def list_offers(
     lead_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(Lead).where(Lead.id == lead_id))
@@ -45,7 +69,7 @@ async def create_offer(
     file: UploadFile = File(...),
     offer_status: str = Form("draft"),
     amount_estimated: float | None = Form(None),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(Lead).where(Lead.id == lead_id))
@@ -66,19 +90,13 @@ async def create_offer(
             detail="סטטוס הצעה לא תקין",
         )
 
-    offers_dir = os.path.join(settings.STORAGE_PATH, "offers")
-    os.makedirs(offers_dir, exist_ok=True)
-
-    file_id = str(uuid.uuid4())
-    file_path = os.path.join(offers_dir, f"{file_id}.pdf")
-
-    content = await file.read()
-    with open(file_path, "wb") as f:
-        f.write(content)
+    staged = await receive_pdf(file, staging_dir())
+    key = await put_blob(db, staged)
 
     offer = Offer(
         lead_id=lead_id,
-        file_path=file_path,
+        file_path=key,
+        blob_sha256=staged.sha256,
         status=offer_st,
         amount_estimated=amount_estimated,
     )
@@ -88,10 +106,58 @@ async def create_offer(
     return offer
 
 
+@router.post("/leads/{lead_id}/offers/uploads", response_model=OfferUploadTarget)
+async def create_offer_upload(
+    lead_id: uuid.UUID,
+    body: OfferUploadRequest,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Where to send an offer PDF: nowhere (already stored), a presigned URL, or the API."""
+    result = await db.execute(select(Lead).where(Lead.id == lead_id))
+    if not result.scalar_one_or_none():
+        raise HTTPException(status_code=404, detail="ליד לא נמצא")
+
+    target = await upload_target(db, body.sha256, body.size)
+    return OfferUploadTarget(**target._asdict())
+
+
+@router.post(
+    "/leads/{lead_id}/offers/uploaded",
+    response_model=OfferResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_offer_from_upload(
+    lead_id: uuid.UUID,
+    body: OfferFromUpload,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Create an offer for a PDF already in storage (see create_offer_upload)."""
+    result = await db.execute(select(Lead).where(Lead.id == lead_id))
+    if not result.scalar_one_or_none():
+        raise HTTPException(status_code=404, detail="ליד לא נמצא")
+
+    key = await attach_blob(db, body.sha256)
+
+    offer = Offer(
+        lead_id=lead_id,
+        file_path=key,
+        blob_sha256=body.sha256,
+        status=body.status,
+        amount_estimated=body.amount_estimated,
+    )
+    db.add(offer)
+    await db.flush()
+    await db.refresh(offer)
+    return offer
+
+
 @router.get("/offers/{offer_id}/download")
 async def download_offer(
     offer_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(Offer).where(Offer.id == offer_id))
@@ -99,13 +165,34 @@ async def download_offer(
     if not offer:
         raise HTTPException(status_code=404, detail="הצעה לא נמצאה")
 
-    if not os.path.exists(offer.file_path):
-        raise HTTPException(status_code=404, detail="קובץ לא נמצא")
+    filename = f"offer_{offer_id}.pdf"
+    if not offer.blob_sha256:
+        # Stored before offer_blobs: a local file, validated by mtime and size
+        return await file_response(
+            request, offer.file_path, media_type="application/pdf", filename=filename
+        )
 
-    return FileResponse(
-        offer.file_path,
+    storage = get_storage()
+    key = blob_key(offer.blob_sha256)
+    url = storage.presigned_download(key, filename)
+    if url is not None:
+        # The redirect is cached for half the URL's lifetime, so repeat
+        # downloads reuse one URL and hit the browser cache for the PDF
+        return RedirectResponse(
+            url,
+            status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+            headers={
+                "Cache-Control": f"private, max-age={settings.OFFER_PRESIGN_EXPIRES_SECONDS // 2}"
+            },
+        )
+    # Blobs are content-addressed, so their hash is a strong ETag that needs
+    # no stat
+    return await file_response(
+        request,
+        storage.local_path(key),
         media_type="application/pdf",
-        filename=f"offer_{offer_id}.pdf",
+        filename=filename,
+        etag=f'"{offer.blob_sha256}"',
     )
 
 
@@ -113,7 +200,7 @@ async def download_offer(
 async def update_offer(
     offer_id: uuid.UUID,
     body: OfferUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(Offer).where(Offer.id == offer_id))
@@ -0,0 +1,39 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import get_db
+from app.middleware.auth import get_current_user
+from app.schemas.lead import ProjectTypeResponse
+from app.services.principals import Principal
+from app.services.project_types import get_project_types
+
+router = APIRouter()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+@router.get("", response_model=list[ProjectTypeResponse])
+async def list_project_types(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """All project types, from the in-memory registry; revalidated by ETag."""
+    registry = await get_project_types(db)
+    headers = {
+        "ETag": registry.etag,
+        "Cache-Control": f"private, max-age={settings.PROJECT_TYPES_MAX_AGE_SECONDS}",
+    }
+    if _etag_matches(if_none_match, registry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return [entry._asdict() for entry in registry.entries]
@@ -8,7 +8,8 @@ from app.database import get_db
 from app.middleware.auth import get_current_user
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, UserUpdate
-from app.services.auth import hash_password
+from app.services.passwords import hash_password
+from app.services.principals import Principal
 from app.services.rbac import require_admin
 
 router = APIRouter()
@@ -16,7 +17,7 @@ router = APIRouter()
 
 @router.get("", response_model=list[UserResponse])
 async def list_users(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     require_admin(current_user)
@@ -27,7 +28,7 @@ async def list_users(
 @router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(
     body: UserCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     require_admin(current_user)
@@ -42,7 +43,7 @@ async def create_user(
     user = User(
         name=body.name,
         email=body.email,
-        password_hash=hash_password(body.password),
+        password_hash=await hash_password(body.password),
         role=body.role,
     )
     db.add(user)
@@ -55,7 +56,7 @@ async def create_user(
 async def update_user(
     user_id: uuid.UUID,
     body: UserUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     require_admin(current_user)
@@ -70,7 +71,9 @@ async def update_user(
 
     update_data = body.model_dump(exclude_unset=True)
     if "password" in update_data:
-        update_data["password_hash"] = hash_password(update_data.pop("password"))
+        update_data["password_hash"] = await hash_password(
+            update_data.pop("password")
+        )
 
     if "email" in update_data and update_data["email"] != user.email:
         existing = await db.execute(
@@ -1,203 +1,113 @@
-from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import and_, select
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import get_db
-from app.models.campaign_mapping import CampaignMapping
-from app.models.lead import Lead, LeadSource, LeadStatus
-from app.models.lead_status_history import LeadStatusHistory
-from app.models.project_type import ProjectType
-from app.services.lead_mapping import map_bot_payload, resolve_track
-from app.services.phone import normalize_phone
+from app.services.idempotency import (
+    claim,
+    idempotency_key,
+    save_responses,
+    stored_responses,
+)
+from app.services.ingest_queue import enqueue
+from app.services.webhook_ingest import ingest_meta_batch
 
 router = APIRouter()
 
+REPLAY_HEADER = "Idempotent-Replay"
 
-async def _get_project_type_by_key(db: AsyncSession, key: str) -> int:
-    result = await db.execute(select(ProjectType).where(ProjectType.key == key))
-    pt = result.scalar_one_or_none()
-    if pt:
-        return pt.id
-    # Default to renovation
-    result = await db.execute(select(ProjectType).where(ProjectType.key == "renovation"))
-    pt = result.scalar_one_or_none()
-    return pt.id if pt else 3
 
+def _require_phone(payload: dict[str, Any]) -> None:
+    if not payload.get("phone"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="מספר טלפון חסר",
+        )
 
-async def _resolve_campaign_to_project_type(
-    db: AsyncSession, campaign_name: str | None
-) -> str:
-    if not campaign_name:
-        return "renovation"
-
-    result = await db.execute(
-        select(CampaignMapping)
-        .where(CampaignMapping.is_active == True)
-        .order_by(CampaignMapping.priority.asc())
-    )
-    mappings = result.scalars().all()
 
-    campaign_lower = campaign_name.lower()
-    for mapping in mappings:
-        if mapping.contains_text.lower() in campaign_lower:
-            return mapping.project_type_key
+async def _queue_once(
+    db: AsyncSession, response: Response, source: str, payload: dict[str, Any]
+) -> dict[str, Any]:
+    """Queue a delivery unless it is a retry, in which case replay the first response."""
+    key = idempotency_key(source, payload)
+    if not await claim(db, [key]):
+        response.headers[REPLAY_HEADER] = "true"
+        return (await stored_responses(db, [key]))[key]
 
-    return "renovation"
+    event_id = await enqueue(db, source, payload)
+    body = {"status": "queued", "event_id": event_id}
+    await save_responses(db, {key: body})
+    return body
 
 
-@router.post("/meta")
+@router.post("/meta", status_code=status.HTTP_202_ACCEPTED)
 async def meta_webhook(
     payload: dict[str, Any],
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+):
+    """Queue a Meta lead-ads payload; the ingest worker creates/dedups the lead."""
+    _require_phone(payload)
+    return await _queue_once(db, response, "meta", payload)
+
+
+@router.post("/meta/batch")
+async def meta_webhook_batch(
+    payloads: list[dict[str, Any]],
     db: AsyncSession = Depends(get_db),
 ):
-    phone = payload.get("phone")
-    if not phone:
+    """Ingest many Meta payloads at once (backfills, landing-page bursts).
+
+    Processed synchronously with set-based dedup; returns one result per
+    payload, in order. Items already delivered before get their original
+    result back (with ``replayed: true``) and are not processed again.
+    """
+    if not payloads or len(payloads) > settings.WEBHOOK_BATCH_MAX_ITEMS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="מספר טלפון חסר",
+            detail=f"יש לשלוח בין 1 ל-{settings.WEBHOOK_BATCH_MAX_ITEMS} לידים בבקשה",
         )
 
-    full_name = payload.get("full_name") or payload.get("name") or "ליד מטא"
-    email = payload.get("email")
-    campaign_name = payload.get("campaign_name") or payload.get("campaign")
-    adset_name = payload.get("adset_name") or payload.get("adset")
-    ad_name = payload.get("ad_name") or payload.get("ad")
-
-    normalized = normalize_phone(str(phone))
-    project_type_key = await _resolve_campaign_to_project_type(db, campaign_name)
-    project_type_id = await _get_project_type_by_key(db, project_type_key)
-
-    # Dedup: check for existing lead with same phone + project type within 30 days
-    thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-    result = await db.execute(
-        select(Lead).where(
-            and_(
-                Lead.normalized_phone == normalized,
-                Lead.project_type_id == project_type_id,
-                Lead.created_at >= thirty_days_ago,
-            )
-        ).order_by(Lead.created_at.desc())
-    )
-    existing_lead = result.scalars().first()
-
-    if existing_lead:
-        # Update existing lead
-        if campaign_name:
-            existing_lead.campaign_name = campaign_name
-        if adset_name:
-            existing_lead.adset_name = adset_name
-        if ad_name:
-            existing_lead.ad_name = ad_name
-        if email:
-            existing_lead.email = email
-        await db.flush()
-        return {"status": "updated", "lead_id": str(existing_lead.id)}
-
-    # Create new lead
-    lead = Lead(
-        project_type_id=project_type_id,
-        full_name=full_name,
-        phone=str(phone),
-        normalized_phone=normalized,
-        email=email,
-        source=LeadSource.meta_form,
-        campaign_name=campaign_name,
-        adset_name=adset_name,
-        ad_name=ad_name,
-        status=LeadStatus.new_lead,
-    )
-    db.add(lead)
-    await db.flush()
-    await db.refresh(lead)
-
-    history = LeadStatusHistory(
-        lead_id=lead.id,
-        from_status=None,
-        to_status=LeadStatus.new_lead.value,
-        changed_by=lead.id,  # system
-    )
-    db.add(history)
-    await db.flush()
-
-    return {"status": "created", "lead_id": str(lead.id)}
-
-
-@router.post("/whatsapp")
+    keys = [idempotency_key("meta", payload) for payload in payloads]
+    claimed = await claim(db, keys)
+
+    # The first occurrence of each claimed key is processed; everything else
+    # replays the result recorded for its key
+    fresh: list[int] = []
+    seen: set[bytes] = set()
+    for index, key in enumerate(keys):
+        if key in claimed and key not in seen:
+            fresh.append(index)
+        seen.add(key)
+
+    recorded = await stored_responses(db, set(keys) - claimed)
+    if fresh:
+        fresh_results = await ingest_meta_batch(db, [payloads[i] for i in fresh])
+        for index, result in zip(fresh, fresh_results):
+            recorded[keys[index]] = {k: v for k, v in result.items() if k != "index"}
+        await save_responses(db, {keys[index]: recorded[keys[index]] for index in fresh})
+
+    fresh_indexes = set(fresh)
+    results = []
+    counts = {"created": 0, "updated": 0, "error": 0}
+    for index, key in enumerate(keys):
+        result = {**recorded[key], "index": index}
+        if index in fresh_indexes:
+            counts[result["status"]] += 1
+        else:
+            result["replayed"] = True
+        results.append(result)
+    return {**counts, "results": results}
+
+
+@router.post("/whatsapp", status_code=status.HTTP_202_ACCEPTED)
 async def whatsapp_webhook(
     payload: dict[str, Any],
+    response: Response,
     db: AsyncSession = Depends(get_db),
 ):
-    phone = payload.get("phone")
-    if not phone:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="מספר טלפון חסר",
-        )
-
-    normalized = normalize_phone(str(phone))
-
-    # Find most recent lead within 30 days
-    thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-    result = await db.execute(
-        select(Lead).where(
-            and_(
-                Lead.normalized_phone == normalized,
-                Lead.created_at >= thirty_days_ago,
-            )
-        ).order_by(Lead.created_at.desc())
-    )
-    lead = result.scalars().first()
-
-    # Resolve track
-    track_raw = payload.get("track")
-    track = resolve_track(track_raw) if track_raw else None
-
-    if not lead:
-        # Create new lead
-        project_type_key = track or "renovation"
-        project_type_id = await _get_project_type_by_key(db, project_type_key)
-
-        lead = Lead(
-            project_type_id=project_type_id,
-            full_name=payload.get("full_name", payload.get("name", "ליד בוט")),
-            phone=str(phone),
-            normalized_phone=normalized,
-            source=LeadSource.manual,
-            status=LeadStatus.new_lead,
-        )
-        db.add(lead)
-        await db.flush()
-        await db.refresh(lead)
-
-        history = LeadStatusHistory(
-            lead_id=lead.id,
-            from_status=None,
-            to_status=LeadStatus.new_lead.value,
-            changed_by=lead.id,  # system
-        )
-        db.add(history)
-
-    # Store raw payload
-    lead.bot_payload = payload
-
-    # Map structured fields
-    answers = payload.get("answers", payload)
-    if track:
-        mapped = map_bot_payload(track, answers)
-        for field, value in mapped.items():
-            if hasattr(lead, field) and value is not None:
-                setattr(lead, field, value)
-
-    # Set bot_completed
-    if payload.get("completed", False) or payload.get("bot_completed", False):
-        lead.bot_completed = True
-    elif track and answers:
-        # Assume completed if we have track + substantial answers
-        lead.bot_completed = True
-
-    await db.flush()
-    await db.refresh(lead)
-    return {"status": "updated", "lead_id": str(lead.id)}
+    """Queue a WhatsApp bot payload; the ingest worker applies it to the lead."""
+    _require_phone(payload)
+    return await _queue_once(db, response, "whatsapp", payload)
@@ -0,0 +1,58 @@
+import uuid
+from datetime import date
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class LeadRollupRow(BaseModel):
+    project_type: Optional[str] = None
+    source: Optional[str] = None
+    status: Optional[str] = None
+    month: Optional[date] = None
+    leads_created: int
+    status_entries: int
+    wins: int
+
+
+class LeadAnalyticsTotals(BaseModel):
+    leads_created: int
+    wins: int
+    conversion_rate: float
+
+
+class LeadAnalyticsResponse(BaseModel):
+    date_from: date
+    date_to: date
+    group_by: list[str]
+    rows: list[LeadRollupRow]
+    totals: LeadAnalyticsTotals
+
+
+class FunnelStage(BaseModel):
+    project_type: str
+    closer_id: Optional[uuid.UUID] = None
+    status: str
+    entries: int
+    exits: int
+    dropped: int
+    drop_off_rate: float
+    avg_seconds: Optional[float] = None
+    median_seconds: Optional[float] = None
+    p90_seconds: Optional[float] = None
+
+
+class FunnelTransition(BaseModel):
+    project_type: str
+    closer_id: Optional[uuid.UUID] = None
+    from_status: str
+    to_status: str
+    count: int
+    rate: float
+
+
+class FunnelResponse(BaseModel):
+    date_from: date
+    date_to: date
+    stages: list[FunnelStage]
+    transitions: list[FunnelTransition]
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+
+class SourceCount(BaseModel):
+    source: str
+    count: int
+
+
+class ProjectTypeCount(BaseModel):
+    project_type: str
+    count: int
+
+
+class DashboardStats(BaseModel):
+    leads_this_month: int
+    wins_this_month: int
+    conversion_rate: float
+    leads_by_source: list[SourceCount]
+    leads_by_project_type: list[ProjectTypeCount]
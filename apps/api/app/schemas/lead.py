@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
@@ -105,7 +105,6 @@ class LeadResponse(BaseModel):
     qualifier: Optional[UserResponse] = None
     closer_id: Optional[uuid.UUID] = None
     closer: Optional[UserResponse] = None
-    bot_payload: Optional[dict[str, Any]] = None
     bot_track: Optional[str] = None
     bot_completed: bool = False
     start_timeline: Optional[str] = None
@@ -124,15 +123,87 @@ class LeadResponse(BaseModel):
     arch_existing_docs: Optional[dict[str, Any]] = None
     reno_type: Optional[str] = None
     reno_has_plan: Optional[str] = None
+    status_entered_at: datetime
     created_at: datetime
     updated_at: datetime
 
     model_config = {"from_attributes": True}
 
 
-class LeadListResponse(BaseModel):
-    items: list[LeadResponse]
+class LeadBotPayloadResponse(BaseModel):
+    version: int
+    payload: dict[str, Any]
+    received_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+# Columns needed by the Kanban cards and the leads table
+LEAD_SUMMARY_FIELDS = (
+    "id",
+    "project_type_id",
+    "full_name",
+    "phone",
+    "source",
+    "city",
+    "temperature",
+    "status",
+    "qualifier_id",
+    "closer_id",
+    "bot_completed",
+    "status_entered_at",
+    "created_at",
+    "updated_at",
+)
+
+
+class LeadSummary(BaseModel):
+    id: uuid.UUID
+    project_type_id: int
+    full_name: str
+    phone: str
+    source: LeadSource
+    city: Optional[str] = None
+    temperature: Optional[LeadTemperature] = None
+    status: LeadStatus
+    qualifier_id: Optional[uuid.UUID] = None
+    closer_id: Optional[uuid.UUID] = None
+    bot_completed: bool = False
+    status_entered_at: datetime
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class LeadBoardColumn(BaseModel):
+    status: LeadStatus
     total: int
+    items: list[LeadSummary]
+
+
+class LeadBoardResponse(BaseModel):
+    project_type_key: str
+    columns: list[LeadBoardColumn]
+
+
+class LeadSearchHit(BaseModel):
+    id: uuid.UUID
+    project_type_id: int
+    full_name: str
+    phone: str
+    email: Optional[str] = None
+    status: LeadStatus
+    score: float
+
+    model_config = {"from_attributes": True}
+
+
+class LeadListResponse(BaseModel):
+    items: list[LeadResponse] | list[LeadSummary] | list[dict[str, Any]]
+    total: Optional[int] = None
+    total_kind: Literal["exact", "estimate", "none"] = "exact"
     page: int
     page_size: int
     pages: int
+    next_cursor: Optional[str] = None
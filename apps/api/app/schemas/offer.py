@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -12,6 +12,23 @@ class OfferCreate(BaseModel):
     amount_estimated: Optional[float] = Field(None, description="סכום משוער")
 
 
+class OfferUploadRequest(BaseModel):
+    sha256: str = Field(..., pattern=r"^[0-9a-f]{64}$", description="SHA-256 של הקובץ")
+    size: int = Field(..., gt=0, description="גודל הקובץ בבתים")
+
+
+class OfferUploadTarget(BaseModel):
+    mode: Literal["exists", "direct", "api"]
+    url: Optional[str] = None
+    headers: dict[str, str] = {}
+
+
+class OfferFromUpload(BaseModel):
+    sha256: str = Field(..., pattern=r"^[0-9a-f]{64}$", description="SHA-256 של הקובץ")
+    status: OfferStatus = Field(default=OfferStatus.draft, description="סטטוס הצעה")
+    amount_estimated: Optional[float] = Field(None, description="סכום משוער")
+
+
 class OfferUpdate(BaseModel):
     status: Optional[OfferStatus] = None
     amount_estimated: Optional[float] = None
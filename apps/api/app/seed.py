@@ -8,6 +8,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import async_session_factory
+from app.jobs.reconcile_dashboard_stats import reconcile_dashboard_stats
 from app.models.activity import Activity, ActivityType
 from app.models.campaign_mapping import CampaignMapping
 from app.models.lead import Lead, LeadSource, LeadStatus, LeadTemperature
@@ -150,6 +151,7 @@ async def seed():
                 db.add(activity)
 
         await db.commit()
+        await reconcile_dashboard_stats()
         print("Seed data created successfully!")
         print("Users:")
         print("  admin@mrk.co.il / Admin123!")
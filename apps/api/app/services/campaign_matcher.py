@@ -0,0 +1,108 @@
+"""
+Compiled campaign-name matcher for CampaignMapping.
+
+Active mappings are compiled into one Aho-Corasick automaton over their
+Hebrew-normalized contains_text. Matching a campaign name is a single pass
+over its normalized characters, however many rules there are, and needs no
+query. Rules are ranked by priority, then age, and the automaton reports the
+best-ranked rule contained in the name, exactly as the old "first matching
+rule by priority" loop did (see app.services.text_match).
+
+The compiled matcher is cached per process and carries a version number.
+It is dropped when a transaction that wrote campaign_mappings commits in this
+process (the campaign_mappings router), and rebuilt on next use. Other
+processes (the ingest worker, other API workers) rebuild once it is older
+than CAMPAIGN_MATCHER_MAX_AGE_SECONDS.
+"""
+import time
+from typing import Any, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.campaign_mapping import CampaignMapping
+from app.services.hebrew import normalize_hebrew
+from app.services.text_match import ContainedPatterns
+
+
+class CampaignMatcher:
+    """Maps campaign names to project type keys with one compiled automaton."""
+
+    def __init__(self, rules: list[tuple[str, str]], version: int):
+        """``rules`` are (contains_text, project_type_key), best rule first."""
+        self.version = version
+        self.rule_count = len(rules)
+        self._keys = [project_type_key for _, project_type_key in rules]
+        self._patterns = ContainedPatterns(
+            [normalize_hebrew(contains_text) for contains_text, _ in rules]
+        )
+
+    def match(self, campaign_name: Optional[str]) -> Optional[str]:
+        """Project type key of the best rule contained in ``campaign_name``."""
+        if not campaign_name:
+            return None
+        rank = self._patterns.best(normalize_hebrew(campaign_name))
+        return self._keys[rank] if rank is not None else None
+
+
+_matcher: Optional[CampaignMatcher] = None
+_built_at = 0.0
+_version = 0
+
+
+def invalidate_campaign_matcher() -> None:
+    global _matcher
+    _matcher = None
+
+
+async def get_campaign_matcher(db: AsyncSession) -> CampaignMatcher:
+    """The compiled matcher, (re)built from the active mappings when stale."""
+    global _matcher, _built_at, _version
+    if (
+        _matcher is not None
+        and time.monotonic() - _built_at < settings.CAMPAIGN_MATCHER_MAX_AGE_SECONDS
+    ):
+        return _matcher
+
+    result = await db.execute(
+        select(CampaignMapping.contains_text, CampaignMapping.project_type_key)
+        .where(CampaignMapping.is_active == True)
+        .order_by(
+            CampaignMapping.priority.asc(),
+            CampaignMapping.created_at.asc(),
+            CampaignMapping.id.asc(),
+        )
+    )
+    _version += 1
+    _matcher = CampaignMatcher([tuple(row) for row in result.all()], _version)
+    _built_at = time.monotonic()
+    return _matcher
+
+
+def matcher_info() -> dict[str, Any]:
+    return {
+        "version": _matcher.version if _matcher else None,
+        "rules": _matcher.rule_count if _matcher else 0,
+        "age_seconds": time.monotonic() - _built_at if _matcher else None,
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def _track_mapping_writes(session: Session, flush_context: Any) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, CampaignMapping):
+            session.info["campaign_mappings_changed"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    if session.info.pop("campaign_mappings_changed", False):
+        invalidate_campaign_matcher()
+
+
+@event.listens_for(Session, "after_rollback")
+def _reset_on_rollback(session: Session) -> None:
+    session.info.pop("campaign_mappings_changed", None)
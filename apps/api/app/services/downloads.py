@@ -0,0 +1,136 @@
+"""
+Conditional and ranged file downloads.
+
+Responses carry a strong ETag and long-lived caching, answer If-None-Match
+with 304 and serve single byte ranges (Range / If-Range), which PDF viewers
+use to fetch pages on demand. Files are streamed in chunks with aiofiles.
+
+With OFFER_DOWNLOAD_OFFLOAD set, the API only authorizes and validates: the
+bytes are served by the fronting proxy, via X-Accel-Redirect (nginx, an
+``internal`` location at OFFER_DOWNLOAD_ACCEL_PREFIX aliased to
+STORAGE_PATH) or X-Sendfile (Apache, lighttpd). The proxy then handles
+Range itself.
+"""
+import os
+import re
+from typing import AsyncIterator, Optional
+
+import aiofiles
+import aiofiles.os
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+
+# Content never changes under a URL: offers are not re-uploaded in place
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+def _tag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag in tags
+
+
+def _byte_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """(start, end inclusive) of a single-range header; None to send everything.
+
+    Raises 416 for a range past the end of the file. Multi-range requests get
+    the whole file, which the spec allows.
+    """
+    if not header:
+        return None
+    match = _RANGE.fullmatch(header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size - 1
+        if int(last) == 0:
+            start = size
+    else:
+        start = int(first)
+        if last and int(last) < start:
+            return None  # invalid, ignored
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="טווח לא תקין",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+async def _read(path: str, start: int, length: int) -> AsyncIterator[bytes]:
+    async with aiofiles.open(path, "rb") as f:
+        await f.seek(start)
+        while length > 0:
+            chunk = await f.read(min(settings.OFFER_UPLOAD_CHUNK_BYTES, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def file_etag(stat: os.stat_result) -> str:
+    """Strong ETag from mtime and size, for files without a content hash."""
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+async def file_response(
+    request: Request,
+    path: str,
+    media_type: str,
+    filename: str,
+    etag: Optional[str] = None,
+) -> Response:
+    """Serve ``path`` with validators and Range; ``etag`` defaults to file_etag()."""
+    headers = {
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    }
+    offload = settings.OFFER_DOWNLOAD_OFFLOAD
+    stat = None
+    if etag is None or not offload:
+        try:
+            stat = await aiofiles.os.stat(path)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="קובץ לא נמצא")
+        etag = etag or file_etag(stat)
+    headers["ETag"] = etag
+
+    if _tag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if offload == "x-accel-redirect":
+        relative = os.path.relpath(path, settings.STORAGE_PATH).replace(os.sep, "/")
+        headers["X-Accel-Redirect"] = settings.OFFER_DOWNLOAD_ACCEL_PREFIX.rstrip("/") + "/" + relative
+        return Response(media_type=media_type, headers=headers)
+    if offload == "x-sendfile":
+        headers["X-Sendfile"] = os.path.abspath(path)
+        return Response(media_type=media_type, headers=headers)
+
+    size = stat.st_size
+    headers["Accept-Ranges"] = "bytes"
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range.strip() == etag:
+        byte_range = _byte_range(request.headers.get("range"), size)
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(_read(path, 0, size), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        _read(path, start, end - start + 1),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=headers,
+    )
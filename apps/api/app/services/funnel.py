@@ -0,0 +1,208 @@
+"""
+Funnel and stage-duration analytics over lead_status_history.
+
+Each history row is one step. LAG(changed_at) over the lead's history gives
+the moment the lead entered the step's from_status, so for every transition
+in the period we know which stage was left, where the lead went and how long
+it sat there. Only leads with a transition in the period are windowed, and
+their per-lead history is read through the (lead_id, changed_at) index.
+
+Results are broken down per project type and (current) closer and are cached
+in-process per (period, filters) for FUNNEL_CACHE_TTL_SECONDS. The cache is
+TTL-only: transitions are written by every API process and the ingest
+worker, so a report may lag new transitions by up to the TTL.
+"""
+import time
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Any, Hashable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.lead import LeadStatus
+
+# Leaving a stage for one of these counts as a drop-off
+DROP_OFF_STATUSES = {LeadStatus.lost.value, LeadStatus.irrelevant.value}
+
+# Pipeline order, for sorting stages
+_STATUS_ORDER = {s.value: i for i, s in enumerate(LeadStatus)}
+
+_cache: "OrderedDict[Hashable, tuple[float, dict[str, Any]]]" = OrderedDict()
+
+_STEPS_CTE = """
+    WITH period_leads AS (
+        SELECT DISTINCT lead_id FROM lead_status_history
+        WHERE changed_at >= :start AND changed_at < :end
+    ),
+    steps AS (
+        SELECT h.lead_id, h.from_status, h.to_status, h.changed_at,
+               LAG(h.changed_at) OVER (
+                   PARTITION BY h.lead_id ORDER BY h.changed_at, h.id
+               ) AS entered_at
+        FROM lead_status_history h
+        JOIN period_leads p ON p.lead_id = h.lead_id
+    ),
+    period_steps AS (
+        SELECT pt.key AS project_type, l.closer_id, s.from_status, s.to_status,
+               EXTRACT(EPOCH FROM s.changed_at - coalesce(s.entered_at, l.created_at))
+                   AS seconds_in_stage
+        FROM steps s
+        JOIN leads l ON l.id = s.lead_id
+        JOIN project_types pt ON pt.id = l.project_type_id
+        WHERE s.changed_at >= :start AND s.changed_at < :end {filters}
+    )
+"""
+
+_TRANSITIONS_SQL = """
+    SELECT project_type, closer_id, from_status, to_status, count(*) AS count
+    FROM period_steps
+    GROUP BY 1, 2, 3, 4
+"""
+
+_DURATIONS_SQL = """
+    SELECT project_type, closer_id, from_status AS status,
+           count(*) AS exits,
+           avg(seconds_in_stage) AS avg_seconds,
+           percentile_cont(0.5) WITHIN GROUP (ORDER BY seconds_in_stage) AS median_seconds,
+           percentile_cont(0.9) WITHIN GROUP (ORDER BY seconds_in_stage) AS p90_seconds
+    FROM period_steps
+    WHERE from_status IS NOT NULL
+    GROUP BY 1, 2, 3
+"""
+
+
+def _cache_get(key: Hashable) -> Optional[dict[str, Any]]:
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if expires_at < time.monotonic():
+        del _cache[key]
+        return None
+    _cache.move_to_end(key)
+    return value
+
+
+def _cache_put(key: Hashable, value: dict[str, Any]) -> None:
+    _cache[key] = (time.monotonic() + settings.FUNNEL_CACHE_TTL_SECONDS, value)
+    _cache.move_to_end(key)
+    while len(_cache) > settings.FUNNEL_CACHE_MAX_ENTRIES:
+        _cache.popitem(last=False)
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, dt_time.min, tzinfo=timezone.utc)
+
+
+def _seconds(value: Any) -> Optional[float]:
+    return round(float(value), 1) if value is not None else None
+
+
+async def funnel_report(
+    db: AsyncSession,
+    date_from: date,
+    date_to: date,
+    project_type: Optional[str] = None,
+    closer_id: Optional[uuid.UUID] = None,
+) -> dict[str, Any]:
+    """Stage durations, transitions, conversion and drop-off for [date_from, date_to]."""
+    key = (date_from, date_to, project_type, closer_id)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    filters = ""
+    params: dict[str, Any] = {
+        "start": _day_start(date_from),
+        "end": _day_start(date_to + timedelta(days=1)),
+    }
+    if project_type is not None:
+        filters += " AND pt.key = :project_type"
+        params["project_type"] = project_type
+    if closer_id is not None:
+        filters += " AND l.closer_id = :closer_id"
+        params["closer_id"] = closer_id
+    steps_cte = _STEPS_CTE.format(filters=filters)
+
+    transition_rows = (
+        await db.execute(text(steps_cte + _TRANSITIONS_SQL), params)
+    ).all()
+    duration_rows = (
+        await db.execute(text(steps_cte + _DURATIONS_SQL), params)
+    ).all()
+
+    entries: dict[tuple, int] = {}
+    exits: dict[tuple, int] = {}
+    dropped: dict[tuple, int] = {}
+    transitions = []
+    for row in transition_rows:
+        group = (row.project_type, row.closer_id)
+        entries[(*group, row.to_status)] = (
+            entries.get((*group, row.to_status), 0) + row.count
+        )
+        if row.from_status is None:
+            continue
+        stage = (*group, row.from_status)
+        exits[stage] = exits.get(stage, 0) + row.count
+        if row.to_status in DROP_OFF_STATUSES:
+            dropped[stage] = dropped.get(stage, 0) + row.count
+        transitions.append(row)
+
+    report = {
+        "date_from": date_from,
+        "date_to": date_to,
+        "stages": [],
+        "transitions": [],
+    }
+    for row in sorted(
+        transitions,
+        key=lambda r: (
+            r.project_type,
+            str(r.closer_id),
+            _STATUS_ORDER.get(r.from_status, -1),
+            _STATUS_ORDER.get(r.to_status, -1),
+        ),
+    ):
+        stage_exits = exits[(row.project_type, row.closer_id, row.from_status)]
+        report["transitions"].append(
+            {
+                "project_type": row.project_type,
+                "closer_id": row.closer_id,
+                "from_status": row.from_status,
+                "to_status": row.to_status,
+                "count": row.count,
+                "rate": round(row.count / stage_exits * 100, 1),
+            }
+        )
+
+    durations = {(r.project_type, r.closer_id, r.status): r for r in duration_rows}
+    stages = sorted(
+        set(entries) | set(exits),
+        key=lambda s: (s[0], str(s[1]), _STATUS_ORDER.get(s[2], -1)),
+    )
+    for stage in stages:
+        duration = durations.get(stage)
+        stage_exits = exits.get(stage, 0)
+        stage_dropped = dropped.get(stage, 0)
+        report["stages"].append(
+            {
+                "project_type": stage[0],
+                "closer_id": stage[1],
+                "status": stage[2],
+                "entries": entries.get(stage, 0),
+                "exits": stage_exits,
+                "dropped": stage_dropped,
+                "drop_off_rate": (
+                    round(stage_dropped / stage_exits * 100, 1) if stage_exits else 0.0
+                ),
+                "avg_seconds": _seconds(duration.avg_seconds) if duration else None,
+                "median_seconds": _seconds(duration.median_seconds) if duration else None,
+                "p90_seconds": _seconds(duration.p90_seconds) if duration else None,
+            }
+        )
+
+    _cache_put(key, report)
+    return report
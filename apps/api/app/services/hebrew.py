@@ -0,0 +1,44 @@
+"""
+Hebrew text normalization for search and matching.
+
+Folds the spelling variants that arrive from Meta forms, the WhatsApp bot and
+manual entry into a single comparable form:
+
+- niqqud and cantillation marks are removed
+- final letters (ך ם ן ף ץ) become their regular forms
+- gershayim, geresh and every quote/apostrophe variant are removed,
+  so ממ"ד, ממ״ד and ממד compare equal
+- en/em dashes, maqaf and other hyphen variants become "-"
+- Latin text is lowercased and whitespace is collapsed
+
+The database mirrors this in the IMMUTABLE SQL function hebrew_normalize()
+(migration 004), which a trigger uses to maintain leads.search_text. Keep the
+two in sync.
+"""
+from typing import Optional
+
+FINAL_LETTERS = "ךםןףץ"
+REGULAR_LETTERS = "כמנפצ"
+
+DASHES = "־‐‑‒–—―−"
+
+# Gershayim, geresh and quote/apostrophe look-alikes
+QUOTES = "\"'`׳״‘’‚‛“”„‟′″´"
+
+# Niqqud and cantillation marks (keeps maqaf U+05BE and sof pasuq/paseq)
+NIQQUD = "".join(chr(c) for c in range(0x0591, 0x05BE)) + (
+    "\u05bf\u05c1\u05c2\u05c4\u05c5\u05c7"
+)
+
+_TRANSLATION = str.maketrans(
+    FINAL_LETTERS + DASHES,
+    REGULAR_LETTERS + "-" * len(DASHES),
+    QUOTES + NIQQUD,
+)
+
+
+def normalize_hebrew(value: Optional[str]) -> str:
+    """Return the normalized search/match form of a string ("" for None)."""
+    if not value:
+        return ""
+    return " ".join(value.lower().translate(_TRANSLATION).split())
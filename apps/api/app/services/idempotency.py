@@ -0,0 +1,105 @@
+"""
+Idempotency keys for webhook deliveries.
+
+Meta retries deliveries and the WhatsApp bot resends on timeouts. Each
+delivery gets a key: the provider's event id when the payload carries one
+(leadgen_id, message id), otherwise a hash of the canonical payload. Keys
+are stored as 32-byte sha256 digests with the response we returned and an
+expiry (WEBHOOK_IDEMPOTENCY_TTL_SECONDS).
+
+claim() inserts keys with ON CONFLICT, in the request's transaction, before
+anything else runs. A key that is already present (and not expired) is a
+retry: the caller returns the stored response and touches nothing else. A
+concurrent first delivery makes the retry's INSERT wait on the unique index
+until the first transaction commits, so each delivery is processed once.
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable
+
+from sqlalchemy import column, delete, func, select, update, values
+from sqlalchemy.dialects.postgresql import BYTEA, JSONB, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.webhook_idempotency_key import WebhookIdempotencyKey
+
+# Payload fields that carry the provider's own event id, per source
+PROVIDER_EVENT_ID_FIELDS = {
+    "meta": ("leadgen_id", "event_id"),
+    "whatsapp": ("message_id", "wamid", "event_id"),
+}
+
+
+def idempotency_key(source: str, payload: dict[str, Any]) -> bytes:
+    """Digest of the provider event id, or of the whole payload if it has none."""
+    for field in PROVIDER_EVENT_ID_FIELDS.get(source, ()):
+        event_id = payload.get(field)
+        if event_id:
+            material = f"{source}:id:{event_id}"
+            break
+    else:
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        material = f"{source}:hash:{canonical}"
+    return hashlib.sha256(material.encode()).digest()
+
+
+async def claim(db: AsyncSession, keys: Iterable[bytes]) -> set[bytes]:
+    """Record new keys; returns the ones this transaction claimed (i.e. not retries).
+
+    Keys are inserted, and so locked, in sorted order, so concurrent deliveries
+    of overlapping batches in different orders cannot deadlock.
+    """
+    keys = sorted(set(keys))
+    if not keys:
+        return set()
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(seconds=settings.WEBHOOK_IDEMPOTENCY_TTL_SECONDS)
+    stmt = pg_insert(WebhookIdempotencyKey).values(
+        [{"key": key, "expires_at": expires_at} for key in keys]
+    )
+    # An expired key is taken over as if it were new
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[WebhookIdempotencyKey.key],
+        set_={"expires_at": stmt.excluded.expires_at, "response": None},
+        where=WebhookIdempotencyKey.expires_at <= now,
+    ).returning(WebhookIdempotencyKey.key)
+    result = await db.execute(stmt)
+    return set(result.scalars().all())
+
+
+async def stored_responses(
+    db: AsyncSession, keys: Iterable[bytes]
+) -> dict[bytes, dict[str, Any]]:
+    """Responses recorded for previously claimed keys."""
+    keys = list(keys)
+    if not keys:
+        return {}
+    result = await db.execute(
+        select(WebhookIdempotencyKey.key, WebhookIdempotencyKey.response).where(
+            WebhookIdempotencyKey.key.in_(keys)
+        )
+    )
+    return {row.key: row.response for row in result.all()}
+
+
+async def save_responses(db: AsyncSession, responses: dict[bytes, dict[str, Any]]) -> None:
+    """Store the responses of claimed keys, in one statement."""
+    if not responses:
+        return
+    rows = values(
+        column("key", BYTEA), column("response", JSONB), name="responses"
+    ).data(list(responses.items()))
+    await db.execute(
+        update(WebhookIdempotencyKey)
+        .where(WebhookIdempotencyKey.key == rows.c.key)
+        .values(response=rows.c.response)
+    )
+
+
+async def purge_expired(db: AsyncSession) -> int:
+    result = await db.execute(
+        delete(WebhookIdempotencyKey).where(WebhookIdempotencyKey.expires_at <= func.now())
+    )
+    return result.rowcount
@@ -0,0 +1,256 @@
+"""
+Postgres-backed ingest queue for webhook payloads.
+
+The webhook endpoints only INSERT the raw payload into webhook_events and
+return 202. The ingest worker claims batches with FOR UPDATE SKIP LOCKED (so
+any number of workers can drain the queue without blocking each other) and
+processes each event in its own SAVEPOINT:
+
+- success: the event row is deleted
+- failure: attempts is bumped and the event is hidden until available_at,
+  with exponential backoff (doubling from INGEST_RETRY_BASE_SECONDS, capped
+  at INGEST_RETRY_MAX_SECONDS)
+- INGEST_MAX_ATTEMPTS failures, or a PermanentIngestError: the event moves to
+  webhook_dead_letters, from where requeue_dead_letters() can put it back
+
+Sources with a coalescer (the WhatsApp bot, which posts after every answered
+question) are buffered per normalized phone: an update is held for
+WHATSAPP_COALESCE_WINDOW_SECONDS, and when it comes due the worker claims it
+together with every other pending update of that phone, merges them and
+applies a single write. An update that completes the conversation is due
+immediately, flushing the buffer early.
+
+The batch commits as a whole, so a crashed worker simply leaves its claimed
+events to be picked up again.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import Row, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.webhook_event import WebhookDeadLetter, WebhookEvent
+from app.services.phone import normalize_phone
+from app.services.webhook_ingest import (
+    INGEST_COALESCERS,
+    INGEST_HANDLERS,
+    PermanentIngestError,
+    _lock_phones,
+)
+
+logger = logging.getLogger(__name__)
+
+INGEST_SOURCES = tuple(INGEST_HANDLERS)
+
+
+def _coalesce_key(source: str, payload: dict[str, Any]) -> Optional[str]:
+    if source not in INGEST_COALESCERS:
+        return None
+    return normalize_phone(str(payload["phone"]))
+
+
+async def enqueue(db: AsyncSession, source: str, payload: dict[str, Any]) -> int:
+    """Persist a raw webhook payload; returns the event id."""
+    values: dict[str, Any] = {"source": source, "payload": payload}
+    coalescer = INGEST_COALESCERS.get(source)
+    if coalescer is not None:
+        values["coalesce_key"] = _coalesce_key(source, payload)
+        if not coalescer.flush_now(payload):
+            values["available_at"] = func.now() + timedelta(
+                seconds=settings.WHATSAPP_COALESCE_WINDOW_SECONDS
+            )
+    result = await db.execute(
+        insert(WebhookEvent).values(values).returning(WebhookEvent.id)
+    )
+    return result.scalar_one()
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    seconds = settings.INGEST_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.INGEST_RETRY_MAX_SECONDS))
+
+
+async def _dead_letter(db: AsyncSession, event: Row, attempts: int, error: str) -> None:
+    await db.execute(
+        insert(WebhookDeadLetter).values(
+            source=event.source,
+            payload=event.payload,
+            coalesce_key=event.coalesce_key,
+            attempts=attempts,
+            last_error=error,
+            received_at=event.received_at,
+        )
+    )
+    await db.execute(delete(WebhookEvent).where(WebhookEvent.id == event.id))
+
+
+async def _process(db: AsyncSession, events: list[Row]) -> bool:
+    """Run one event, or one coalesced group, in a savepoint.
+
+    Returns True if it was ingested.
+    """
+    source = events[0].source
+    handler = INGEST_HANDLERS.get(source)
+    try:
+        async with db.begin_nested():
+            if handler is None:
+                raise PermanentIngestError(f"unknown source {source!r}")
+            if len(events) == 1:
+                payload = events[0].payload
+            else:
+                payload = INGEST_COALESCERS[source].merge([event.payload for event in events])
+            await handler(db, payload)
+            await db.execute(
+                delete(WebhookEvent).where(WebhookEvent.id.in_([event.id for event in events]))
+            )
+        return True
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+        for event in events:
+            await _fail(db, event, exc, error)
+        return False
+
+
+async def _fail(db: AsyncSession, event: Row, exc: Exception, error: str) -> None:
+    attempts = event.attempts + 1
+    if isinstance(exc, PermanentIngestError) or attempts >= settings.INGEST_MAX_ATTEMPTS:
+        logger.error("Dead-lettering webhook event %s: %s", event.id, error)
+        await _dead_letter(db, event, attempts, error)
+    else:
+        logger.warning(
+            "Webhook event %s failed (attempt %s): %s", event.id, attempts, error
+        )
+        await db.execute(
+            update(WebhookEvent)
+            .where(WebhookEvent.id == event.id)
+            .values(
+                attempts=attempts,
+                last_error=error,
+                available_at=datetime.now(timezone.utc) + _retry_delay(attempts),
+            )
+        )
+
+
+_EVENT_COLUMNS = (
+    WebhookEvent.id,
+    WebhookEvent.source,
+    WebhookEvent.payload,
+    WebhookEvent.coalesce_key,
+    WebhookEvent.attempts,
+    WebhookEvent.received_at,
+)
+
+
+async def drain_batch(db: AsyncSession, batch_size: Optional[int] = None) -> int:
+    """Claim and process one batch of due events. Returns how many were claimed.
+
+    The caller commits.
+    """
+    # Plain rows rather than entities: nothing to expire when a savepoint rolls back
+    result = await db.execute(
+        select(*_EVENT_COLUMNS)
+        .where(WebhookEvent.available_at <= func.now())
+        .order_by(WebhookEvent.id)
+        .limit(batch_size or settings.INGEST_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    )
+    events = result.all()
+
+    # Sweep in the still-buffered events of every coalesced phone in the batch
+    keys = {event.coalesce_key for event in events if event.coalesce_key}
+    if keys:
+        result = await db.execute(
+            select(*_EVENT_COLUMNS)
+            .where(
+                WebhookEvent.coalesce_key.in_(keys),
+                WebhookEvent.id.not_in([event.id for event in events]),
+            )
+            .order_by(WebhookEvent.id)
+            .with_for_update(skip_locked=True)
+        )
+        events += result.all()
+
+    # Handlers lock each lead's phone until the batch commits; taking every
+    # lock up front, in hash order, keeps two workers (or a worker and the
+    # batch endpoint) from deadlocking on interleaved phones
+    await _lock_phones(
+        db,
+        (
+            normalize_phone(str(event.payload["phone"]))
+            for event in events
+            if isinstance(event.payload, dict) and event.payload.get("phone")
+        ),
+    )
+
+    # One group per (source, coalesce key), oldest event first; the rest alone
+    groups: dict[Any, list[Row]] = {}
+    for event in sorted(events, key=lambda event: event.id):
+        key = (event.source, event.coalesce_key) if event.coalesce_key else event.id
+        groups.setdefault(key, []).append(event)
+    for group in groups.values():
+        if len(group) > 1:
+            logger.debug("Coalescing %s %s events", len(group), group[0].source)
+        await _process(db, group)
+
+    return len(events)
+
+
+async def requeue_dead_letters(db: AsyncSession, ids: Optional[list[int]] = None) -> int:
+    """Move dead letters (all, or the given ids) back onto the queue."""
+    query = select(WebhookDeadLetter)
+    if ids:
+        query = query.where(WebhookDeadLetter.id.in_(ids))
+    letters = (await db.execute(query.with_for_update(skip_locked=True))).scalars().all()
+    if not letters:
+        return 0
+    # Requeued bot updates coalesce with newer events for the same phone
+    # (letters from before coalesce_key was kept get it recomputed)
+    await db.execute(
+        insert(WebhookEvent),
+        [
+            {
+                "source": letter.source,
+                "payload": letter.payload,
+                "coalesce_key": letter.coalesce_key
+                or _coalesce_key(letter.source, letter.payload),
+                "received_at": letter.received_at,
+            }
+            for letter in letters
+        ],
+    )
+    await db.execute(
+        delete(WebhookDeadLetter).where(
+            WebhookDeadLetter.id.in_([letter.id for letter in letters])
+        )
+    )
+    return len(letters)
+
+
+async def queue_stats(db: AsyncSession) -> dict[str, Any]:
+    """Queue depth, age of the oldest event, buffered updates and dead-letter count."""
+    depth, oldest, retrying, buffered = (
+        await db.execute(
+            select(
+                func.count(),
+                func.min(WebhookEvent.received_at),
+                func.count().filter(WebhookEvent.attempts > 0),
+                func.count().filter(
+                    WebhookEvent.coalesce_key.is_not(None),
+                    WebhookEvent.attempts == 0,
+                    WebhookEvent.available_at > func.now(),
+                ),
+            )
+        )
+    ).one()
+    dead_letters = await db.scalar(select(func.count()).select_from(WebhookDeadLetter))
+    return {
+        "depth": depth,
+        "retrying": retrying,
+        "buffered": buffered,
+        "oldest_age_seconds": (
+            (datetime.now(timezone.utc) - oldest).total_seconds() if oldest else 0.0
+        ),
+        "dead_letters": dead_letters,
+    }
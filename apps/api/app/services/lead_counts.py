@@ -0,0 +1,97 @@
+"""
+Total-count strategies for lead listings.
+
+- exact:    COUNT(*) over the filtered query, cached per (filters, role, user).
+- estimate: the planner's row estimate from EXPLAIN, no table scan.
+- none:     skip the count entirely.
+
+Cached exact counts are keyed on a generation kept in the database: the
+lead_write_generation sequence, advanced by a deferred trigger (migration
+015) as every transaction that wrote leads commits. Writes from any process
+(other API replicas, the ingest worker, scripts) therefore invalidate every
+cached count at once, without having to know which filters they affected.
+The trigger fires just before its commit becomes visible; a count taken in
+that instant is cached stale, for at most LEAD_COUNT_CACHE_TTL_SECONDS.
+"""
+import json
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.config import settings
+
+COUNT_MODES = ("exact", "estimate", "none")
+
+_cache: "OrderedDict[Hashable, tuple[int, float, int]]" = OrderedDict()
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) wrapper that keeps the statement's bound params."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def _lead_generation(db: AsyncSession) -> int:
+    # Sequences are not transactional: this sees commits of every session
+    return await db.scalar(text("SELECT last_value FROM lead_write_generation"))
+
+
+def _cache_get(key: Hashable, generation: int) -> Optional[int]:
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    total, expires_at, cached_generation = entry
+    if cached_generation != generation or expires_at < time.monotonic():
+        _cache.pop(key, None)
+        return None
+    _cache.move_to_end(key)
+    return total
+
+
+def _cache_set(key: Hashable, generation: int, total: int) -> None:
+    _cache[key] = (
+        total,
+        time.monotonic() + settings.LEAD_COUNT_CACHE_TTL_SECONDS,
+        generation,
+    )
+    _cache.move_to_end(key)
+    while len(_cache) > settings.LEAD_COUNT_CACHE_MAX_ENTRIES:
+        _cache.popitem(last=False)
+
+
+async def exact_count(db: AsyncSession, query: Select, cache_key: Hashable) -> int:
+    """COUNT(*) over the filtered query, served from cache when still valid."""
+    generation = await _lead_generation(db)
+    cached = _cache_get(cache_key, generation)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(select(func.count()).select_from(query.subquery()))
+    total = result.scalar() or 0
+    # Read before counting: a write committed meanwhile advances the
+    # generation, so this entry is never served after it
+    _cache_set(cache_key, generation, total)
+    return total
+
+
+async def estimated_count(db: AsyncSession, query: Select) -> int:
+    """Planner row estimate for the filtered query (no rows are read)."""
+    result = await db.execute(_Explain(query))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
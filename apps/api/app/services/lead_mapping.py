@@ -2,8 +2,12 @@
 Bot field mapping service for all 4 project tracks.
 Maps Hebrew strings from WhatsApp bot to structured lead fields.
 """
+from functools import lru_cache
 from typing import Any, Optional
 
+from app.services.hebrew import normalize_hebrew
+from app.services.text_match import ContainedPatterns, ContainingPatterns
+
 TIMELINE_MAP: dict[str, str] = {
     "מיידית": "immediate",
     "מיידית / בחודש הקרוב": "immediate",
@@ -134,17 +138,78 @@ TRACK_NAME_MAP: dict[str, str] = {
 }
 
 
+# Spelling variants (ממ"ד / ממ״ד / ממד) collapse onto one normalized key
+_TRACK_NAME_NORMALIZED: dict[str, str] = {
+    normalize_hebrew(k): v for k, v in TRACK_NAME_MAP.items()
+}
+
+
+class AnswerIndex:
+    """Precompiled lookup of bot answers in one mapping table.
+
+    Resolves an answer the same way the original linear scan did, in order:
+    exact key, normalized key (first in table order), then the first key (in
+    table order) that contains the normalized answer or is contained in it.
+    The fuzzy step runs two automata over the answer, so every lookup is
+    O(len(answer)) whatever the table size; results are memoized per raw
+    answer, since the bot sends the same few strings over and over.
+    """
+
+    def __init__(self, mapping: dict[str, str], memo_size: int = 1024):
+        self._exact = dict(mapping)
+        self._values = list(mapping.values())
+        normalized_keys = [normalize_hebrew(k) for k in mapping]
+        self._normalized: dict[str, str] = {}
+        for he_key, en_val in zip(normalized_keys, self._values):
+            self._normalized.setdefault(he_key, en_val)
+        self._contained = ContainedPatterns(normalized_keys)
+        self._containing = ContainingPatterns(normalized_keys)
+        self.lookup = lru_cache(maxsize=memo_size)(self._lookup)
+
+    def _lookup(self, value: str) -> str:
+        value = value.strip()
+        result = self._exact.get(value)
+        if result is not None:
+            return result
+        normalized = normalize_hebrew(value)
+        result = self._normalized.get(normalized)
+        if result is not None:
+            return result
+        ranks = [
+            rank
+            for rank in (self._contained.best(normalized), self._containing.best(normalized))
+            if rank is not None
+        ]
+        return self._values[min(ranks)] if ranks else "other_or_unknown"
+
+
+_ANSWER_INDEXES: dict[int, AnswerIndex] = {
+    id(mapping): AnswerIndex(mapping)
+    for mapping in (
+        TIMELINE_MAP,
+        PLANS_STATUS_MAP,
+        PERMIT_STATUS_MAP,
+        BUILDING_TYPE_MAP,
+        SITE_ACCESS_MAP,
+        MAMAD_VARIANT_MAP,
+        PRIVATE_STAGE_MAP,
+        PRIVATE_SIZE_BUCKET_MAP,
+        ARCH_SERVICE_MAP,
+        ARCH_PROPERTY_TYPE_MAP,
+        ARCH_PLANNING_STAGE_MAP,
+        RENO_TYPE_MAP,
+        RENO_SIZE_BUCKET_MAP,
+        RENO_HAS_PLAN_MAP,
+    )
+}
+
+
 def _map_value(value: Optional[str], mapping: dict[str, str]) -> Optional[str]:
     if value is None:
         return None
-    value = value.strip()
-    result = mapping.get(value)
-    if result is not None:
-        return result
-    for he_key, en_val in mapping.items():
-        if he_key in value or value in he_key:
-            return en_val
-    return "other_or_unknown"
+    # Tables other than the ones above (none today) get a one-off index
+    index = _ANSWER_INDEXES.get(id(mapping)) or AnswerIndex(mapping)
+    return index.lookup(value)
 
 
 def _map_list(values: Optional[list[str]], mapping: dict[str, str]) -> Optional[list[str]]:
@@ -173,7 +238,7 @@ def resolve_track(track: Optional[str]) -> Optional[str]:
     track = track.strip()
     if track in ("mamad", "private_home", "renovation", "architecture"):
         return track
-    return TRACK_NAME_MAP.get(track)
+    return TRACK_NAME_MAP.get(track) or _TRACK_NAME_NORMALIZED.get(normalize_hebrew(track))
 
 
 def map_common_fields(payload: dict[str, Any]) -> dict[str, Any]:
@@ -0,0 +1,278 @@
+"""
+Incrementally maintained dashboard counters.
+
+Every lead insert adds one to its (creation month, project type, source,
+status) counter and every status change moves one between two status rows,
+in the same transaction as the lead write. The dashboard sums these rows and
+never scans leads. reconcile_counters() corrects any drift from leads (e.g.
+leads written by scripts that bypass these hooks).
+"""
+from datetime import date, datetime, timezone
+from typing import Any, Iterable
+
+from sqlalchemy import (
+    Date,
+    FromClause,
+    and_,
+    cast,
+    delete,
+    func,
+    literal,
+    literal_column,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import Insert, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.models.lead import Lead, LeadStatus
+from app.models.lead_stat_counter import LeadStatCounter
+from app.services.project_types import get_project_types
+
+# pg advisory lock key, so only one process reconciles at a time
+_RECONCILE_LOCK_KEY = 0x4C534352
+
+
+def month_of(moment: datetime) -> date:
+    """First day of the UTC month containing ``moment``."""
+    moment = moment.astimezone(timezone.utc)
+    return date(moment.year, moment.month, 1)
+
+
+def _month_column(created_at: Any) -> Any:
+    """SQL equivalent of month_of(); inline literals keep GROUP BY matching it."""
+    return cast(
+        func.date_trunc(
+            literal_column("'month'"),
+            func.timezone(literal_column("'UTC'"), created_at),
+        ),
+        Date,
+    )
+
+
+def _add_to_counters(stmt: Insert) -> Insert:
+    return stmt.on_conflict_do_update(
+        index_elements=[
+            LeadStatCounter.month,
+            LeadStatCounter.project_type_id,
+            LeadStatCounter.source,
+            LeadStatCounter.status,
+        ],
+        set_={"lead_count": LeadStatCounter.lead_count + stmt.excluded.lead_count},
+    )
+
+
+async def _bump(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    await db.execute(_add_to_counters(pg_insert(LeadStatCounter).values(rows)))
+
+
+def count_created_leads(created: FromClause) -> Insert:
+    """Counter upsert for lead rows returned by an INSERT ... RETURNING CTE.
+
+    For single-statement ingest: use it as a data-modifying CTE next to the
+    insert (``created`` needs created_at, project_type_id, source and status).
+    """
+    return _add_to_counters(
+        pg_insert(LeadStatCounter).from_select(
+            ["month", "project_type_id", "source", "status", "lead_count"],
+            select(
+                _month_column(created.c.created_at),
+                created.c.project_type_id,
+                created.c.source,
+                created.c.status,
+                literal(1),
+            ),
+        )
+    )
+
+
+async def record_leads_created(db: AsyncSession, leads: Iterable[Any]) -> None:
+    """Count newly inserted leads (Lead objects or rows with the same attributes)."""
+    counts: dict[tuple, int] = {}
+    for lead in leads:
+        key = (month_of(lead.created_at), lead.project_type_id, lead.source, lead.status)
+        counts[key] = counts.get(key, 0) + 1
+    if not counts:
+        return
+    await _bump(
+        db,
+        [
+            {
+                "month": month,
+                "project_type_id": project_type_id,
+                "source": source,
+                "status": status,
+                "lead_count": count,
+            }
+            for (month, project_type_id, source, status), count in counts.items()
+        ],
+    )
+
+
+async def record_lead_created(db: AsyncSession, lead: Lead) -> None:
+    """Count a newly inserted lead (call after it has been flushed)."""
+    await record_leads_created(db, [lead])
+
+
+def counter_bucket(lead: Any) -> tuple:
+    """The (month, project type, source, status) counter a lead is counted in."""
+    return (month_of(lead.created_at), lead.project_type_id, lead.source, lead.status)
+
+
+async def record_bucket_change(db: AsyncSession, before: tuple, lead: Lead) -> None:
+    """Move a lead's count from counter_bucket() taken before an edit to its current one."""
+    after = counter_bucket(lead)
+    if before == after:
+        return
+    keys = ("month", "project_type_id", "source", "status")
+    await _bump(
+        db,
+        [
+            {**dict(zip(keys, before)), "lead_count": -1},
+            {**dict(zip(keys, after)), "lead_count": 1},
+        ],
+    )
+
+
+async def record_status_change(
+    db: AsyncSession, lead: Lead, from_status: LeadStatus, to_status: LeadStatus
+) -> None:
+    """Move a lead's count from one status row to another."""
+    if from_status == to_status:
+        return
+    key = {
+        "month": month_of(lead.created_at),
+        "project_type_id": lead.project_type_id,
+        "source": lead.source,
+    }
+    await _bump(
+        db,
+        [
+            {**key, "status": from_status, "lead_count": -1},
+            {**key, "status": to_status, "lead_count": 1},
+        ],
+    )
+
+
+async def dashboard_stats(db: AsyncSession) -> dict[str, Any]:
+    """Dashboard KPIs, computed from the counters table only."""
+    current_month = month_of(datetime.now(timezone.utc))
+    project_types = await get_project_types(db)
+    result = await db.execute(
+        select(
+            LeadStatCounter.month,
+            LeadStatCounter.source,
+            LeadStatCounter.status,
+            LeadStatCounter.project_type_id,
+            func.sum(LeadStatCounter.lead_count).label("lead_count"),
+        ).group_by(
+            LeadStatCounter.month,
+            LeadStatCounter.source,
+            LeadStatCounter.status,
+            LeadStatCounter.project_type_id,
+        )
+    )
+
+    leads_this_month = 0
+    wins_this_month = 0
+    by_source: dict[str, int] = {}
+    by_project_type: dict[str, int] = {}
+    for row in result.all():
+        count = int(row.lead_count)
+        if row.month == current_month:
+            leads_this_month += count
+            if row.status == LeadStatus.won:
+                wins_this_month += count
+        by_source[row.source.value] = by_source.get(row.source.value, 0) + count
+        project_type = project_types.by_id(row.project_type_id)
+        key = project_type.key if project_type else str(row.project_type_id)
+        by_project_type[key] = by_project_type.get(key, 0) + count
+
+    conversion_rate = (
+        round(wins_this_month / leads_this_month * 100, 1) if leads_this_month else 0.0
+    )
+    return {
+        "leads_this_month": leads_this_month,
+        "wins_this_month": wins_this_month,
+        "conversion_rate": conversion_rate,
+        "leads_by_source": [
+            {"source": source, "count": count}
+            for source, count in sorted(by_source.items())
+            if count
+        ],
+        "leads_by_project_type": [
+            {"project_type": key, "count": count}
+            for key, count in sorted(by_project_type.items())
+            if count
+        ],
+    }
+
+
+def _counter_drift() -> Any:
+    """(month, project_type_id, source, status, drift) where counters differ from leads."""
+    month = _month_column(Lead.created_at).label("month")
+    actual = (
+        select(
+            month,
+            Lead.project_type_id,
+            Lead.source,
+            Lead.status,
+            func.count().label("lead_count"),
+        )
+        .group_by(month, Lead.project_type_id, Lead.source, Lead.status)
+        .subquery()
+    )
+    counters = LeadStatCounter.__table__
+    keys = ("month", "project_type_id", "source", "status")
+    drift = func.coalesce(actual.c.lead_count, 0) - func.coalesce(counters.c.lead_count, 0)
+    return (
+        select(
+            *(func.coalesce(actual.c[key], counters.c[key]).label(key) for key in keys),
+            drift.label("lead_count"),
+        )
+        .select_from(
+            actual.join(
+                counters,
+                and_(*(actual.c[key] == counters.c[key] for key in keys)),
+                full=True,
+            )
+        )
+        .where(drift != 0)
+    )
+
+
+async def reconcile_counters(conn: AsyncConnection) -> bool:
+    """Correct counter drift from leads. Returns False if another run is active.
+
+    Leads are aggregated in one REPEATABLE READ snapshot together with the
+    counters; every increment commits with its lead write, so the difference
+    is exactly the drift, and it stays so however many leads are written
+    after the snapshot. The drift is then added to the counters in a second,
+    short transaction, so lead writes never wait for the scan. ``conn`` must
+    not be in a transaction: the advisory lock is session-level because it
+    has to span both (two runs adding the same drift would count it twice).
+    """
+    locked = await conn.scalar(select(func.pg_try_advisory_lock(_RECONCILE_LOCK_KEY)))
+    await conn.commit()
+    if not locked:
+        return False
+    try:
+        await conn.execute(
+            text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+        )
+        drift = (await conn.execute(_counter_drift())).mappings().all()
+        await conn.commit()
+
+        if drift:
+            await conn.execute(
+                _add_to_counters(
+                    pg_insert(LeadStatCounter).values([dict(row) for row in drift])
+                )
+            )
+        await conn.execute(delete(LeadStatCounter).where(LeadStatCounter.lead_count == 0))
+        await conn.commit()
+    finally:
+        await conn.rollback()
+        await conn.execute(select(func.pg_advisory_unlock(_RECONCILE_LOCK_KEY)))
+        await conn.commit()
+    return True
@@ -0,0 +1,234 @@
+"""
+Content-addressed offer storage.
+
+Each distinct offer PDF is stored once, under the sha256 of its content:
+
+    offers/<h[0:2]>/<h[2:4]>/<h>.pdf
+
+in the configured blob storage backend (app.services.storage). Two levels
+of 256 shards keep every directory small however many offers accumulate,
+and a PDF sent to several leads takes its space once. Uploads through the
+API are staged in STORAGE_PATH/offers/.staging (same filesystem as local
+blobs, so the final move is an atomic rename). With a backend that presigns,
+browsers upload straight to the store and the offer is attached afterwards.
+
+Each blob has an offer_blobs row counting the offers that reference it.
+put_blob() and attach_blob() add a reference while holding the blob row;
+collect_garbage() recounts references from offers under a table lock, which
+waits for in-flight uploads, then deletes unreferenced blobs while holding
+their rows. A blob is therefore never removed between an upload taking a
+reference and its offer row committing.
+"""
+import contextlib
+import os
+import re
+import time
+from typing import NamedTuple, Optional
+
+import aiofiles.os
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.dialects.postgresql import Insert, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.offer import Offer
+from app.models.offer_blob import OfferBlob
+from app.services.storage import get_storage
+from app.services.uploads import PART_SUFFIX, PDF_MAGIC, StoredUpload, too_large
+
+BLOB_PREFIX = "offers"
+BLOB_SUFFIX = ".pdf"
+
+# Blobs deleted per storage call (S3 DeleteObjects takes at most 1000 keys)
+GC_BATCH_SIZE = 1000
+
+_BLOB_KEY = re.compile(
+    rf"{BLOB_PREFIX}/[0-9a-f]{{2}}/[0-9a-f]{{2}}/([0-9a-f]{{64}}){re.escape(BLOB_SUFFIX)}"
+)
+
+
+class UploadTarget(NamedTuple):
+    # "exists": already stored, attach it; "direct": PUT to url with headers,
+    # then attach; "api": upload the file through the API
+    mode: str
+    url: Optional[str] = None
+    headers: dict[str, str] = {}
+
+
+def staging_dir() -> str:
+    return os.path.join(settings.STORAGE_PATH, BLOB_PREFIX, ".staging")
+
+
+def blob_key(sha256: str) -> str:
+    return f"{BLOB_PREFIX}/{sha256[:2]}/{sha256[2:4]}/{sha256}{BLOB_SUFFIX}"
+
+
+def _add_reference(sha256: str, size: int) -> Insert:
+    return (
+        pg_insert(OfferBlob)
+        .values(sha256=sha256, size=size, ref_count=1)
+        .on_conflict_do_update(
+            index_elements=[OfferBlob.sha256],
+            set_={"ref_count": OfferBlob.ref_count + 1},
+        )
+    )
+
+
+def _not_uploaded() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="הקובץ לא הועלה, יש להעלות אותו שוב",
+    )
+
+
+async def put_blob(db: AsyncSession, staged: StoredUpload) -> str:
+    """Take a reference to the staged upload's blob and store it; returns the key.
+
+    The staged file is consumed either way: it becomes the blob, or replaces
+    an identical copy.
+    """
+    key = blob_key(staged.sha256)
+    try:
+        await db.execute(_add_reference(staged.sha256, staged.size))
+        # The blob row stays locked until commit, so GC cannot delete the
+        # blob in between. Replacing an existing copy also restores one GC
+        # removed but whose row survived a failed commit.
+        await get_storage().put_file(key, staged.path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            await aiofiles.os.remove(staged.path)
+        raise
+    return key
+
+
+async def upload_target(db: AsyncSession, sha256: str, size: int) -> UploadTarget:
+    """Where the client should send a file with this hash and size."""
+    if size > settings.OFFER_UPLOAD_MAX_BYTES:
+        raise too_large()
+    if await db.scalar(select(OfferBlob.size).where(OfferBlob.sha256 == sha256)) == size:
+        return UploadTarget("exists")
+    presigned = get_storage().presigned_upload(blob_key(sha256), size, sha256)
+    if presigned is None:
+        return UploadTarget("api")
+    return UploadTarget("direct", presigned.url, presigned.headers)
+
+
+async def attach_blob(db: AsyncSession, sha256: str) -> str:
+    """Take a reference to a blob the client reported as stored; returns the key.
+
+    Blobs uploaded with a presigned URL are checked here: they must exist,
+    fit the size limit, match their hash (when the backend records one) and
+    start like a PDF.
+    """
+    storage = get_storage()
+    key = blob_key(sha256)
+    stat = await storage.stat(key)
+    if stat is None:
+        raise _not_uploaded()
+    if stat.size > settings.OFFER_UPLOAD_MAX_BYTES:
+        raise too_large()
+    if (stat.sha256 is not None and stat.sha256 != sha256) or await storage.read_head(
+        key, len(PDF_MAGIC)
+    ) != PDF_MAGIC:
+        # Left for the orphan sweep rather than deleted here: the blob row,
+        # if any, belongs to other offers
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="יש להעלות קובץ PDF בלבד",
+        )
+    await db.execute(_add_reference(sha256, stat.size))
+    # GC may have removed the blob between the check and our reference; now
+    # that we hold the row it cannot, so one more look settles it
+    if await storage.stat(key) is None:
+        raise _not_uploaded()
+    return key
+
+
+async def collect_garbage(db: AsyncSession) -> int:
+    """Recount blob references and delete unreferenced blobs; returns how many.
+
+    Commits as it goes. The recount holds the table lock only briefly; blobs
+    are then deleted in batches, each with its rows locked (SKIP LOCKED
+    passes over rows an upload is referencing) until the rows are deleted
+    and committed. An upload of the same content meanwhile waits on its row
+    and then stores the blob again, so uploads of other content never queue
+    behind storage round trips.
+    """
+    await db.execute(text("LOCK TABLE offer_blobs IN SHARE ROW EXCLUSIVE MODE"))
+    references = (
+        select(func.count())
+        .where(Offer.blob_sha256 == OfferBlob.sha256)
+        .scalar_subquery()
+    )
+    await db.execute(
+        update(OfferBlob)
+        .where(OfferBlob.ref_count != references)
+        .values(ref_count=references)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+    storage = get_storage()
+    removed = 0
+    while True:
+        result = await db.execute(
+            select(OfferBlob.sha256)
+            .where(OfferBlob.ref_count == 0)
+            .order_by(OfferBlob.sha256)
+            .limit(GC_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        batch = result.scalars().all()
+        if not batch:
+            return removed
+        await storage.delete_many([blob_key(sha256) for sha256 in batch])
+        await db.execute(delete(OfferBlob).where(OfferBlob.sha256.in_(batch)))
+        await db.commit()
+        removed += len(batch)
+
+
+async def _remove_stale_staged_files(min_age_seconds: float) -> int:
+    cutoff = time.time() - min_age_seconds
+    removed = 0
+    with contextlib.suppress(FileNotFoundError):
+        for name in await aiofiles.os.listdir(staging_dir()):
+            path = os.path.join(staging_dir(), name)
+            if name.endswith(PART_SUFFIX) and (await aiofiles.os.stat(path)).st_mtime < cutoff:
+                await aiofiles.os.remove(path)
+                removed += 1
+    return removed
+
+
+async def remove_orphan_files(
+    db: AsyncSession, min_age_seconds: float = 86400, batch_size: int = GC_BATCH_SIZE
+) -> int:
+    """Delete blobs without an offer_blobs row and abandoned staged uploads.
+
+    Orphans come from crashes, rolled-back uploads and presigned uploads that
+    were never attached, so this lists the whole store and is meant to run
+    rarely, by hand. ``min_age_seconds`` leaves uploads still in flight
+    alone; the table lock keeps new uploads from re-creating a blob while it
+    is being removed. Files that are not blobs (offers stored before
+    offer_blobs) are never touched.
+    """
+    removed = await _remove_stale_staged_files(min_age_seconds)
+    await db.execute(text("LOCK TABLE offer_blobs IN SHARE ROW EXCLUSIVE MODE"))
+    storage = get_storage()
+    blobs = []
+    for key in await storage.list_keys(BLOB_PREFIX, min_age_seconds):
+        match = _BLOB_KEY.fullmatch(key)
+        if match:
+            blobs.append((key, match.group(1)))
+    for start in range(0, len(blobs), batch_size):
+        batch = blobs[start : start + batch_size]
+        result = await db.execute(
+            select(OfferBlob.sha256).where(
+                OfferBlob.sha256.in_([sha256 for _, sha256 in batch])
+            )
+        )
+        known = set(result.scalars().all())
+        orphans = [key for key, sha256 in batch if sha256 not in known]
+        await storage.delete_many(orphans)
+        removed += len(orphans)
+    return removed
@@ -0,0 +1,155 @@
+"""
+Keyset (cursor) pagination for lead listings.
+
+A cursor is an opaque, URL-safe token holding the sort key, direction and the
+(sort value, id) pair of the last row returned. The next page is fetched with
+a seek predicate instead of OFFSET, so deep pages cost the same as the first
+and rows do not shift while new leads are inserted.
+"""
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.sql import Select
+
+from app.models.lead import Lead, LeadStatus, LeadTemperature
+
+# Sort key -> (column, nullable). Each key has a matching (column, id) index.
+SORT_COLUMNS: dict[str, tuple[Any, bool]] = {
+    "created_at": (Lead.created_at, False),
+    "updated_at": (Lead.updated_at, False),
+    "status": (Lead.status, False),
+    "temperature": (Lead.temperature, True),
+}
+
+SORT_ORDERS = ("asc", "desc")
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="סמן עימוד לא תקין",
+    )
+
+
+def validate_sort(sort: str, order: str) -> None:
+    """Raise 400 if the sort key or direction is not supported."""
+    if sort not in SORT_COLUMNS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"שדה מיון לא נתמך. ערכים אפשריים: {', '.join(SORT_COLUMNS)}",
+        )
+    if order not in SORT_ORDERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="כיוון מיון לא תקין",
+        )
+
+
+def _serialize_value(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (LeadStatus, LeadTemperature)):
+        return value.value
+    return value
+
+
+def _deserialize_value(sort: str, raw: Any) -> Any:
+    if raw is None:
+        return None
+    if sort in ("created_at", "updated_at"):
+        return datetime.fromisoformat(raw)
+    if sort == "status":
+        return LeadStatus(raw)
+    if sort == "temperature":
+        return LeadTemperature(raw)
+    return raw
+
+
+def encode_cursor(sort: str, order: str, lead: Any) -> str:
+    """Build the cursor pointing just past the given row."""
+    data = {
+        "s": sort,
+        "o": order,
+        "v": _serialize_value(getattr(lead, sort)),
+        "id": str(lead.id),
+    }
+    raw = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, order: str) -> tuple[Any, uuid.UUID]:
+    """Decode a cursor and return its (sort value, id) pair.
+
+    The cursor must have been issued for the same sort key and direction.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if data["s"] != sort or data["o"] != order:
+            raise _invalid_cursor()
+        return _deserialize_value(sort, data["v"]), uuid.UUID(data["id"])
+    except HTTPException:
+        raise
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise _invalid_cursor()
+
+
+def apply_sort(query: Select, sort: str, order: str) -> Select:
+    column, _ = SORT_COLUMNS[sort]
+    if order == "desc":
+        return query.order_by(column.desc(), Lead.id.desc())
+    return query.order_by(column.asc(), Lead.id.asc())
+
+
+def apply_keyset(
+    query: Select, sort: str, order: str, value: Any, last_id: uuid.UUID
+) -> Select:
+    """Restrict the query to rows strictly after (value, last_id).
+
+    Non-nullable keys use a row-value comparison that PostgreSQL serves
+    directly from the (column, id) index. The nullable temperature key
+    follows PostgreSQL's default NULL placement (NULLs sort last ascending,
+    first descending) so the same index can be scanned in both directions.
+    """
+    column, nullable = SORT_COLUMNS[sort]
+    descending = order == "desc"
+
+    if not nullable:
+        if descending:
+            return query.where(tuple_(column, Lead.id) < tuple_(value, last_id))
+        return query.where(tuple_(column, Lead.id) > tuple_(value, last_id))
+
+    id_after = Lead.id < last_id if descending else Lead.id > last_id
+    if value is None:
+        if descending:
+            return query.where(
+                or_(and_(column.is_(None), id_after), column.isnot(None))
+            )
+        return query.where(and_(column.is_(None), id_after))
+
+    value_after = column < value if descending else column > value
+    conditions = [value_after, and_(column == value, id_after)]
+    if not descending:
+        conditions.append(column.is_(None))
+    return query.where(or_(*conditions))
+
+
+def next_cursor(
+    rows: list[Any], page_size: int, sort: str, order: str
+) -> Optional[str]:
+    """Return the cursor for the following page, or None on the last page.
+
+    ``rows`` is expected to hold up to ``page_size + 1`` rows; the extra row
+    only signals that another page exists.
+    """
+    if len(rows) <= page_size:
+        return None
+    return encode_cursor(sort, order, rows[page_size - 1])
@@ -0,0 +1,111 @@
+"""
+Async password hashing on a dedicated, bounded thread pool.
+
+bcrypt takes ~100-300 ms of CPU per call. Running it inline blocks the event
+loop, so a burst of logins stalls every other request. Here hashing runs on
+PASSWORD_HASH_WORKERS threads (bcrypt releases the GIL). Admission is
+bounded: at most PASSWORD_HASH_WORKERS calls run at once, further callers
+queue for up to PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS, and once
+PASSWORD_HASH_MAX_QUEUE callers are waiting new ones are rejected at once.
+Rejections surface as 503 with Retry-After.
+
+The synchronous helpers in app.services.auth remain for scripts (seed,
+create_superuser) that have no event loop to protect.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.services.auth import pwd_context
+
+T = TypeVar("T")
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+)
+_slots = asyncio.Semaphore(settings.PASSWORD_HASH_WORKERS)
+
+_stats = {
+    "in_flight": 0,
+    "waiting": 0,
+    "completed": 0,
+    "rejected_queue_full": 0,
+    "rejected_timeout": 0,
+    "wait_seconds_total": 0.0,
+    "wait_seconds_max": 0.0,
+    "hash_seconds_total": 0.0,
+}
+
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="המערכת עמוסה, נסה שוב בעוד מספר שניות",
+        headers={"Retry-After": "2"},
+    )
+
+
+async def _run(func: Callable[..., T], *args: Any) -> T:
+    if _stats["waiting"] >= settings.PASSWORD_HASH_MAX_QUEUE:
+        _stats["rejected_queue_full"] += 1
+        raise _busy()
+
+    queued_at = time.perf_counter()
+    _stats["waiting"] += 1
+    try:
+        await asyncio.wait_for(
+            _slots.acquire(), timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS
+        )
+    except asyncio.TimeoutError:
+        _stats["rejected_timeout"] += 1
+        raise _busy()
+    finally:
+        _stats["waiting"] -= 1
+
+    started_at = time.perf_counter()
+    waited = started_at - queued_at
+    _stats["wait_seconds_total"] += waited
+    _stats["wait_seconds_max"] = max(_stats["wait_seconds_max"], waited)
+    _stats["in_flight"] += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, func, *args)
+    finally:
+        _slots.release()
+        _stats["in_flight"] -= 1
+        _stats["completed"] += 1
+        _stats["hash_seconds_total"] += time.perf_counter() - started_at
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password using bcrypt, off the event loop."""
+    return await _run(pwd_context.hash, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash, off the event loop."""
+    return await _run(pwd_context.verify, plain_password, hashed_password)
+
+
+def metrics() -> dict[str, Any]:
+    """Snapshot of the hashing pool counters."""
+    completed = _stats["completed"]
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "max_queue": settings.PASSWORD_HASH_MAX_QUEUE,
+        **_stats,
+        "wait_seconds_avg": (
+            _stats["wait_seconds_total"] / completed if completed else 0.0
+        ),
+        "hash_seconds_avg": (
+            _stats["hash_seconds_total"] / completed if completed else 0.0
+        ),
+    }
+
+
+def shutdown() -> None:
+    _executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,50 @@
+"""
+In-process periodic jobs.
+
+Jobs are registered at import time and started by the application lifespan.
+Each job runs on its own asyncio task; a failing run is logged and retried on
+the next tick. Jobs must be safe to run from several API workers at once.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+Job = Callable[[], Awaitable[None]]
+
+_jobs: list[tuple[str, float, Job]] = []
+_tasks: list[asyncio.Task] = []
+
+
+def register(name: str, interval_seconds: float, job: Job) -> None:
+    """Run ``job`` every ``interval_seconds`` while the app is up (0 disables)."""
+    if interval_seconds > 0:
+        _jobs.append((name, interval_seconds, job))
+
+
+async def _run_forever(name: str, interval_seconds: float, job: Job) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Periodic job %s failed", name)
+
+
+def start() -> None:
+    for name, interval_seconds, job in _jobs:
+        _tasks.append(
+            asyncio.create_task(
+                _run_forever(name, interval_seconds, job), name=f"periodic:{name}"
+            )
+        )
+
+
+async def stop() -> None:
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
@@ -0,0 +1,174 @@
+"""
+In-process Bloom filter over recent lead phones.
+
+Holds the normalized_phone, and the (normalized_phone, project_type_id)
+pair, of every lead created in the last 30 days (the webhook dedup window):
+WhatsApp dedups by phone, Meta by phone and project type. A key the filter
+has never seen is a definite negative: the webhook ingest skips its dedup
+SELECT and inserts straight away. Since other processes (API workers, ingest workers) create leads this
+filter never sees, those inserts are always guarded with NOT EXISTS in the
+same statement; a stale negative costs a fallback, never a duplicate.
+
+The filter is seeded at startup, fed by every lead insert of this process
+and rebuilt every PHONE_FILTER_REBUILD_INTERVAL_SECONDS, which also drops
+phones that left the 30-day window. It is sized for twice the current key
+count (at least PHONE_FILTER_MIN_CAPACITY) at PHONE_FILTER_ERROR_RATE.
+"""
+import hashlib
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import async_session_factory
+from app.models.lead import Lead
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.bit_count = max(
+            int(-self.capacity * math.log(error_rate) / math.log(2) ** 2), 8
+        )
+        self.hash_count = max(round(self.bit_count / self.capacity * math.log(2)), 1)
+        self.item_count = 0
+        self._bits = bytearray((self.bit_count + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing (Kirsch-Mitzenmacher) over one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.bit_count for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.item_count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._bits)
+
+    def estimated_error_rate(self) -> float:
+        """False-positive rate expected at the current fill."""
+        return (1 - math.exp(-self.hash_count * self.item_count / self.bit_count)) ** self.hash_count
+
+
+_filter: Optional[BloomFilter] = None
+_built_at = 0.0
+# Leads added while a rebuild query was running, replayed into the new filter
+_pending: Optional[list[tuple[str, int]]] = None
+
+_stats = {
+    "lookups": 0,
+    "definite_negatives": 0,  # dedup SELECTs skipped
+    "false_positives": 0,  # "maybe" answers where the SELECT found nothing
+    "stale_negatives": 0,  # skipped SELECTs whose guarded insert found a lead
+}
+
+
+def _keys(normalized_phone: str, project_type_id: int) -> tuple[str, str]:
+    return normalized_phone, f"{normalized_phone}:{project_type_id}"
+
+
+def might_have_lead(normalized_phone: str, project_type_id: Optional[int] = None) -> bool:
+    """False if this process knows of no recent lead with this phone (and
+    project type, if given); True when unsure or not seeded yet."""
+    if _filter is None:
+        return True
+    _stats["lookups"] += 1
+    key = normalized_phone if project_type_id is None else _keys(normalized_phone, project_type_id)[1]
+    if key in _filter:
+        return True
+    _stats["definite_negatives"] += 1
+    return False
+
+
+def record_false_positive(count: int = 1) -> None:
+    _stats["false_positives"] += count
+
+
+def record_stale_negative(count: int = 1) -> None:
+    _stats["stale_negatives"] += count
+
+
+def remember_leads(leads: Iterable[tuple[str, int]]) -> None:
+    """Add newly created leads, as (normalized_phone, project_type_id)."""
+    for lead in leads:
+        if _filter is not None:
+            for key in _keys(*lead):
+                _filter.add(key)
+        if _pending is not None:
+            _pending.append(lead)
+
+
+async def rebuild_phone_filter() -> int:
+    """(Re)build the filter from the last 30 days of leads; returns the key count."""
+    global _filter, _built_at, _pending
+    _pending = []
+    try:
+        thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
+        async with async_session_factory() as db:
+            result = await db.execute(
+                select(Lead.normalized_phone, Lead.project_type_id)
+                .where(Lead.created_at >= thirty_days_ago)
+                .distinct()
+            )
+            pairs = [tuple(row) for row in result.all()]
+
+        keys = {key for pair in (*pairs, *_pending) for key in _keys(*pair)}
+        bloom = BloomFilter(
+            max(2 * len(keys), settings.PHONE_FILTER_MIN_CAPACITY),
+            settings.PHONE_FILTER_ERROR_RATE,
+        )
+        for key in keys:
+            bloom.add(key)
+    finally:
+        _pending = None
+    _filter = bloom
+    _built_at = time.monotonic()
+    return len(keys)
+
+
+async def seed_phone_filter() -> None:
+    """Startup seeding; without it every lookup answers "maybe" until the next rebuild."""
+    try:
+        count = await rebuild_phone_filter()
+        logger.info("Phone filter seeded with %s keys", count)
+    except Exception:
+        logger.exception("Seeding the phone filter failed")
+
+
+def filter_info() -> dict[str, Any]:
+    # Observed rate: "maybe" answers that were wrong, over all lookups that
+    # turned out to have no lead
+    negatives = (
+        _stats["false_positives"] + _stats["definite_negatives"] - _stats["stale_negatives"]
+    )
+    return {
+        **_stats,
+        "ready": _filter is not None,
+        "keys": _filter.item_count if _filter else 0,
+        "capacity": _filter.capacity if _filter else 0,
+        "memory_bytes": _filter.memory_bytes if _filter else 0,
+        "hash_count": _filter.hash_count if _filter else 0,
+        "estimated_false_positive_rate": _filter.estimated_error_rate() if _filter else None,
+        "observed_false_positive_rate": (
+            _stats["false_positives"] / negatives if negatives else None
+        ),
+        "age_seconds": time.monotonic() - _built_at if _filter else None,
+    }
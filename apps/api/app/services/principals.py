@@ -0,0 +1,83 @@
+"""
+Authenticated principals for request handling.
+
+get_current_user only needs who the caller is and what they may do, so it
+resolves a small Principal (id, role, is_active) instead of a User entity
+and keeps it in a per-process TTL cache: a cache hit costs no query.
+
+Writes to User rows (role changes, deactivation, ...) are picked up from the
+Session flush and drop the cached principal once the transaction commits.
+Other API processes see the change within PRINCIPAL_CACHE_TTL_SECONDS.
+"""
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.user import User, UserRole
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: uuid.UUID
+    role: UserRole
+    is_active: bool
+
+
+_cache: "OrderedDict[uuid.UUID, tuple[float, Principal]]" = OrderedDict()
+
+
+def invalidate_principal(user_id: uuid.UUID) -> None:
+    _cache.pop(user_id, None)
+
+
+def invalidate_all_principals() -> None:
+    _cache.clear()
+
+
+async def load_principal(db: AsyncSession, user_id: uuid.UUID) -> Optional[Principal]:
+    """Return the principal for ``user_id`` (cached), or None if there is no such user."""
+    entry = _cache.get(user_id)
+    if entry is not None:
+        expires_at, principal = entry
+        if expires_at >= time.monotonic():
+            _cache.move_to_end(user_id)
+            return principal
+        del _cache[user_id]
+
+    result = await db.execute(
+        select(User.id, User.role, User.is_active).where(User.id == user_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+
+    principal = Principal(id=row.id, role=row.role, is_active=row.is_active)
+    _cache[user_id] = (time.monotonic() + settings.PRINCIPAL_CACHE_TTL_SECONDS, principal)
+    while len(_cache) > settings.PRINCIPAL_CACHE_MAX_ENTRIES:
+        _cache.popitem(last=False)
+    return principal
+
+
+@event.listens_for(Session, "after_flush")
+def _track_user_writes(session: Session, flush_context: Any) -> None:
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            session.info.setdefault("principals_changed", set()).add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    for user_id in session.info.pop("principals_changed", ()):
+        invalidate_principal(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _reset_on_rollback(session: Session) -> None:
+    session.info.pop("principals_changed", None)
@@ -0,0 +1,144 @@
+"""
+In-memory registry of project types.
+
+project_types is a four-row reference table that almost every lead query and
+webhook needs to resolve a key like "mamad" to its id. The registry holds
+all rows by key and by id, so callers resolve keys without a query.
+
+It is loaded at startup and cached per process. It is dropped when a
+transaction that wrote project_types commits in this process, and reloaded
+on next use. Other processes (the ingest worker, other API workers, the seed
+script) reload once it is older than PROJECT_TYPES_MAX_AGE_SECONDS.
+"""
+import hashlib
+import json
+import logging
+import time
+from typing import Any, NamedTuple, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import async_session_factory
+from app.models.project_type import ProjectType
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROJECT_TYPE_KEY = "renovation"
+# Id of the default in the seed data, for the (unseeded) case the table lacks it
+DEFAULT_PROJECT_TYPE_ID = 3
+
+
+class ProjectTypeEntry(NamedTuple):
+    id: int
+    key: str
+    display_name_he: str
+    is_active: bool
+
+
+class ProjectTypeRegistry:
+    """Immutable snapshot of the project_types table."""
+
+    def __init__(self, entries: list[ProjectTypeEntry], version: int):
+        self.version = version
+        self.entries = tuple(sorted(entries, key=lambda entry: entry.id))
+        self._by_key = {entry.key: entry for entry in self.entries}
+        self._by_id = {entry.id: entry for entry in self.entries}
+        digest = hashlib.sha256(
+            json.dumps([list(entry) for entry in self.entries], ensure_ascii=False).encode()
+        ).hexdigest()
+        # Strong validator: changes exactly when the table contents change
+        self.etag = f'"{digest[:32]}"'
+
+    def get(self, key: str) -> Optional[ProjectTypeEntry]:
+        return self._by_key.get(key)
+
+    def by_id(self, project_type_id: int) -> Optional[ProjectTypeEntry]:
+        return self._by_id.get(project_type_id)
+
+    def id_of(self, key: str) -> Optional[int]:
+        entry = self._by_key.get(key)
+        return entry.id if entry else None
+
+    def resolve(self, key: Optional[str]) -> int:
+        """Id of ``key``, falling back to renovation for unknown keys."""
+        return (
+            (self.id_of(key) if key else None)
+            or self.id_of(DEFAULT_PROJECT_TYPE_KEY)
+            or DEFAULT_PROJECT_TYPE_ID
+        )
+
+
+_registry: Optional[ProjectTypeRegistry] = None
+_loaded_at = 0.0
+_version = 0
+
+
+def invalidate_project_types() -> None:
+    global _registry
+    _registry = None
+
+
+async def get_project_types(db: AsyncSession) -> ProjectTypeRegistry:
+    """The cached registry, (re)loaded from the table when stale."""
+    global _registry, _loaded_at, _version
+    if (
+        _registry is not None
+        and time.monotonic() - _loaded_at < settings.PROJECT_TYPES_MAX_AGE_SECONDS
+    ):
+        return _registry
+
+    result = await db.execute(
+        select(
+            ProjectType.id,
+            ProjectType.key,
+            ProjectType.display_name_he,
+            ProjectType.is_active,
+        )
+    )
+    _version += 1
+    _registry = ProjectTypeRegistry(
+        [ProjectTypeEntry(*row) for row in result.all()], _version
+    )
+    _loaded_at = time.monotonic()
+    return _registry
+
+
+async def load_project_types() -> None:
+    """Startup load; without it the first request pays for the query."""
+    try:
+        async with async_session_factory() as db:
+            registry = await get_project_types(db)
+        logger.info("Loaded %s project types", len(registry.entries))
+    except Exception:
+        logger.exception("Loading project types failed")
+
+
+def registry_info() -> dict[str, Any]:
+    return {
+        "version": _registry.version if _registry else None,
+        "project_types": len(_registry.entries) if _registry else 0,
+        "etag": _registry.etag if _registry else None,
+        "age_seconds": time.monotonic() - _loaded_at if _registry else None,
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def _track_project_type_writes(session: Session, flush_context: Any) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, ProjectType):
+            session.info["project_types_changed"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    if session.info.pop("project_types_changed", False):
+        invalidate_project_types()
+
+
+@event.listens_for(Session, "after_rollback")
+def _reset_on_rollback(session: Session) -> None:
+    session.info.pop("project_types_changed", None)
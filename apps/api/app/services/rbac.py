@@ -2,9 +2,12 @@ import uuid
 from typing import Optional
 
 from fastapi import HTTPException, status
+from sqlalchemy import or_
+from sqlalchemy.sql import Select
 
-from app.models.lead import LeadStatus
-from app.models.user import User, UserRole
+from app.models.lead import Lead, LeadStatus
+from app.models.user import UserRole
+from app.services.principals import Principal
 
 # Statuses that qualifiers can work with
 QUALIFIER_VISIBLE_STATUSES = {
@@ -32,7 +35,7 @@ CLOSER_ONLY_STATUSES = {
 
 
 def check_lead_list_access(
-    user: User,
+    user: Principal,
     lead_qualifier_id: Optional[uuid.UUID],
     lead_closer_id: Optional[uuid.UUID],
     lead_status: LeadStatus,
@@ -66,7 +69,25 @@ def check_lead_list_access(
     return False
 
 
-def check_lead_transition(user: User, from_status: LeadStatus, to_status: LeadStatus) -> None:
+def apply_lead_visibility(query: Select, user: Principal) -> Select:
+    """
+    Restrict a leads query to the rows the user may see.
+    SQL counterpart of check_lead_list_access.
+    """
+    if user.role == UserRole.closer:
+        return query.where(Lead.closer_id == user.id)
+    if user.role == UserRole.qualifier:
+        return query.where(
+            or_(
+                Lead.qualifier_id == None,
+                Lead.qualifier_id == user.id,
+                Lead.status == LeadStatus.new_lead,
+            )
+        )
+    return query
+
+
+def check_lead_transition(user: Principal, from_status: LeadStatus, to_status: LeadStatus) -> None:
     """
     Validate that the user can perform the given status transition.
     Raises HTTPException if not allowed.
@@ -92,7 +113,7 @@ def check_lead_transition(user: User, from_status: LeadStatus, to_status: LeadSt
     )
 
 
-def require_admin(user: User) -> None:
+def require_admin(user: Principal) -> None:
     """Raise 403 if user is not admin."""
     if user.role != UserRole.admin:
         raise HTTPException(
@@ -101,7 +122,7 @@ def require_admin(user: User) -> None:
         )
 
 
-def require_role(user: User, *roles: UserRole) -> None:
+def require_role(user: Principal, *roles: UserRole) -> None:
     """Raise 403 if user does not have one of the required roles."""
     if user.role not in roles:
         raise HTTPException(
@@ -0,0 +1,235 @@
+"""
+Daily and monthly lead rollups for analytics.
+
+Buckets are UTC days/months keyed by (bucket, project_type_id, source,
+status) and hold:
+
+- leads_created:  leads created in the bucket, by their current status
+- status_entries: transitions into the status recorded in the bucket
+
+refresh_rollups() is incremental. It collects the days touched since the last
+watermark (creation days of leads whose updated_at moved, and days of new
+status history rows), recomputes only those daily buckets, then re-sums the
+months they belong to. Range queries read whole months from the monthly table
+and only the partial edge days from the daily table.
+"""
+from datetime import date, datetime, timedelta
+from typing import Any, Optional
+
+from sqlalchemy import Date, delete, func, literal_column, select, text, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.lead import LeadStatus
+from app.models.lead_rollup import LeadRollupDaily, LeadRollupMonthly
+from app.models.project_type import ProjectType
+
+WATERMARK_NAME = "lead_rollups"
+
+# pg advisory lock key, so only one worker refreshes at a time
+_REFRESH_LOCK_KEY = 0x4C524F4C
+
+ROLLUP_DIMENSIONS = ("project_type", "source", "status", "month")
+
+_UTC_DAY = "(({col}) AT TIME ZONE 'UTC')::date"
+
+_AFFECTED_DAYS_SQL = text(
+    f"""
+    SELECT DISTINCT {_UTC_DAY.format(col="created_at")} AS day
+    FROM leads WHERE updated_at > :since
+    UNION
+    SELECT DISTINCT {_UTC_DAY.format(col="changed_at")}
+    FROM lead_status_history WHERE changed_at > :since
+    """
+)
+
+_ALL_DAYS_SQL = text(
+    f"""
+    SELECT DISTINCT {_UTC_DAY.format(col="created_at")} AS day FROM leads
+    UNION
+    SELECT DISTINCT {_UTC_DAY.format(col="changed_at")} FROM lead_status_history
+    """
+)
+
+# Each day is scanned with a created_at/changed_at range so the per-day
+# lookups use the (created_at, id) and changed_at indexes.
+_REBUILD_DAYS_SQL = text(
+    """
+    WITH days AS (
+        SELECT d::date AS day,
+               (d::timestamp AT TIME ZONE 'UTC') AS day_start,
+               ((d + 1)::timestamp AT TIME ZONE 'UTC') AS day_end
+        FROM unnest(CAST(:days AS date[])) AS d
+    )
+    INSERT INTO lead_rollups_daily
+        (bucket, project_type_id, source, status, leads_created, status_entries)
+    SELECT day, project_type_id, source, status, sum(created), sum(entries)
+    FROM (
+        SELECT days.day, l.project_type_id, l.source, l.status,
+               count(*) AS created, 0 AS entries
+        FROM days
+        JOIN leads l ON l.created_at >= days.day_start AND l.created_at < days.day_end
+        GROUP BY 1, 2, 3, 4
+        UNION ALL
+        SELECT days.day, l.project_type_id, l.source, h.to_status::lead_status,
+               0, count(*)
+        FROM days
+        JOIN lead_status_history h
+            ON h.changed_at >= days.day_start AND h.changed_at < days.day_end
+        JOIN leads l ON l.id = h.lead_id
+        GROUP BY 1, 2, 3, 4
+    ) facts
+    GROUP BY 1, 2, 3, 4
+    """
+)
+
+_REBUILD_MONTHS_SQL = text(
+    """
+    WITH months AS (
+        SELECT m::date AS month FROM unnest(CAST(:months AS date[])) AS m
+    )
+    INSERT INTO lead_rollups_monthly
+        (bucket, project_type_id, source, status, leads_created, status_entries)
+    SELECT months.month, d.project_type_id, d.source, d.status,
+           sum(d.leads_created), sum(d.status_entries)
+    FROM months
+    JOIN lead_rollups_daily d
+        ON d.bucket >= months.month
+       AND d.bucket < (months.month + interval '1 month')::date
+    GROUP BY 1, 2, 3, 4
+    """
+)
+
+_UPSERT_WATERMARK_SQL = text(
+    """
+    INSERT INTO rollup_watermarks (name, watermark) VALUES (:name, :watermark)
+    ON CONFLICT (name) DO UPDATE SET watermark = EXCLUDED.watermark
+    """
+)
+
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _next_month(day: date) -> date:
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+async def refresh_rollups(db: AsyncSession) -> bool:
+    """Bring the rollups up to date. Returns False if another refresh is running.
+
+    The scan window starts ROLLUP_WATERMARK_LAG_SECONDS before the stored
+    watermark, so rows committed late with an older timestamp are still
+    picked up; recomputing a bucket twice is harmless.
+    """
+    locked = await db.scalar(select(func.pg_try_advisory_xact_lock(_REFRESH_LOCK_KEY)))
+    if not locked:
+        return False
+
+    started_at: datetime = await db.scalar(select(func.now()))
+    watermark: Optional[datetime] = await db.scalar(
+        text("SELECT watermark FROM rollup_watermarks WHERE name = :name"),
+        {"name": WATERMARK_NAME},
+    )
+
+    if watermark is None:
+        result = await db.execute(_ALL_DAYS_SQL)
+    else:
+        since = watermark - timedelta(seconds=settings.ROLLUP_WATERMARK_LAG_SECONDS)
+        result = await db.execute(_AFFECTED_DAYS_SQL, {"since": since})
+    days = sorted(row.day for row in result)
+
+    if days:
+        months = sorted({_month_start(day) for day in days})
+        await db.execute(
+            delete(LeadRollupDaily).where(LeadRollupDaily.bucket.in_(days))
+        )
+        await db.execute(_REBUILD_DAYS_SQL, {"days": days})
+        await db.execute(
+            delete(LeadRollupMonthly).where(LeadRollupMonthly.bucket.in_(months))
+        )
+        await db.execute(_REBUILD_MONTHS_SQL, {"months": months})
+
+    await db.execute(
+        _UPSERT_WATERMARK_SQL, {"name": WATERMARK_NAME, "watermark": started_at}
+    )
+    return True
+
+
+def _bucket_rows(date_from: date, date_to: date) -> Any:
+    """Rollup rows covering [date_from, date_to]: whole months plus edge days."""
+    first_full_month = (
+        date_from if date_from.day == 1 else _next_month(date_from)
+    )
+    end_exclusive = date_to + timedelta(days=1)
+    last_full_month_end = _month_start(end_exclusive)
+
+    def project(table: Any, month_expr: Any) -> Any:
+        return select(
+            month_expr.label("month"),
+            table.project_type_id,
+            table.source,
+            table.status,
+            table.leads_created,
+            table.status_entries,
+        )
+
+    daily_month = func.date_trunc(literal_column("'month'"), LeadRollupDaily.bucket).cast(Date)
+
+    if first_full_month >= last_full_month_end:
+        # No whole month inside the range: daily buckets only
+        return project(LeadRollupDaily, daily_month).where(
+            LeadRollupDaily.bucket >= date_from,
+            LeadRollupDaily.bucket < end_exclusive,
+        )
+
+    return union_all(
+        project(LeadRollupMonthly, LeadRollupMonthly.bucket).where(
+            LeadRollupMonthly.bucket >= first_full_month,
+            LeadRollupMonthly.bucket < last_full_month_end,
+        ),
+        project(LeadRollupDaily, daily_month).where(
+            LeadRollupDaily.bucket >= date_from,
+            LeadRollupDaily.bucket < first_full_month,
+        ),
+        project(LeadRollupDaily, daily_month).where(
+            LeadRollupDaily.bucket >= last_full_month_end,
+            LeadRollupDaily.bucket < end_exclusive,
+        ),
+    )
+
+
+async def query_rollups(
+    db: AsyncSession, date_from: date, date_to: date, group_by: list[str]
+) -> list[dict[str, Any]]:
+    """Sum rollup buckets in [date_from, date_to] grouped by the given dimensions."""
+    buckets = _bucket_rows(date_from, date_to).subquery()
+    dimension_columns = {
+        "project_type": ProjectType.key.label("project_type"),
+        "source": buckets.c.source,
+        "status": buckets.c.status,
+        "month": buckets.c.month,
+    }
+    columns = [dimension_columns[dim] for dim in group_by]
+
+    query = (
+        select(
+            *columns,
+            func.coalesce(func.sum(buckets.c.leads_created), 0).label("leads_created"),
+            func.coalesce(func.sum(buckets.c.status_entries), 0).label("status_entries"),
+            func.coalesce(
+                func.sum(buckets.c.status_entries).filter(
+                    buckets.c.status == LeadStatus.won
+                ),
+                0,
+            ).label("wins"),
+        )
+        .select_from(buckets)
+        .join(ProjectType, ProjectType.id == buckets.c.project_type_id)
+    )
+    if columns:
+        query = query.group_by(*columns).order_by(*columns)
+
+    result = await db.execute(query)
+    return [dict(row._mapping) for row in result.all()]
@@ -0,0 +1,153 @@
+"""
+S3-compatible blob storage (AWS S3, MinIO).
+
+boto3 is synchronous, so calls that reach the store run in a thread;
+presigning is local computation and runs inline. Uploads are presigned with
+the content's sha256 as a signed x-amz-checksum-sha256 header, so the store
+rejects any body that does not hash to the key it is uploaded under.
+
+S3_PUBLIC_ENDPOINT_URL is the endpoint browsers use, when it differs from
+the one the API reaches (e.g. http://localhost:9000 vs http://minio:9000);
+presigned URLs are signed for that host.
+"""
+import asyncio
+import base64
+import contextlib
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from app.config import settings
+from app.services.downloads import IMMUTABLE_CACHE_CONTROL
+from app.services.storage import BlobStat, BlobStorage, PresignedUpload
+
+# DeleteObjects limit
+_DELETE_BATCH_SIZE = 1000
+
+
+def _client(endpoint_url: str):
+    return boto3.client(
+        "s3",
+        endpoint_url=endpoint_url or None,
+        region_name=settings.S3_REGION,
+        aws_access_key_id=settings.S3_ACCESS_KEY_ID or None,
+        aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY or None,
+        # Path-style addressing: MinIO serves buckets as paths by default
+        config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+    )
+
+
+def _not_found(error: ClientError) -> bool:
+    return error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+
+class S3Storage(BlobStorage):
+    name = "s3"
+
+    def __init__(self) -> None:
+        self.bucket = settings.S3_BUCKET
+        self._client = _client(settings.S3_ENDPOINT_URL)
+        self._presigner = _client(settings.S3_PUBLIC_ENDPOINT_URL or settings.S3_ENDPOINT_URL)
+
+    async def put_file(self, key: str, path: str) -> None:
+        try:
+            await asyncio.to_thread(
+                self._client.upload_file,
+                path,
+                self.bucket,
+                key,
+                ExtraArgs={"ContentType": "application/pdf", "ChecksumAlgorithm": "SHA256"},
+            )
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
+    async def stat(self, key: str) -> Optional[BlobStat]:
+        try:
+            head = await asyncio.to_thread(
+                self._client.head_object, Bucket=self.bucket, Key=key, ChecksumMode="ENABLED"
+            )
+        except ClientError as error:
+            if _not_found(error):
+                return None
+            raise
+        checksum = head.get("ChecksumSHA256")
+        return BlobStat(
+            head["ContentLength"],
+            base64.b64decode(checksum).hex() if checksum else None,
+        )
+
+    async def read_head(self, key: str, length: int) -> bytes:
+        response = await asyncio.to_thread(
+            self._client.get_object, Bucket=self.bucket, Key=key, Range=f"bytes=0-{length - 1}"
+        )
+        return await asyncio.to_thread(response["Body"].read)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._client.delete_object, Bucket=self.bucket, Key=key)
+
+    def _delete_many(self, keys: list[str]) -> None:
+        for start in range(0, len(keys), _DELETE_BATCH_SIZE):
+            response = self._client.delete_objects(
+                Bucket=self.bucket,
+                Delete={
+                    "Objects": [{"Key": key} for key in keys[start : start + _DELETE_BATCH_SIZE]],
+                    "Quiet": True,
+                },
+            )
+            errors = response.get("Errors", [])
+            if errors:
+                raise OSError(
+                    f"Could not delete {len(errors)} objects from {self.bucket}: "
+                    f"{errors[0].get('Key')}: {errors[0].get('Message')}"
+                )
+
+    async def delete_many(self, keys: list[str]) -> None:
+        if keys:
+            await asyncio.to_thread(self._delete_many, keys)
+
+    def _list(self, prefix: str, min_age_seconds: float) -> list[str]:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=min_age_seconds)
+        keys = []
+        paginator = self._client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix.rstrip("/") + "/"):
+            keys += [item["Key"] for item in page.get("Contents", []) if item["LastModified"] < cutoff]
+        return keys
+
+    async def list_keys(self, prefix: str, min_age_seconds: float) -> list[str]:
+        return await asyncio.to_thread(self._list, prefix, min_age_seconds)
+
+    def presigned_upload(self, key: str, size: int, sha256: str) -> PresignedUpload:
+        checksum = base64.b64encode(bytes.fromhex(sha256)).decode()
+        url = self._presigner.generate_presigned_url(
+            "put_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ContentType": "application/pdf",
+                "ContentLength": size,
+                "ChecksumSHA256": checksum,
+            },
+            ExpiresIn=settings.OFFER_PRESIGN_EXPIRES_SECONDS,
+        )
+        return PresignedUpload(
+            url,
+            {"Content-Type": "application/pdf", "x-amz-checksum-sha256": checksum},
+        )
+
+    def presigned_download(self, key: str, filename: str) -> str:
+        return self._presigner.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ResponseContentType": "application/pdf",
+                "ResponseContentDisposition": f'attachment; filename="{filename}"',
+                "ResponseCacheControl": IMMUTABLE_CACHE_CONTROL,
+            },
+            ExpiresIn=settings.OFFER_PRESIGN_EXPIRES_SECONDS,
+        )
@@ -0,0 +1,145 @@
+"""
+Lead search backed by pg_trgm.
+
+Text terms are Hebrew-normalized and matched against the trigger-maintained
+leads.search_text column (name, city and campaign) with LIKE and trigram
+word-similarity; emails are matched with ILIKE. Both are served by GIN
+trigram indexes. Phone lookups normalize the digits first and match prefixes
+(varchar_pattern_ops index) and suffixes (index on the reversed number), or
+substrings (trigram index) once the fragment has 3 digits. Typeahead results
+are ranked by similarity score.
+"""
+import re
+from typing import Any, Optional
+
+from sqlalchemy import ColumnElement, case, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.lead import Lead
+from app.services.hebrew import normalize_hebrew
+from app.services.phone import normalize_phone
+from app.services.principals import Principal
+from app.services.rbac import apply_lead_visibility
+
+LIKE_ESCAPE = "\\"
+
+# Shortest pattern the pg_trgm indexes can narrow down
+TRIGRAM_LENGTH = 3
+
+_PHONE_CHARS = re.compile(r"[\s\-\(\)\+]")
+
+
+def _escape_like(value: str) -> str:
+    return (
+        value.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", LIKE_ESCAPE + "%")
+        .replace("_", LIKE_ESCAPE + "_")
+    )
+
+
+def phone_digits(term: str) -> Optional[str]:
+    """Return the digits of a phone-like search term, or None for text terms."""
+    cleaned = _PHONE_CHARS.sub("", term)
+    return cleaned if cleaned.isdigit() else None
+
+
+def _phone_condition(digits: str) -> ColumnElement[bool]:
+    """Prefix, suffix or substring match on normalized_phone.
+
+    Fragments shorter than a trigram are matched as prefix or suffix only,
+    each served by its own btree pattern index. Longer ones use the trigram
+    index for the substring match, which already covers the suffix branch
+    (and the prefix one, unless normalization rewrote a leading 0).
+
+    Patterns are built in Python and bound as a single parameter so the
+    planner can use the prefix indexes for every execution, including
+    generic plans of prepared statements.
+    """
+    normalized = normalize_phone(digits)
+    prefix = Lead.normalized_phone.like(
+        f"{_escape_like(normalized)}%", escape=LIKE_ESCAPE
+    )
+    if len(digits) < TRIGRAM_LENGTH:
+        return or_(
+            prefix,
+            func.reverse(Lead.normalized_phone).like(
+                f"{_escape_like(digits[::-1])}%", escape=LIKE_ESCAPE
+            ),
+        )
+    substring = Lead.normalized_phone.like(
+        f"%{_escape_like(digits)}%", escape=LIKE_ESCAPE
+    )
+    return substring if normalized == digits else or_(prefix, substring)
+
+
+def _text_condition(term: str) -> ColumnElement[bool]:
+    normalized = normalize_hebrew(term)
+    return or_(
+        Lead.search_text.like(f"%{_escape_like(normalized)}%", escape=LIKE_ESCAPE),
+        Lead.email.ilike(f"%{_escape_like(term)}%", escape=LIKE_ESCAPE),
+        # word_similarity(term, search_text) above pg_trgm.word_similarity_threshold
+        Lead.search_text.op("%>")(normalized),
+    )
+
+
+def search_condition(term: str) -> ColumnElement[bool]:
+    """WHERE clause for the ``search`` filter of the lead list."""
+    term = term.strip()
+    digits = phone_digits(term)
+    if digits:
+        return _phone_condition(digits)
+    return _text_condition(term)
+
+
+def _phone_score(digits: str) -> ColumnElement[Any]:
+    normalized = _escape_like(normalize_phone(digits))
+    reversed_digits = _escape_like(digits[::-1])
+    return case(
+        (Lead.normalized_phone.like(f"{normalized}%", escape=LIKE_ESCAPE), 1.0),
+        (
+            func.reverse(Lead.normalized_phone).like(
+                f"{reversed_digits}%", escape=LIKE_ESCAPE
+            ),
+            0.9,
+        ),
+        else_=0.5,
+    )
+
+
+def _text_score(term: str) -> ColumnElement[Any]:
+    return func.greatest(
+        func.word_similarity(normalize_hebrew(term), Lead.search_text),
+        func.similarity(func.coalesce(Lead.email, ""), term),
+    )
+
+
+async def typeahead(
+    db: AsyncSession, user: Principal, term: str, limit: int
+) -> list[Any]:
+    """Top ``limit`` leads matching ``term``, best match first."""
+    term = term.strip()
+    digits = phone_digits(term)
+    if digits:
+        condition, score = _phone_condition(digits), _phone_score(digits)
+    else:
+        condition, score = _text_condition(term), _text_score(term)
+    score = score.label("score")
+
+    query = (
+        select(
+            Lead.id,
+            Lead.project_type_id,
+            Lead.full_name,
+            Lead.phone,
+            Lead.email,
+            Lead.status,
+            score,
+        )
+        .where(condition)
+        .order_by(score.desc(), Lead.created_at.desc())
+        .limit(limit)
+    )
+    query = apply_lead_visibility(query, user)
+    result = await db.execute(query)
+    return list(result.all())
+
@@ -0,0 +1,142 @@
+"""
+Blob storage backends for offer files.
+
+Keys are "/"-separated paths like ``offers/ab/cd/<sha256>.pdf``. Two drivers,
+picked by OFFER_STORAGE_BACKEND:
+
+- local: files under STORAGE_PATH, served by the API (or by the proxy, see
+  app.services.downloads). Every API replica needs the same volume.
+- s3: any S3-compatible store (AWS S3, MinIO). Browsers upload and download
+  with presigned URLs, so PDF bytes never pass through the API and replicas
+  share nothing but the bucket. See app.services.s3_storage.
+"""
+import asyncio
+import contextlib
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import NamedTuple, Optional
+
+import aiofiles
+import aiofiles.os
+
+from app.config import settings
+
+STORAGE_BACKENDS = ("local", "s3")
+
+
+class BlobStat(NamedTuple):
+    size: int
+    # Content hash as recorded by the backend, when it keeps one
+    sha256: Optional[str] = None
+
+
+class PresignedUpload(NamedTuple):
+    url: str
+    # Headers the client must send with its PUT (they are signed)
+    headers: dict[str, str]
+
+
+class BlobStorage(ABC):
+    name: str
+
+    @abstractmethod
+    async def put_file(self, key: str, path: str) -> None:
+        """Store the local file at ``path`` under ``key``, consuming the file."""
+
+    @abstractmethod
+    async def stat(self, key: str) -> Optional[BlobStat]:
+        """Size (and hash, if known) of ``key``; None if it does not exist."""
+
+    @abstractmethod
+    async def read_head(self, key: str, length: int) -> bytes:
+        """The first ``length`` bytes of ``key``."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove ``key``; a missing key is not an error."""
+
+    async def delete_many(self, keys: list[str]) -> None:
+        """Remove every key in ``keys``; missing keys are not an error."""
+        for key in keys:
+            await self.delete(key)
+
+    @abstractmethod
+    async def list_keys(self, prefix: str, min_age_seconds: float) -> list[str]:
+        """Keys under ``prefix`` last written more than ``min_age_seconds`` ago."""
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Filesystem path of ``key``, for backends the API serves from disk."""
+        return None
+
+    def presigned_upload(self, key: str, size: int, sha256: str) -> Optional[PresignedUpload]:
+        """A URL the client can PUT exactly this content to; None if unsupported."""
+        return None
+
+    def presigned_download(self, key: str, filename: str) -> Optional[str]:
+        """A short-lived GET URL for ``key``; None if the API serves it itself."""
+        return None
+
+
+class LocalStorage(BlobStorage):
+    name = "local"
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def local_path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    async def put_file(self, key: str, path: str) -> None:
+        target = self.local_path(key)
+        await aiofiles.os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Atomic as long as the staged file is on the same filesystem
+        await aiofiles.os.replace(path, target)
+
+    async def stat(self, key: str) -> Optional[BlobStat]:
+        try:
+            return BlobStat((await aiofiles.os.stat(self.local_path(key))).st_size)
+        except FileNotFoundError:
+            return None
+
+    async def read_head(self, key: str, length: int) -> bytes:
+        async with aiofiles.open(self.local_path(key), "rb") as f:
+            return await f.read(length)
+
+    async def delete(self, key: str) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            await aiofiles.os.remove(self.local_path(key))
+
+    def _walk(self, prefix: str, min_age_seconds: float) -> list[str]:
+        cutoff = time.time() - min_age_seconds
+        keys = []
+        for directory, _, files in os.walk(self.local_path(prefix)):
+            for name in files:
+                path = os.path.join(directory, name)
+                if os.stat(path).st_mtime < cutoff:
+                    keys.append(os.path.relpath(path, self.root).replace(os.sep, "/"))
+        return keys
+
+    async def list_keys(self, prefix: str, min_age_seconds: float) -> list[str]:
+        return await asyncio.to_thread(self._walk, prefix, min_age_seconds)
+
+
+_storage: Optional[BlobStorage] = None
+
+
+def get_storage() -> BlobStorage:
+    """The configured backend (created on first use)."""
+    global _storage
+    if _storage is None:
+        if settings.OFFER_STORAGE_BACKEND == "s3":
+            # boto3 is only needed, and imported, when S3 is configured
+            from app.services.s3_storage import S3Storage
+
+            _storage = S3Storage()
+        elif settings.OFFER_STORAGE_BACKEND == "local":
+            _storage = LocalStorage(settings.STORAGE_PATH)
+        else:
+            raise ValueError(
+                f"OFFER_STORAGE_BACKEND must be one of {', '.join(STORAGE_BACKENDS)}"
+            )
+    return _storage
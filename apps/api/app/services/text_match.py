@@ -0,0 +1,140 @@
+"""
+Substring matching over a fixed, ranked list of patterns.
+
+Both matchers are compiled once from patterns given best first (rank 0 is
+the top pattern) and answer in time linear in the text being matched,
+independent of how many patterns there are:
+
+- ContainedPatterns: the best pattern that occurs inside a text
+  (Aho-Corasick automaton).
+- ContainingPatterns: the best pattern that contains a text
+  (generalized suffix automaton).
+
+Callers normalize patterns and texts themselves (see app.services.hebrew).
+"""
+from collections import deque
+from typing import Optional
+
+
+def _better(rank: Optional[int], other: Optional[int]) -> Optional[int]:
+    if rank is None:
+        return other
+    if other is None:
+        return rank
+    return min(rank, other)
+
+
+class ContainedPatterns:
+    """Aho-Corasick automaton: which pattern is contained in a text."""
+
+    def __init__(self, patterns: list[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._best: list[Optional[int]] = [None]
+
+        for rank, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._best.append(None)
+                node = next_node
+            self._best[node] = _better(self._best[node], rank)
+
+        # Failure links (breadth first); each node inherits the best rank of
+        # its failure chain, i.e. of every pattern that is a suffix of it
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0) if node else 0
+                self._best[child] = _better(self._best[child], self._best[self._fail[child]])
+                queue.append(child)
+
+    def best(self, text: str) -> Optional[int]:
+        """Rank of the best pattern occurring in ``text``, or None."""
+        best = self._best[0]  # an empty pattern occurs everywhere
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            best = _better(best, self._best[node])
+            if best == 0:
+                break  # the top pattern cannot be beaten
+        return best
+
+
+class ContainingPatterns:
+    """Generalized suffix automaton: which pattern contains a text."""
+
+    def __init__(self, patterns: list[str]):
+        self._next: list[dict[str, int]] = [{}]
+        self._link: list[int] = [-1]
+        self._length: list[int] = [0]
+        self._best: list[Optional[int]] = [None]
+
+        for rank, pattern in enumerate(patterns):
+            last = 0
+            for char in pattern:
+                last = self._extend(last, char)
+                self._best[last] = _better(self._best[last], rank)
+
+        # Every substring of a pattern is a suffix of one of its prefixes:
+        # push ranks down the suffix links, longest states first
+        for state in sorted(range(1, len(self._next)), key=self._length.__getitem__, reverse=True):
+            parent = self._link[state]
+            self._best[parent] = _better(self._best[parent], self._best[state])
+        if patterns:
+            self._best[0] = 0  # the empty text is contained in every pattern
+
+    def _new_state(self, length: int, link: int, transitions: dict[str, int]) -> int:
+        self._next.append(transitions)
+        self._link.append(link)
+        self._length.append(length)
+        self._best.append(None)
+        return len(self._next) - 1
+
+    def _clone(self, p: int, q: int, char: str) -> int:
+        clone = self._new_state(self._length[p] + 1, self._link[q], dict(self._next[q]))
+        while p != -1 and self._next[p].get(char) == q:
+            self._next[p][char] = clone
+            p = self._link[p]
+        self._link[q] = clone
+        return clone
+
+    def _extend(self, last: int, char: str) -> int:
+        existing = self._next[last].get(char)
+        if existing is not None:
+            # The extended prefix is already a state (shared with an earlier pattern)
+            if self._length[last] + 1 == self._length[existing]:
+                return existing
+            return self._clone(last, existing, char)
+
+        current = self._new_state(self._length[last] + 1, 0, {})
+        p = last
+        while p != -1 and char not in self._next[p]:
+            self._next[p][char] = current
+            p = self._link[p]
+        if p != -1:
+            q = self._next[p][char]
+            if self._length[p] + 1 == self._length[q]:
+                self._link[current] = q
+            else:
+                self._link[current] = self._clone(p, q, char)
+        return current
+
+    def best(self, text: str) -> Optional[int]:
+        """Rank of the best pattern containing ``text``, or None."""
+        state = 0
+        for char in text:
+            state = self._next[state].get(char)
+            if state is None:
+                return None
+        return self._best[state]
@@ -0,0 +1,80 @@
+"""
+Streaming PDF uploads.
+
+An upload is copied in OFFER_UPLOAD_CHUNK_BYTES chunks to a temp file in a
+staging directory, written with aiofiles so disk I/O never blocks the event
+loop and memory use stays at one chunk per upload. The size and sha256 are
+computed on the fly, the content must start with the PDF magic bytes, and an
+upload is aborted as soon as it crosses OFFER_UPLOAD_MAX_BYTES. A rejected
+or failed upload leaves nothing behind; a complete one is fsynced and left
+for the caller to rename into place (atomically, on the same filesystem).
+"""
+import contextlib
+import hashlib
+import os
+import uuid
+from typing import NamedTuple
+
+import aiofiles
+import aiofiles.os
+from fastapi import HTTPException, UploadFile, status
+
+from app.config import settings
+
+PDF_MAGIC = b"%PDF-"
+PART_SUFFIX = ".part"
+
+_fsync = aiofiles.os.wrap(os.fsync)
+
+
+class StoredUpload(NamedTuple):
+    path: str
+    size: int
+    sha256: str
+
+
+def _not_pdf() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="יש להעלות קובץ PDF בלבד",
+    )
+
+
+def too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"הקובץ גדול מדי (עד {settings.OFFER_UPLOAD_MAX_BYTES // (1024 * 1024)}MB)",
+    )
+
+
+async def receive_pdf(upload: UploadFile, directory: str) -> StoredUpload:
+    """Stream ``upload`` to a temp file in ``directory``.
+
+    Raises HTTPException for non-PDF or oversized files.
+    """
+    await aiofiles.os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(directory, f"{uuid.uuid4().hex}{PART_SUFFIX}")
+    digest = hashlib.sha256()
+    head = b""
+    size = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as out:
+            while chunk := await upload.read(settings.OFFER_UPLOAD_CHUNK_BYTES):
+                if len(head) < len(PDF_MAGIC):
+                    head += chunk[: len(PDF_MAGIC) - len(head)]
+                    if not PDF_MAGIC.startswith(head):
+                        raise _not_pdf()
+                size += len(chunk)
+                if size > settings.OFFER_UPLOAD_MAX_BYTES:
+                    raise too_large()
+                digest.update(chunk)
+                await out.write(chunk)
+            if head != PDF_MAGIC:
+                raise _not_pdf()
+            await out.flush()
+            await _fsync(out.fileno())
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            await aiofiles.os.remove(temp_path)
+        raise
+    return StoredUpload(temp_path, size, digest.hexdigest())
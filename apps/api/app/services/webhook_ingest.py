@@ -0,0 +1,543 @@
+"""
+Lead ingestion for the Meta and WhatsApp webhooks.
+
+ingest_meta_lead() and ingest_whatsapp_update() run in the ingest worker
+(app.jobs.ingest_worker) against payloads queued by the webhook endpoints,
+one SAVEPOINT per payload; ingest_meta_batch() serves the synchronous batch
+endpoint. All of them take transaction-level advisory locks on the
+normalized phones, so concurrent writers never dedup/create the same phone
+at the same time.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, NamedTuple
+
+from sqlalchemy import (
+    ColumnElement,
+    CompoundSelect,
+    Insert,
+    Row,
+    String,
+    Text,
+    and_,
+    cast,
+    column,
+    false,
+    func,
+    insert,
+    literal,
+    select,
+    true,
+    tuple_,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.lead import Lead, LeadSource, LeadStatus
+from app.models.lead_bot_payload import LeadBotPayload
+from app.models.lead_status_history import LeadStatusHistory
+from app.services.campaign_matcher import get_campaign_matcher
+from app.services.lead_mapping import map_bot_payload, resolve_track
+from app.services.lead_stats import count_created_leads, record_leads_created
+from app.services.phone import normalize_phone
+from app.services.phone_filter import (
+    might_have_lead,
+    record_false_positive,
+    record_stale_negative,
+    remember_leads,
+)
+from app.services.project_types import get_project_types
+
+
+class PermanentIngestError(ValueError):
+    """A payload that can never be processed; dead-lettered without retries."""
+
+
+async def _get_project_type_by_key(db: AsyncSession, key: str) -> int:
+    # Default to renovation
+    return (await get_project_types(db)).resolve(key)
+
+
+async def _resolve_campaign_to_project_type(
+    db: AsyncSession, campaign_name: str | None
+) -> str:
+    matcher = await get_campaign_matcher(db)
+    return matcher.match(campaign_name) or "renovation"
+
+
+async def _lock_phone(db: AsyncSession, normalized_phone: str) -> None:
+    await db.execute(
+        select(func.pg_advisory_xact_lock(func.hashtext(normalized_phone)))
+    )
+
+
+async def _lock_phones(db: AsyncSession, normalized_phones: Iterable[str]) -> None:
+    """Advisory-lock many phones, in hash order so concurrent batches cannot deadlock."""
+    phones = sorted(set(normalized_phones))
+    if not phones:
+        return
+    phone = func.unnest(cast(phones, ARRAY(Text))).column_valued("phone")
+    key = func.hashtext(phone)
+    keys = select(key.label("key")).distinct().order_by(key).subquery()
+    await db.execute(select(func.pg_advisory_xact_lock(keys.c.key)))
+
+
+def _require_phone(payload: dict[str, Any]) -> str:
+    phone = payload.get("phone")
+    if not phone:
+        raise PermanentIngestError("missing phone")
+    return str(phone)
+
+
+# Lead columns a Meta payload may refresh on its 30-day duplicate
+META_UPDATE_FIELDS = ("campaign_name", "adset_name", "ad_name", "email")
+
+
+def _meta_fields(payload: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "full_name": payload.get("full_name") or payload.get("name") or "ליד מטא",
+        "email": payload.get("email"),
+        "campaign_name": payload.get("campaign_name") or payload.get("campaign"),
+        "adset_name": payload.get("adset_name") or payload.get("adset"),
+        "ad_name": payload.get("ad_name") or payload.get("ad"),
+    }
+
+
+LEAD_COLUMNS = frozenset(Lead.__table__.columns.keys())
+
+# Columns of the leads a Meta batch inserts
+META_INSERT_COLUMNS = (
+    "id",
+    "project_type_id",
+    "full_name",
+    "phone",
+    "normalized_phone",
+    "source",
+    "status",
+    *META_UPDATE_FIELDS,
+)
+
+CREATED_LEAD_COLUMNS = (Lead.id, Lead.project_type_id, Lead.source, Lead.status, Lead.created_at)
+
+
+def _insert_lead_unless(new_lead: dict[str, Any], duplicate: ColumnElement[bool]) -> Insert:
+    """INSERT of one lead that inserts nothing if a lead matching ``duplicate`` exists.
+
+    Guards inserts that skipped the dedup lookup on the phone filter's word.
+    """
+    columns = Lead.__table__.c
+    return (
+        insert(Lead)
+        .from_select(
+            list(new_lead),
+            select(
+                *(literal(value, columns[name].type) for name, value in new_lead.items())
+            ).where(~select(Lead.id).where(duplicate).exists()),
+        )
+        .returning(*CREATED_LEAD_COLUMNS)
+    )
+
+
+async def _latest_leads(
+    db: AsyncSession, keys: list[tuple[str, int]], since: datetime
+) -> dict[tuple[str, int], uuid.UUID]:
+    """Latest lead id per (normalized_phone, project_type_id) created since ``since``."""
+    result = await db.execute(
+        select(Lead.id, Lead.normalized_phone, Lead.project_type_id)
+        .where(
+            tuple_(Lead.normalized_phone, Lead.project_type_id).in_(keys),
+            Lead.created_at >= since,
+        )
+        .distinct(Lead.normalized_phone, Lead.project_type_id)
+        .order_by(Lead.normalized_phone, Lead.project_type_id, Lead.created_at.desc())
+    )
+    return {(row.normalized_phone, row.project_type_id): row.id for row in result.all()}
+
+
+def _meta_upsert(
+    phone: str, normalized: str, project_type_id: int, fields: dict[str, Any]
+) -> CompoundSelect:
+    """One statement that dedups, updates-or-inserts, and records the new lead.
+
+    CTEs: existing (latest
+    30-day lead of the phone + project type, served by
+    ix_leads_phone_project_created_at), updated, inserted (only when there is
+    no existing lead), plus the status history row and the dashboard counter
+    for an inserted lead. Returns (id, project_type_id, created).
+    """
+    thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    existing = (
+        select(Lead.id, Lead.project_type_id)
+        .where(
+            Lead.normalized_phone == normalized,
+            Lead.project_type_id == project_type_id,
+            Lead.created_at >= thirty_days_ago,
+        )
+        .order_by(Lead.created_at.desc())
+        .limit(1)
+        .cte("existing")
+    )
+
+    changes = {name: fields[name] for name in META_UPDATE_FIELDS if fields[name]}
+    if changes:
+        updated = (
+            update(Lead)
+            .where(Lead.id == existing.c.id)
+            .values(changes)
+            .returning(Lead.id, Lead.project_type_id)
+            .cte("updated")
+        )
+    else:
+        updated = existing
+
+    new_lead = {
+        "id": uuid.uuid4(),
+        "project_type_id": project_type_id,
+        "full_name": fields["full_name"],
+        "phone": phone,
+        "normalized_phone": normalized,
+        "source": LeadSource.meta_form,
+        "status": LeadStatus.new_lead,
+        "bot_completed": False,
+        **{name: fields[name] for name in META_UPDATE_FIELDS},
+    }
+    inserted = (
+        insert(Lead)
+        .from_select(
+            list(new_lead),
+            select(
+                *(literal(value, Lead.__table__.c[name].type) for name, value in new_lead.items())
+            ).where(~select(existing.c.id).exists()),
+        )
+        .returning(*CREATED_LEAD_COLUMNS)
+        .cte("inserted")
+    )
+    history_columns = LeadStatusHistory.__table__.c
+    history = insert(LeadStatusHistory).from_select(
+        ["lead_id", "from_status", "to_status", "changed_by"],
+        select(
+            inserted.c.id,
+            literal(None, history_columns.from_status.type),
+            literal(LeadStatus.new_lead.value, history_columns.to_status.type),
+            literal(None, history_columns.changed_by.type),  # system
+        ),
+    ).cte("history")
+    counted = count_created_leads(inserted).cte("counted")
+
+    return union_all(
+        select(inserted.c.id, inserted.c.project_type_id, true().label("created")),
+        select(updated.c.id, updated.c.project_type_id, false().label("created")),
+    ).add_cte(history, counted)
+
+
+async def ingest_meta_lead(db: AsyncSession, payload: dict[str, Any]) -> dict[str, str]:
+    """Create a lead from a Meta lead-ads payload, or update its 30-day duplicate.
+
+    Two round trips: the phone lock, then _meta_upsert(). The lock is its own
+    statement so the upsert's snapshot already sees any lead a concurrent
+    ingest of the same phone committed while we waited.
+    """
+    phone = _require_phone(payload)
+    fields = _meta_fields(payload)
+    normalized = normalize_phone(phone)
+    await _lock_phone(db, normalized)
+    # Cached matcher and registry: no query unless the mappings changed
+    project_type_key = await _resolve_campaign_to_project_type(db, fields["campaign_name"])
+    project_type_id = await _get_project_type_by_key(db, project_type_key)
+
+    result = await db.execute(_meta_upsert(phone, normalized, project_type_id, fields))
+    row = result.one()
+    if row.created:
+        remember_leads([(normalized, row.project_type_id)])
+    return {"status": "created" if row.created else "updated", "lead_id": str(row.id)}
+
+
+async def _append_bot_payload(
+    db: AsyncSession, lead_id: uuid.UUID, payload: dict[str, Any]
+) -> None:
+    # Versions are numbered per lead; callers hold the phone lock
+    next_version = (
+        select(func.coalesce(func.max(LeadBotPayload.version), 0) + 1)
+        .where(LeadBotPayload.lead_id == lead_id)
+        .scalar_subquery()
+    )
+    await db.execute(
+        insert(LeadBotPayload).values(lead_id=lead_id, version=next_version, payload=payload)
+    )
+
+
+async def ingest_whatsapp_update(
+    db: AsyncSession, payload: dict[str, Any]
+) -> dict[str, str]:
+    """Apply a WhatsApp bot payload to the phone's latest lead (creating one if needed).
+
+    A phone the phone filter has never seen skips the lookup and goes
+    straight to a guarded insert.
+    """
+    phone = _require_phone(payload)
+    normalized = normalize_phone(phone)
+    await _lock_phone(db, normalized)
+
+    # Resolve track
+    track_raw = payload.get("track")
+    track = resolve_track(track_raw) if track_raw else None
+
+    # Map structured fields
+    answers = payload.get("answers", payload)
+    changes: dict[str, Any] = {}
+    if track:
+        mapped = map_bot_payload(track, answers)
+        changes = {
+            field: value
+            for field, value in mapped.items()
+            if field in LEAD_COLUMNS and value is not None
+        }
+
+    # Set bot_completed
+    if _bot_completed(payload):
+        changes["bot_completed"] = True
+    elif track and answers:
+        # Assume completed if we have track + substantial answers
+        changes["bot_completed"] = True
+
+    # Most recent lead within 30 days
+    thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    recent = and_(Lead.normalized_phone == normalized, Lead.created_at >= thirty_days_ago)
+    latest = select(Lead.id).where(recent).order_by(Lead.created_at.desc()).limit(1)
+    lead_id = None
+    if might_have_lead(normalized):
+        lead_id = await db.scalar(latest)
+        if lead_id is None:
+            record_false_positive()
+
+    if lead_id is None:
+        # Create new lead, with the mapped fields
+        project_type_key = track or "renovation"
+        project_type_id = await _get_project_type_by_key(db, project_type_key)
+        new_lead = {
+            "id": uuid.uuid4(),
+            "project_type_id": project_type_id,
+            "full_name": payload.get("full_name", payload.get("name", "ליד בוט")),
+            "phone": phone,
+            "normalized_phone": normalized,
+            "source": LeadSource.manual,
+            "status": LeadStatus.new_lead,
+            "bot_completed": False,
+            **changes,
+        }
+        created = (await db.execute(_insert_lead_unless(new_lead, recent))).first()
+        if created is not None:
+            await db.execute(
+                insert(LeadStatusHistory).values(
+                    lead_id=created.id,
+                    from_status=None,
+                    to_status=LeadStatus.new_lead.value,
+                    changed_by=None,  # system
+                )
+            )
+            await record_leads_created(db, [created])
+            remember_leads([(normalized, project_type_id)])
+            lead_id, changes = created.id, {}
+        else:
+            # Created by another process since the filter last saw this phone
+            record_stale_negative()
+            lead_id = await db.scalar(latest)
+
+    if changes:
+        await db.execute(update(Lead).where(Lead.id == lead_id).values(changes))
+
+    # Store raw payload as the lead's next version
+    await _append_bot_payload(db, lead_id, payload)
+
+    return {"status": "updated", "lead_id": str(lead_id)}
+
+
+def _bot_completed(payload: dict[str, Any]) -> bool:
+    return bool(payload.get("completed", False) or payload.get("bot_completed", False))
+
+
+def merge_whatsapp_payloads(payloads: list[dict[str, Any]]) -> dict[str, Any]:
+    """Fold a conversation's bot updates (oldest first) into one payload.
+
+    Later values win; ``answers`` dicts are merged key by key, and the
+    conversation counts as completed if any update said so.
+    """
+    merged: dict[str, Any] = {}
+    for payload in payloads:
+        earlier_answers = merged.get("answers")
+        merged.update(payload)
+        if isinstance(earlier_answers, dict) and isinstance(payload.get("answers"), dict):
+            merged["answers"] = {**earlier_answers, **payload["answers"]}
+    if any(_bot_completed(payload) for payload in payloads):
+        merged["completed"] = True
+    return merged
+
+
+async def ingest_meta_batch(
+    db: AsyncSession, payloads: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Set-based variant of ingest_meta_lead for many payloads at once.
+
+    Same semantics as ingesting the payloads one by one, in order: the first
+    payload of a (phone, project type) without a 30-day lead creates it, and
+    later ones (in the batch or not) update it. Dedup is one query for the
+    whole batch, covering only the keys the phone filter may have seen; the
+    multi-row insert is guarded against leads the filter missed. Returns one
+    result per payload, in order.
+    """
+    results: list[dict[str, Any]] = [{"index": i} for i in range(len(payloads))]
+    matcher = await get_campaign_matcher(db)
+    project_types = await get_project_types(db)
+
+    # (normalized_phone, project_type_id) -> indexes of its payloads, in order
+    groups: dict[tuple[str, int], list[int]] = {}
+    fields: dict[int, dict[str, Any]] = {}
+    for index, payload in enumerate(payloads):
+        phone = payload.get("phone")
+        if not phone:
+            results[index].update(status="error", detail="מספר טלפון חסר")
+            continue
+        fields[index] = {**_meta_fields(payload), "phone": str(phone)}
+        project_type_key = matcher.match(fields[index]["campaign_name"]) or "renovation"
+        key = (normalize_phone(str(phone)), project_types.resolve(project_type_key))
+        groups.setdefault(key, []).append(index)
+
+    if not groups:
+        return results
+
+    await _lock_phones(db, (phone for phone, _ in groups))
+
+    # Only keys the phone filter may have seen need the dedup query
+    thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    candidates = [key for key in groups if might_have_lead(*key)]
+    existing = await _latest_leads(db, candidates, thirty_days_ago) if candidates else {}
+    record_false_positive(len(candidates) - len(existing))
+
+    # The first payload of a new key creates the lead, later ones update it
+    inserts: dict[tuple[str, int], dict[str, Any]] = {}
+    for key, indexes in groups.items():
+        if key in existing:
+            continue
+        first = fields[indexes[0]]
+        row = {
+            "id": uuid.uuid4(),
+            "project_type_id": key[1],
+            "full_name": first["full_name"],
+            "phone": first["phone"],
+            "normalized_phone": key[0],
+            "source": LeadSource.meta_form,
+            "status": LeadStatus.new_lead,
+            **{name: first[name] for name in META_UPDATE_FIELDS},
+        }
+        for index in indexes[1:]:
+            for name in META_UPDATE_FIELDS:
+                if fields[index][name]:
+                    row[name] = fields[index][name]
+        inserts[key] = row
+
+    if inserts:
+        created = await _insert_meta_leads(db, list(inserts.values()), thirty_days_ago)
+        created_ids = {row.id for row in created}
+        blocked = [key for key, row in inserts.items() if row["id"] not in created_ids]
+        if blocked:
+            # Created by another process since the filter last saw these keys
+            record_stale_negative(len(blocked))
+            existing.update(await _latest_leads(db, blocked, thirty_days_ago))
+            for key in blocked:
+                del inserts[key]
+        if created:
+            await db.execute(
+                insert(LeadStatusHistory).values(
+                    [
+                        {
+                            "lead_id": row.id,
+                            "from_status": None,
+                            "to_status": LeadStatus.new_lead.value,
+                            "changed_by": None,  # system
+                        }
+                        for row in created
+                    ]
+                )
+            )
+            await record_leads_created(db, created)
+            remember_leads(inserts)
+
+    updates: list[dict[str, Any]] = []
+    for key, indexes in groups.items():
+        if key in inserts:
+            lead_id = inserts[key]["id"]
+            results[indexes[0]].update(status="created", lead_id=str(lead_id))
+            indexes = indexes[1:]
+        else:
+            lead_id = existing[key]
+            change = {"id": lead_id, **{name: None for name in META_UPDATE_FIELDS}}
+            for index in indexes:
+                for name in META_UPDATE_FIELDS:
+                    if fields[index][name]:
+                        change[name] = fields[index][name]
+            updates.append(change)
+        for index in indexes:
+            results[index].update(status="updated", lead_id=str(lead_id))
+
+    if updates:
+        changes = values(
+            column("id", UUID(as_uuid=True)),
+            *(column(name, String) for name in META_UPDATE_FIELDS),
+            name="changes",
+        ).data([tuple(change[c] for c in ("id", *META_UPDATE_FIELDS)) for change in updates])
+        await db.execute(
+            update(Lead)
+            .where(Lead.id == changes.c.id)
+            .values(
+                {
+                    name: func.coalesce(changes.c[name], getattr(Lead, name))
+                    for name in META_UPDATE_FIELDS
+                }
+            )
+        )
+
+    return results
+
+
+async def _insert_meta_leads(
+    db: AsyncSession, rows: list[dict[str, Any]], since: datetime
+) -> list[Row]:
+    """Multi-row lead INSERT that skips rows whose key already has a lead since ``since``."""
+    columns = Lead.__table__.c
+    new_leads = values(
+        *(column(name, columns[name].type) for name in META_INSERT_COLUMNS),
+        name="new_leads",
+    ).data([tuple(row[name] for name in META_INSERT_COLUMNS) for row in rows])
+    duplicate = select(Lead.id).where(
+        Lead.normalized_phone == new_leads.c.normalized_phone,
+        Lead.project_type_id == new_leads.c.project_type_id,
+        Lead.created_at >= since,
+    )
+    result = await db.execute(
+        insert(Lead)
+        .from_select(list(META_INSERT_COLUMNS), select(new_leads).where(~duplicate.exists()))
+        .returning(*CREATED_LEAD_COLUMNS)
+    )
+    return result.all()
+
+
+INGEST_HANDLERS = {
+    "meta": ingest_meta_lead,
+    "whatsapp": ingest_whatsapp_update,
+}
+
+
+class Coalescer(NamedTuple):
+    """How pending events of one source are buffered and merged per phone."""
+
+    merge: Callable[[list[dict[str, Any]]], dict[str, Any]]
+    # Payloads that end the conversation and are applied without waiting
+    flush_now: Callable[[dict[str, Any]], bool]
+
+
+INGEST_COALESCERS = {
+    "whatsapp": Coalescer(merge_whatsapp_payloads, _bot_completed),
+}
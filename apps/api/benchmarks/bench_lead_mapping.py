@@ -0,0 +1,138 @@
+"""
+Benchmark: bot answer mapping (lead_mapping._map_value).
+
+    python -m benchmarks.bench_lead_mapping [--rounds N]
+
+Runs a corpus of answer variants seen from the WhatsApp bot (quote and dash
+variants, final letters, niqqud, extra whitespace, prefixes, truncated and
+free-text answers) through the precompiled indexes, cold (memo cleared every
+round) and warm, and through the original linear scan. Fails if any answer
+maps differently.
+"""
+import argparse
+import time
+from typing import Optional
+
+from app.services import lead_mapping as lm
+from app.services.hebrew import normalize_hebrew
+
+TABLES = {
+    "timeline": lm.TIMELINE_MAP,
+    "plans_status": lm.PLANS_STATUS_MAP,
+    "permit_status": lm.PERMIT_STATUS_MAP,
+    "building_type": lm.BUILDING_TYPE_MAP,
+    "site_access": lm.SITE_ACCESS_MAP,
+    "mamad_variant": lm.MAMAD_VARIANT_MAP,
+    "private_stage": lm.PRIVATE_STAGE_MAP,
+    "private_size": lm.PRIVATE_SIZE_BUCKET_MAP,
+    "arch_service": lm.ARCH_SERVICE_MAP,
+    "arch_property_type": lm.ARCH_PROPERTY_TYPE_MAP,
+    "arch_planning_stage": lm.ARCH_PLANNING_STAGE_MAP,
+    "reno_type": lm.RENO_TYPE_MAP,
+    "reno_size": lm.RENO_SIZE_BUCKET_MAP,
+    "reno_has_plan": lm.RENO_HAS_PLAN_MAP,
+}
+
+# Free-text answers typed instead of tapping a button
+FREE_TEXT = {
+    "timeline": ["בחודש הקרוב", "לא יודע עדיין", "אחרי החגים", "ASAP"],
+    "plans_status": ["יש תכניות", "תכנון", "אין לי כלום"],
+    "permit_status": ["היתר", "יש היתר בתוקף", "לא צריך היתר"],
+    "building_type": ["בית פרטי", "דירה", "פנטהאוז"],
+    "site_access": ["גישה", "אין גישה לרכב", "מלאה"],
+    "mamad_variant": ['ממ"ד', "רישוי מקוצר", '12 מ"ר', "ממד גדול"],
+    "private_stage": ["שלד", "וילה", "הרחבה"],
+    "private_size": ["120", "200 מטר", "מעל"],
+    "arch_service": ["עיצוב פנים", "היתר", "תכנון"],
+    "arch_property_type": ["בית פרטי", "דירה", "מגרש"],
+    "arch_planning_stage": ["סקיצה", "כמעט מוכן", "אין"],
+    "reno_type": ["מטבח", "שיפוץ", "גמר"],
+    "reno_size": ["60", "100 מטר", "מעל 200"],
+    "reno_has_plan": ["תכנית", "חלקית", "לא"],
+}
+
+QUOTE_VARIANTS = ['"', "״", "''", "“"]
+DASH_VARIANTS = ["–", "-", "—", "־"]
+FINALS = str.maketrans("ךםןףץ", "כמנפצ")
+
+
+def _variants(answer: str) -> list[str]:
+    out = [answer, f"  {answer}  ", answer.replace(" ", "  "), f"{answer} 👍", f"תשובה: {answer}"]
+    out += [answer.replace('"', q) for q in QUOTE_VARIANTS if '"' in answer]
+    out += [answer.replace("–", d).replace("—", d) for d in DASH_VARIANTS]
+    out.append(answer.translate(FINALS))
+    out.append("ָ".join(answer))  # niqqud (qamats) after every letter
+    out.append(answer[: max(1, len(answer) // 2)])  # truncated
+    return out
+
+
+def build_corpus() -> list[tuple[str, str]]:
+    corpus = []
+    for name, table in TABLES.items():
+        for answer in table:
+            corpus += [(name, v) for v in _variants(answer)]
+        corpus += [(name, v) for v in FREE_TEXT.get(name, [])]
+    return corpus
+
+
+def legacy_map_value(value: Optional[str], mapping: dict[str, str]) -> Optional[str]:
+    """The original linear scan, kept here as the reference."""
+    if value is None:
+        return None
+    value = value.strip()
+    result = mapping.get(value)
+    if result is not None:
+        return result
+    normalized = normalize_hebrew(value)
+    normalized_keys = [(normalize_hebrew(k), v) for k, v in mapping.items()]
+    for he_key, en_val in normalized_keys:
+        if he_key == normalized:
+            return en_val
+    for he_key, en_val in normalized_keys:
+        if he_key in normalized or normalized in he_key:
+            return en_val
+    return "other_or_unknown"
+
+
+def _clear_memos() -> None:
+    for index in lm._ANSWER_INDEXES.values():
+        index.lookup.cache_clear()
+
+
+def _time(label: str, corpus, fn, rounds: int, before_round=None) -> float:
+    elapsed = 0.0
+    for _ in range(rounds):
+        if before_round:
+            before_round()
+        start = time.perf_counter()
+        for name, answer in corpus:
+            fn(answer, TABLES[name])
+        elapsed += time.perf_counter() - start
+    per_answer = elapsed / (rounds * len(corpus)) * 1e6
+    print(f"{label:<22} {per_answer:8.2f} µs/answer")
+    return per_answer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = build_corpus()
+    mismatches = [
+        (name, answer)
+        for name, answer in corpus
+        if lm._map_value(answer, TABLES[name]) != legacy_map_value(answer, TABLES[name])
+    ]
+    if mismatches:
+        raise SystemExit(f"{len(mismatches)} answers map differently, e.g. {mismatches[:3]}")
+    print(f"{len(corpus)} answers over {len(TABLES)} tables, all mapped identically\n")
+
+    legacy = _time("linear scan", corpus, legacy_map_value, args.rounds)
+    cold = _time("index (cold memo)", corpus, lm._map_value, args.rounds, _clear_memos)
+    warm = _time("index (warm memo)", corpus, lm._map_value, args.rounds)
+    print(f"\nspeedup: {legacy / cold:.1f}x cold, {legacy / warm:.1f}x warm")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark: single Meta lead ingest, the original ORM flow vs. the CTE upsert.
+
+    python -m benchmarks.bench_meta_ingest [--leads N]
+
+Needs the database from DATABASE_URL, migrated and seeded (project types and
+campaign mappings). Each mode ingests N new phones and then N duplicates
+(updates) inside one transaction that is rolled back at the end, so nothing
+is left behind. Reports statements sent to the server (round trips) and
+latency per lead.
+
+The ORM flow is a frozen copy of the webhook as it was before any ingest
+work: per lead it scans campaign_mappings, selects the project type and
+looks up duplicates. It takes no phone lock and keeps no dashboard
+counters, which the CTE upsert does, so the comparison favours it.
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import event, select
+
+from app.database import async_session_factory, engine
+from app.models.campaign_mapping import CampaignMapping
+from app.models.lead import Lead, LeadSource, LeadStatus
+from app.models.lead_status_history import LeadStatusHistory
+from app.models.project_type import ProjectType
+from app.services.phone import normalize_phone
+from app.services.webhook_ingest import _meta_fields, ingest_meta_lead
+
+
+async def _legacy_project_type_id(db, key: str) -> int:
+    result = await db.execute(select(ProjectType).where(ProjectType.key == key))
+    pt = result.scalar_one_or_none()
+    if pt:
+        return pt.id
+    result = await db.execute(select(ProjectType).where(ProjectType.key == "renovation"))
+    pt = result.scalar_one_or_none()
+    return pt.id if pt else 3
+
+
+async def _legacy_campaign_project_type(db, campaign_name: str | None) -> str:
+    if not campaign_name:
+        return "renovation"
+    result = await db.execute(
+        select(CampaignMapping)
+        .where(CampaignMapping.is_active == True)
+        .order_by(CampaignMapping.priority.asc())
+    )
+    campaign_lower = campaign_name.lower()
+    for mapping in result.scalars().all():
+        if mapping.contains_text.lower() in campaign_lower:
+            return mapping.project_type_key
+    return "renovation"
+
+
+async def legacy_ingest_meta_lead(db, payload: dict[str, Any]) -> dict[str, str]:
+    """The original ORM webhook flow (reference), one query per step."""
+    phone = str(payload["phone"])
+    fields = _meta_fields(payload)
+    normalized = normalize_phone(phone)
+    project_type_key = await _legacy_campaign_project_type(db, fields["campaign_name"])
+    project_type_id = await _legacy_project_type_id(db, project_type_key)
+
+    thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    result = await db.execute(
+        select(Lead)
+        .where(
+            Lead.normalized_phone == normalized,
+            Lead.project_type_id == project_type_id,
+            Lead.created_at >= thirty_days_ago,
+        )
+        .order_by(Lead.created_at.desc())
+    )
+    existing_lead = result.scalars().first()
+    if existing_lead:
+        for name in ("campaign_name", "adset_name", "ad_name", "email"):
+            if fields[name]:
+                setattr(existing_lead, name, fields[name])
+        await db.flush()
+        return {"status": "updated", "lead_id": str(existing_lead.id)}
+
+    lead = Lead(
+        project_type_id=project_type_id,
+        phone=phone,
+        normalized_phone=normalized,
+        source=LeadSource.meta_form,
+        status=LeadStatus.new_lead,
+        **{name: fields[name] for name in ("full_name", "email", "campaign_name", "adset_name", "ad_name")},
+    )
+    db.add(lead)
+    await db.flush()
+    await db.refresh(lead)
+    db.add(
+        LeadStatusHistory(
+            lead_id=lead.id,
+            from_status=None,
+            to_status=LeadStatus.new_lead.value,
+            changed_by=None,
+        )
+    )
+    await db.flush()
+    return {"status": "created", "lead_id": str(lead.id)}
+
+
+class StatementCounter:
+    def __init__(self) -> None:
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args: Any) -> None:
+        self.count += 1
+
+
+def _payloads(n: int, seed: int) -> list[dict[str, Any]]:
+    # Distinct phones per run, outside the seeded range
+    rng = random.Random(seed)
+    return [
+        {
+            "phone": f"0599{seed}{i:05d}",
+            "full_name": "ליד בדיקה",
+            "campaign_name": rng.choice(["ממד צפון", "שיפוץ דירה", "אדריכלות", "בנייה פרטית"]),
+            "adset_name": "benchmark",
+        }
+        for i in range(n)
+    ]
+
+
+async def _run(label: str, ingest, payloads, counter: StatementCounter) -> None:
+    async with async_session_factory() as db:
+        await db.begin()
+        # Warm up the connection and the caches outside the measurement
+        await ingest(db, {**payloads[0], "phone": "0500000000"})
+        for phase, expected in (("create", "created"), ("update", "updated")):
+            before = counter.count
+            start = time.perf_counter()
+            for payload in payloads:
+                result = await ingest(db, payload)
+                assert result["status"] == expected, (label, phase, result)
+            elapsed = time.perf_counter() - start
+            per_lead = (counter.count - before) / len(payloads)
+            print(
+                f"{label:<12} {phase:<7} {per_lead:5.1f} round trips "
+                f"{elapsed / len(payloads) * 1e3:7.3f} ms/lead"
+            )
+        await db.rollback()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--leads", type=int, default=200)
+    args = parser.parse_args()
+
+    counter = StatementCounter()
+    await _run("orm flow", legacy_ingest_meta_lead, _payloads(args.leads, 1), counter)
+    await _run("cte upsert", ingest_meta_lead, _payloads(args.leads, 2), counter)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
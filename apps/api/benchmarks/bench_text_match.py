@@ -0,0 +1,125 @@
+"""
+Benchmark: compiled substring matchers (app.services.text_match).
+
+    python -m benchmarks.bench_text_match [--rule-sets N] [--rules N] [--rounds N]
+
+Checks ContainedPatterns, ContainingPatterns and the campaign matcher
+against brute-force scans on random rule sets and texts (seeded, over a
+small Hebrew alphabet with final letters, quotes and dashes so that
+normalization and overlapping patterns come up often), then times the
+campaign matcher against the original "first matching rule" loop. Fails if
+any answer differs.
+"""
+import argparse
+import random
+import time
+from typing import Optional
+
+from app.services.campaign_matcher import CampaignMatcher
+from app.services.hebrew import normalize_hebrew
+from app.services.text_match import ContainedPatterns, ContainingPatterns
+
+ALPHABET = "אבגכךמם\"׳־- "
+
+
+def _text(rng: random.Random, max_length: int) -> str:
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, max_length)))
+
+
+def brute_contained(patterns: list[str], text: str) -> Optional[int]:
+    return next((rank for rank, pattern in enumerate(patterns) if pattern in text), None)
+
+
+def brute_containing(patterns: list[str], text: str) -> Optional[int]:
+    return next((rank for rank, pattern in enumerate(patterns) if text in pattern), None)
+
+
+def legacy_match(rules: list[tuple[str, str]], campaign_name: Optional[str]) -> Optional[str]:
+    """The original loop over mappings by priority, kept here as the reference.
+
+    ``rules`` hold already-normalized contains_text, so the loop's own cost
+    is only the substring tests.
+    """
+    if not campaign_name:
+        return None
+    campaign = normalize_hebrew(campaign_name)
+    for contains_text, project_type_key in rules:
+        if contains_text in campaign:
+            return project_type_key
+    return None
+
+
+def _normalized(rules: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    return [(normalize_hebrew(contains_text), key) for contains_text, key in rules]
+
+
+def check(rule_sets: int, seed: int = 0) -> int:
+    """Compare every matcher with its brute-force scan; returns texts checked."""
+    rng = random.Random(seed)
+    checked = 0
+    mismatches = []
+    for _ in range(rule_sets):
+        patterns = [_text(rng, 6) for _ in range(rng.randint(0, 12))]
+        contained = ContainedPatterns(patterns)
+        containing = ContainingPatterns(patterns)
+        rules = [(pattern, f"type{rank}") for rank, pattern in enumerate(patterns)]
+        matcher = CampaignMatcher(rules, version=1)
+        normalized_rules = _normalized(rules)
+        for _ in range(20):
+            text = _text(rng, 12)
+            checked += 1
+            if contained.best(text) != brute_contained(patterns, text):
+                mismatches.append(("contained", patterns, text))
+            if containing.best(text) != brute_containing(patterns, text):
+                mismatches.append(("containing", patterns, text))
+            if matcher.match(text) != legacy_match(normalized_rules, text):
+                mismatches.append(("campaign", patterns, text))
+    if mismatches:
+        raise SystemExit(f"{len(mismatches)} mismatches, e.g. {mismatches[:3]}")
+    return checked
+
+
+def _time(label: str, fn, names: list[str], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for name in names:
+            fn(name)
+    per_match = (time.perf_counter() - start) / (rounds * len(names)) * 1e6
+    print(f"{label:<22} {per_match:8.2f} µs/match")
+    return per_match
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rule-sets", type=int, default=3000)
+    parser.add_argument("--rules", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    checked = check(args.rule_sets)
+    print(f"{checked} texts over {args.rule_sets} rule sets, all matched identically\n")
+
+    rng = random.Random(1)
+    words = ["שיפוץ", "ממ״ד", "אדריכלות", "בנייה", "פרטית", "צפון", "דרום", "דירה", "וילה"]
+    rules = [
+        (f"{rng.choice(words)} {rng.choice(words)} {i}", f"type{i % 4}")
+        for i in range(args.rules)
+    ]
+    names = [
+        f"קמפיין {rng.choice(words)} {rng.choice(words)} {rng.randrange(2 * args.rules)}"
+        for _ in range(200)
+    ]
+    matcher = CampaignMatcher(rules, version=1)
+    normalized_rules = _normalized(rules)
+    legacy = _time(
+        "first-match loop",
+        lambda name: legacy_match(normalized_rules, name),
+        names,
+        args.rounds,
+    )
+    compiled = _time("automaton", matcher.match, names, args.rounds)
+    print(f"\n{args.rules} rules, speedup: {legacy / compiled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
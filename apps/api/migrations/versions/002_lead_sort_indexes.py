@@ -0,0 +1,47 @@
+"""Composite indexes for keyset pagination of leads
+
+Revision ID: 002
+Revises: 001
+Create Date: 2025-02-01 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, columns) – one per supported sort key of GET /leads
+SORT_INDEXES = [
+    ("ix_leads_created_at_id", ["created_at", "id"]),
+    ("ix_leads_updated_at_id", ["updated_at", "id"]),
+    ("ix_leads_status_id", ["status", "id"]),
+    ("ix_leads_temperature_id", ["temperature", "id"]),
+]
+
+
+def upgrade() -> None:
+    # Build concurrently so large leads tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        for name, columns in SORT_INDEXES:
+            op.create_index(
+                name,
+                "leads",
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(SORT_INDEXES):
+            op.drop_index(
+                name,
+                table_name="leads",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
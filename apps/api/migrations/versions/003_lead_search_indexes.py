@@ -0,0 +1,80 @@
+"""pg_trgm search indexes on leads
+
+Revision ID: 003
+Revises: 002
+Create Date: 2025-02-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Build concurrently so large leads tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        for column in ("full_name", "email", "normalized_phone"):
+            op.create_index(
+                f"ix_leads_{column}_trgm",
+                "leads",
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        op.create_index(
+            "ix_leads_normalized_phone_prefix",
+            "leads",
+            ["normalized_phone"],
+            postgresql_ops={"normalized_phone": "varchar_pattern_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_leads_normalized_phone_suffix",
+            "leads",
+            [sa.text("reverse(normalized_phone) text_pattern_ops")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # The pattern-ops index also serves equality on normalized_phone,
+        # so the plain btree from 001 is only write overhead
+        op.drop_index(
+            "ix_leads_normalized_phone",
+            table_name="leads",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_leads_normalized_phone",
+            "leads",
+            ["normalized_phone"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name in (
+            "ix_leads_normalized_phone_suffix",
+            "ix_leads_normalized_phone_prefix",
+            "ix_leads_normalized_phone_trgm",
+            "ix_leads_email_trgm",
+            "ix_leads_full_name_trgm",
+        ):
+            op.drop_index(
+                name,
+                table_name="leads",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
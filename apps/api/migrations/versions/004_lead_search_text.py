@@ -0,0 +1,134 @@
+"""Hebrew-normalized search_text column on leads
+
+Revision ID: 004
+Revises: 003
+Create Date: 2025-03-01 00:00:00.000000
+
+search_text is a plain nullable column kept current by a BEFORE INSERT/UPDATE
+trigger rather than a STORED generated column: adding a generated column
+rewrites leads under ACCESS EXCLUSIVE. Existing rows are backfilled in
+batches, each committed on its own, and the trigram index is then built
+concurrently, so reads and writes on leads are never blocked for long.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of the folding tables in app/services/hebrew.py
+FINAL_LETTERS = "ךםןףץ"
+REGULAR_LETTERS = "כמנפצ"
+DASHES = "־‐‑‒–—―−"
+QUOTES = "\"'`׳״‘’‚‛“”„‟′″´"
+NIQQUD = "".join(chr(c) for c in range(0x0591, 0x05BE)) + (
+    "\u05bf\u05c1\u05c2\u05c4\u05c5\u05c7"
+)
+
+
+BACKFILL_BATCH_SIZE = 5000
+
+SEARCH_TEXT_SQL = (
+    "hebrew_normalize(coalesce({row}full_name, '') || ' ' || coalesce({row}city, '') "
+    "|| ' ' || coalesce({row}campaign_name, ''))"
+)
+
+
+def _sql_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _backfill_search_text() -> None:
+    # Keyset batches by id; rows written meanwhile are set by the trigger
+    bind = op.get_bind()
+    after = None
+    while True:
+        where = "" if after is None else "WHERE id > :after "
+        ids = bind.execute(
+            sa.text(f"SELECT id FROM leads {where}ORDER BY id LIMIT :limit"),
+            {"after": after, "limit": BACKFILL_BATCH_SIZE},
+        ).scalars().all()
+        if not ids:
+            return
+        bind.execute(
+            sa.text(
+                f"UPDATE leads SET search_text = {SEARCH_TEXT_SQL.format(row='')} "
+                "WHERE id >= :first AND id <= :last"
+            ),
+            {"first": ids[0], "last": ids[-1]},
+        )
+        after = ids[-1]
+
+
+def upgrade() -> None:
+    # translate() maps finals and dashes, and drops every character of the
+    # source list that has no counterpart (quotes and niqqud).
+    source = FINAL_LETTERS + DASHES + QUOTES + NIQQUD
+    target = REGULAR_LETTERS + "-" * len(DASHES)
+    op.execute(
+        "CREATE OR REPLACE FUNCTION hebrew_normalize(value text) RETURNS text "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE RETURNS NULL ON NULL INPUT AS $$ "
+        "SELECT btrim(regexp_replace("
+        f"translate(lower(value), {_sql_literal(source)}, {_sql_literal(target)}), "
+        "'\\s+', ' ', 'g')) $$"
+    )
+    op.execute(
+        "CREATE OR REPLACE FUNCTION leads_set_search_text() RETURNS trigger "
+        "LANGUAGE plpgsql AS $$ BEGIN "
+        f"NEW.search_text := {SEARCH_TEXT_SQL.format(row='NEW.')}; "
+        "RETURN NEW; END $$"
+    )
+    # No default and nullable: a catalog-only change
+    op.add_column("leads", sa.Column("search_text", sa.Text(), nullable=True))
+    op.execute(
+        "CREATE TRIGGER leads_search_text "
+        "BEFORE INSERT OR UPDATE OF full_name, city, campaign_name ON leads "
+        "FOR EACH ROW EXECUTE FUNCTION leads_set_search_text()"
+    )
+
+    # search_text covers full_name, so its trigram index replaces the one on
+    # the raw name
+    with op.get_context().autocommit_block():
+        _backfill_search_text()
+        op.create_index(
+            "ix_leads_search_text_trgm",
+            "leads",
+            ["search_text"],
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_leads_full_name_trgm",
+            table_name="leads",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_leads_full_name_trgm",
+            "leads",
+            ["full_name"],
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_leads_search_text_trgm",
+            table_name="leads",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.execute("DROP TRIGGER IF EXISTS leads_search_text ON leads")
+    op.drop_column("leads", "search_text")
+    op.execute("DROP FUNCTION IF EXISTS leads_set_search_text()")
+    op.execute("DROP FUNCTION IF EXISTS hebrew_normalize(text)")
@@ -0,0 +1,47 @@
+"""Dashboard counters table
+
+Revision ID: 005
+Revises: 004
+Create Date: 2025-03-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ENUM
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+lead_source = ENUM("meta_form", "landing_page", "manual", name="lead_source", create_type=False)
+lead_status = ENUM(
+    "new_lead", "initial_call_done", "fit_for_meeting", "meeting_scheduled",
+    "meeting_done", "offer_sent", "negotiation", "won", "lost", "irrelevant",
+    name="lead_status", create_type=False,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "lead_stat_counters",
+        sa.Column("month", sa.Date(), primary_key=True),
+        sa.Column("project_type_id", sa.SmallInteger(), sa.ForeignKey("project_types.id"), primary_key=True),
+        sa.Column("source", lead_source, primary_key=True),
+        sa.Column("status", lead_status, primary_key=True),
+        sa.Column("lead_count", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+
+    # Backfill from existing leads
+    op.execute(
+        "INSERT INTO lead_stat_counters (month, project_type_id, source, status, lead_count) "
+        "SELECT date_trunc('month', created_at AT TIME ZONE 'UTC')::date, "
+        "project_type_id, source, status, count(*) "
+        "FROM leads GROUP BY 1, 2, 3, 4"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("lead_stat_counters")
@@ -0,0 +1,71 @@
+"""Daily and monthly lead rollup tables
+
+Revision ID: 006
+Revises: 005
+Create Date: 2025-03-22 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ENUM
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+lead_source = ENUM("meta_form", "landing_page", "manual", name="lead_source", create_type=False)
+lead_status = ENUM(
+    "new_lead", "initial_call_done", "fit_for_meeting", "meeting_scheduled",
+    "meeting_done", "offer_sent", "negotiation", "won", "lost", "irrelevant",
+    name="lead_status", create_type=False,
+)
+
+
+def _create_rollup_table(name: str) -> None:
+    op.create_table(
+        name,
+        sa.Column("bucket", sa.Date(), primary_key=True),
+        sa.Column("project_type_id", sa.SmallInteger(), sa.ForeignKey("project_types.id"), primary_key=True),
+        sa.Column("source", lead_source, primary_key=True),
+        sa.Column("status", lead_status, primary_key=True),
+        sa.Column("leads_created", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("status_entries", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+
+
+def upgrade() -> None:
+    _create_rollup_table("lead_rollups_daily")
+    _create_rollup_table("lead_rollups_monthly")
+    op.create_table(
+        "rollup_watermarks",
+        sa.Column("name", sa.String(100), primary_key=True),
+        sa.Column("watermark", sa.DateTime(timezone=True), nullable=False),
+    )
+
+    # The rollups are filled by the first refresh (no watermark = full rebuild).
+    # Incremental refreshes scan status history by changed_at (leads by
+    # updated_at use ix_leads_updated_at_id).
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_lead_status_history_changed_at",
+            "lead_status_history",
+            ["changed_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_lead_status_history_changed_at",
+            table_name="lead_status_history",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_table("rollup_watermarks")
+    op.drop_table("lead_rollups_monthly")
+    op.drop_table("lead_rollups_daily")
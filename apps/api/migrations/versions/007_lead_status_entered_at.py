@@ -0,0 +1,92 @@
+"""Lead status_entered_at and status history funnel index
+
+Revision ID: 007
+Revises: 006
+Create Date: 2025-03-29 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _backfill_status_entered_at() -> None:
+    # Latest transition into the current status; keyset batches by id, each
+    # committed on its own
+    bind = op.get_bind()
+    after = None
+    while True:
+        where = "" if after is None else "WHERE id > :after "
+        ids = bind.execute(
+            sa.text(f"SELECT id FROM leads {where}ORDER BY id LIMIT :limit"),
+            {"after": after, "limit": BACKFILL_BATCH_SIZE},
+        ).scalars().all()
+        if not ids:
+            return
+        bind.execute(
+            sa.text(
+                "UPDATE leads l SET status_entered_at = coalesce("
+                "(SELECT max(h.changed_at) FROM lead_status_history h "
+                "WHERE h.lead_id = l.id AND h.to_status = l.status::text), "
+                "l.created_at) "
+                "WHERE l.id >= :first AND l.id <= :last"
+            ),
+            {"first": ids[0], "last": ids[-1]},
+        )
+        after = ids[-1]
+
+
+def upgrade() -> None:
+    op.add_column(
+        "leads",
+        sa.Column(
+            "status_entered_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+
+    # The history index serves the backfill's lookups; the leads index is
+    # built once the backfill is done
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_lead_status_history_lead_changed_at",
+            "lead_status_history",
+            ["lead_id", "changed_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        _backfill_status_entered_at()
+        op.create_index(
+            "ix_leads_status_entered_at",
+            "leads",
+            ["status", "status_entered_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_lead_status_history_lead_changed_at",
+            table_name="lead_status_history",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_leads_status_entered_at",
+            table_name="leads",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("leads", "status_entered_at")
@@ -0,0 +1,36 @@
+"""Allow system (user-less) status history rows
+
+Revision ID: 009
+Revises: 008
+Create Date: 2025-04-12 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Webhook-created leads have no acting user
+    op.alter_column(
+        "lead_status_history",
+        "changed_by",
+        existing_type=UUID(as_uuid=True),
+        nullable=True,
+    )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM lead_status_history WHERE changed_by IS NULL")
+    op.alter_column(
+        "lead_status_history",
+        "changed_by",
+        existing_type=UUID(as_uuid=True),
+        nullable=False,
+    )
@@ -0,0 +1,36 @@
+"""Webhook idempotency keys
+
+Revision ID: 010
+Revises: 009
+Create Date: 2025-04-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "webhook_idempotency_keys",
+        sa.Column("key", sa.LargeBinary(32), primary_key=True),
+        sa.Column("response", JSONB(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        "ix_webhook_idempotency_keys_expires_at",
+        "webhook_idempotency_keys",
+        ["expires_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_idempotency_keys_expires_at", table_name="webhook_idempotency_keys")
+    op.drop_table("webhook_idempotency_keys")
@@ -0,0 +1,31 @@
+"""Coalesce key on webhook events
+
+Revision ID: 011
+Revises: 010
+Create Date: 2025-04-26 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("webhook_events", sa.Column("coalesce_key", sa.String(50), nullable=True))
+    op.create_index(
+        "ix_webhook_events_coalesce_key",
+        "webhook_events",
+        ["coalesce_key"],
+        postgresql_where=sa.text("coalesce_key IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_events_coalesce_key", table_name="webhook_events")
+    op.drop_column("webhook_events", "coalesce_key")
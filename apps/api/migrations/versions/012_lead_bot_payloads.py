@@ -0,0 +1,62 @@
+"""Move raw bot payloads off leads into lead_bot_payloads
+
+Revision ID: 012
+Revises: 011
+Create Date: 2025-05-03 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+revision: str = "012"
+down_revision: Union[str, None] = "011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "lead_bot_payloads",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "lead_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("leads.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("payload", JSONB(), nullable=False),
+        sa.Column("received_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("lead_id", "version", name="uq_lead_bot_payloads_lead_version"),
+    )
+
+    # The payload currently on each lead becomes its first version
+    op.execute(
+        """
+        INSERT INTO lead_bot_payloads (lead_id, version, payload, received_at)
+        SELECT id, 1, bot_payload, updated_at
+        FROM leads
+        WHERE bot_payload IS NOT NULL
+        """
+    )
+    op.drop_column("leads", "bot_payload")
+
+
+def downgrade() -> None:
+    op.add_column("leads", sa.Column("bot_payload", JSONB(), nullable=True))
+    op.execute(
+        """
+        UPDATE leads
+        SET bot_payload = latest.payload
+        FROM (
+            SELECT DISTINCT ON (lead_id) lead_id, payload
+            FROM lead_bot_payloads
+            ORDER BY lead_id, version DESC
+        ) AS latest
+        WHERE leads.id = latest.lead_id
+        """
+    )
+    op.drop_table("lead_bot_payloads")
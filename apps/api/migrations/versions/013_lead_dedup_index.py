@@ -0,0 +1,38 @@
+"""Dedup index for webhook ingest: (normalized_phone, project_type_id, created_at DESC)
+
+Revision ID: 013
+Revises: 012
+Create Date: 2025-05-10 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "013"
+down_revision: Union[str, None] = "012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Build concurrently so large leads tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_leads_phone_project_created_at",
+            "leads",
+            ["normalized_phone", "project_type_id", sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_leads_phone_project_created_at",
+            table_name="leads",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,43 @@
+"""Content-addressed offer storage: offer_blobs and offers.blob_sha256
+
+Revision ID: 014
+Revises: 013
+Create Date: 2025-05-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "014"
+down_revision: Union[str, None] = "013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "offer_blobs",
+        sa.Column("sha256", sa.String(64), primary_key=True),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    # Existing offers keep their flat files until app.jobs.import_legacy_offers moves them
+    op.add_column(
+        "offers",
+        sa.Column(
+            "blob_sha256",
+            sa.String(64),
+            sa.ForeignKey("offer_blobs.sha256"),
+            nullable=True,
+        ),
+    )
+    op.create_index("ix_offers_blob_sha256", "offers", ["blob_sha256"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_offers_blob_sha256", table_name="offers")
+    op.drop_column("offers", "blob_sha256")
+    op.drop_table("offer_blobs")
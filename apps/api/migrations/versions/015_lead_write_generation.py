@@ -0,0 +1,40 @@
+"""Lead write generation for cached list counts
+
+Revision ID: 015
+Revises: 014
+Create Date: 2025-05-24 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "015"
+down_revision: Union[str, None] = "014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A sequence rather than a counter row: nextval() takes no row lock, so
+    # concurrent lead writers never queue on it
+    op.execute("CREATE SEQUENCE IF NOT EXISTS lead_write_generation")
+    op.execute(
+        "CREATE OR REPLACE FUNCTION leads_bump_write_generation() RETURNS trigger "
+        "LANGUAGE plpgsql AS $$ BEGIN "
+        "PERFORM nextval('lead_write_generation'); RETURN NULL; END $$"
+    )
+    # Deferred to commit, so the generation moves when the write becomes
+    # visible rather than when the statement runs
+    op.execute(
+        "CREATE CONSTRAINT TRIGGER leads_write_generation "
+        "AFTER INSERT OR UPDATE OR DELETE ON leads "
+        "DEFERRABLE INITIALLY DEFERRED "
+        "FOR EACH ROW EXECUTE FUNCTION leads_bump_write_generation()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS leads_write_generation ON leads")
+    op.execute("DROP FUNCTION IF EXISTS leads_bump_write_generation()")
+    op.execute("DROP SEQUENCE IF EXISTS lead_write_generation")
@@ -0,0 +1,24 @@
+"""Coalesce key on webhook dead letters
+
+Revision ID: 016
+Revises: 015
+Create Date: 2025-05-31 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "016"
+down_revision: Union[str, None] = "015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("webhook_dead_letters", sa.Column("coalesce_key", sa.String(50), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("webhook_dead_letters", "coalesce_key")
@@ -5,7 +5,7 @@ import { useParams, notFound } from 'next/navigation';
 import { getProjectTypeByPath, PIPELINE_STATUSES, PROJECT_TYPES } from '@/lib/constants';
 import { leadsApi } from '@/lib/api';
 import { useLeads } from '@/hooks/useLeads';
-import type { Lead, LeadStatus } from '@/lib/types';
+import type { Lead, LeadStatus, LeadSummary } from '@/lib/types';
 import type { FilterValues } from '@/components/FilterBar';
 
 import ProtectedRoute from '@/components/ProtectedRoute';
@@ -71,9 +71,14 @@ export default function BoardPage() {
     [setPage],
   );
 
-  const handleLeadClick = useCallback((lead: Lead) => {
-    setSelectedLead(lead);
-    setDrawerOpen(true);
+  const handleLeadClick = useCallback(async (lead: LeadSummary) => {
+    // The list only carries the summary view; the drawer needs the full lead
+    try {
+      setSelectedLead(await leadsApi.get(lead.id));
+      setDrawerOpen(true);
+    } catch (err) {
+      console.error('שגיאה בטעינת ליד:', err);
+    }
   }, []);
 
   const handleTransition = useCallback(
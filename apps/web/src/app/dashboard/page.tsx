@@ -1,16 +1,16 @@
 'use client';
 
 import { useEffect, useState } from 'react';
-import { leadsApi } from '@/lib/api';
-import { PROJECT_TYPES, SOURCES, getSourceLabel } from '@/lib/constants';
-import type { Lead, PaginatedResponse } from '@/lib/types';
+import { dashboardApi } from '@/lib/api';
+import { PROJECT_TYPES, getSourceLabel } from '@/lib/constants';
+import type { DashboardStats } from '@/lib/types';
 import KPICard from '@/components/KPICard';
 import { LeadsByProjectChart, LeadsBySourceChart } from '@/components/DashboardCharts';
 import Sidebar from '@/components/Sidebar';
 import Header from '@/components/Header';
 
 export default function DashboardPage() {
-  const [leads, setLeads] = useState<Lead[]>([]);
+  const [stats, setStats] = useState<DashboardStats | null>(null);
   const [loading, setLoading] = useState(true);
   const [sidebarOpen, setSidebarOpen] = useState(false);
 
@@ -20,8 +20,7 @@ export default function DashboardPage() {
 
   async function loadData() {
     try {
-      const res = await leadsApi.list({ page_size: 100 });
-      setLeads(res.items);
+      setStats(await dashboardApi.stats());
     } catch (err) {
       console.error(err);
     } finally {
@@ -29,48 +28,22 @@ export default function DashboardPage() {
     }
   }
 
-  const now = new Date();
-  const thisMonth = leads.filter((l) => {
-    const created = new Date(l.created_at);
-    return created.getMonth() === now.getMonth() && created.getFullYear() === now.getFullYear();
-  });
+  const leadsThisMonth = stats?.leads_this_month ?? 0;
+  const winsThisMonth = stats?.wins_this_month ?? 0;
+  const conversionRate = (stats?.conversion_rate ?? 0).toFixed(1);
 
-  const winsThisMonth = thisMonth.filter((l) => l.status === 'won').length;
-  const leadsThisMonth = thisMonth.length;
-  const conversionRate = leadsThisMonth > 0 ? ((winsThisMonth / leadsThisMonth) * 100).toFixed(1) : '0';
-
-  const byProject = PROJECT_TYPES.map((pt) => ({
-    name: pt.label,
-    value: leads.filter((l) => {
-      const ptKey = PROJECT_TYPES.find(p => p.key === pt.key);
-      return ptKey !== undefined;
-    }).length,
-  }));
-
-  // Count by project type using project_type_id mapping
-  const projectCounts = [0, 0, 0, 0];
-  leads.forEach((l) => {
-    if (l.project_type_id >= 1 && l.project_type_id <= 4) {
-      projectCounts[l.project_type_id - 1]++;
-    }
-  });
-
-  const byProjectData = PROJECT_TYPES.map((pt, i) => ({
+  const byProjectData = PROJECT_TYPES.map((pt) => ({
     name: pt.label,
-    value: projectCounts[i],
+    value: stats?.leads_by_project_type.find((p) => p.project_type === pt.key)?.count ?? 0,
   }));
 
-  const sourceCounts: Record<string, number> = {};
-  leads.forEach((l) => {
-    const key = l.source || 'manual';
-    sourceCounts[key] = (sourceCounts[key] || 0) + 1;
-  });
-
-  const bySourceData = Object.entries(sourceCounts).map(([key, count]) => ({
-    name: getSourceLabel(key),
+  const bySourceData = (stats?.leads_by_source ?? []).map(({ source, count }) => ({
+    name: getSourceLabel(source),
     value: count,
   }));
 
+  const totalLeads = (stats?.leads_by_source ?? []).reduce((sum, s) => sum + s.count, 0);
+
   return (
     <div className="flex h-screen bg-gray-50">
       <Sidebar open={sidebarOpen} onClose={() => setSidebarOpen(false)} />
@@ -88,7 +61,7 @@ export default function DashboardPage() {
                 <KPICard label="לידים החודש" value={leadsThisMonth} color="text-blue-600" />
                 <KPICard label="זכיות החודש" value={winsThisMonth} color="text-green-600" />
                 <KPICard label="אחוז המרה" value={`${conversionRate}%`} color="text-purple-600" />
-                <KPICard label="סה״כ לידים" value={leads.length} color="text-gray-700" />
+                <KPICard label="סה״כ לידים" value={totalLeads} color="text-gray-700" />
               </div>
 
               {/* Charts */}
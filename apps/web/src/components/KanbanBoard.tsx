@@ -12,7 +12,7 @@ import {
   type DragStartEvent,
   type DragEndEvent,
 } from '@dnd-kit/core';
-import type { Lead, LeadStatus } from '@/lib/types';
+import type { LeadStatus, LeadSummary } from '@/lib/types';
 import { PIPELINE_STATUSES, type PipelineStatus } from '@/lib/constants';
 import LeadCard from './LeadCard';
 
@@ -21,10 +21,10 @@ import LeadCard from './LeadCard';
    ────────────────────────────────────────────── */
 
 interface KanbanBoardProps {
-  leads: Lead[];
+  leads: LeadSummary[];
   statuses?: PipelineStatus[];
   onTransition: (leadId: string, newStatus: LeadStatus) => void;
-  onLeadClick: (lead: Lead) => void;
+  onLeadClick: (lead: LeadSummary) => void;
 }
 
 /* ──────────────────────────────────────────────
@@ -35,8 +35,8 @@ function DraggableCard({
   lead,
   onLeadClick,
 }: {
-  lead: Lead;
-  onLeadClick: (lead: Lead) => void;
+  lead: LeadSummary;
+  onLeadClick: (lead: LeadSummary) => void;
 }) {
   const { attributes, listeners, setNodeRef, transform, isDragging } = useDraggable({
     id: lead.id,
@@ -68,8 +68,8 @@ function KanbanColumn({
   onLeadClick,
 }: {
   status: PipelineStatus;
-  leads: Lead[];
-  onLeadClick: (lead: Lead) => void;
+  leads: LeadSummary[];
+  onLeadClick: (lead: LeadSummary) => void;
 }) {
   const { isOver, setNodeRef } = useDroppable({
     id: status.key,
@@ -132,7 +132,7 @@ export default function KanbanBoard({
   );
 
   // Group leads by status
-  const leadsByStatus: Record<string, Lead[]> = {};
+  const leadsByStatus: Record<string, LeadSummary[]> = {};
   for (const status of statuses) {
     leadsByStatus[status.key] = [];
   }
@@ -1,13 +1,13 @@
 'use client';
 
-import type { Lead } from '@/lib/types';
+import type { LeadSummary } from '@/lib/types';
 import { formatPhoneDisplay } from '@/lib/phone';
 import { getTemperatureLabel, getTemperatureColor } from '@/lib/constants';
 import StatusBadge from './StatusBadge';
 
 interface LeadCardProps {
-  lead: Lead;
-  onClick?: (lead: Lead) => void;
+  lead: LeadSummary;
+  onClick?: (lead: LeadSummary) => void;
 }
 
 /**
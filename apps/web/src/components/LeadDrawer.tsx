@@ -10,7 +10,7 @@ import {
   getStatusColor,
 } from '@/lib/constants';
 import { formatPhoneDisplay } from '@/lib/phone';
-import type { Lead, LeadStatus, LeadTemperature, User } from '@/lib/types';
+import type { Lead, LeadBotPayload, LeadStatus, LeadTemperature, User } from '@/lib/types';
 import ActivityTimeline from './ActivityTimeline';
 import OffersList from './OffersList';
 
@@ -124,6 +124,11 @@ export default function LeadDrawer({ lead, isOpen, onClose, onUpdate }: LeadDraw
   // Closer assign
   const [assigningCloser, setAssigningCloser] = useState(false);
 
+  // Raw bot payloads (loaded only when the bot tab is opened)
+  const [botPayloads, setBotPayloads] = useState<LeadBotPayload[] | null>(null);
+  const [loadingBotPayloads, setLoadingBotPayloads] = useState(false);
+  const [botPayloadVersion, setBotPayloadVersion] = useState<number | null>(null);
+
   /* ── Populate form when lead changes ─── */
   useEffect(() => {
     if (lead) {
@@ -147,6 +152,39 @@ export default function LeadDrawer({ lead, isOpen, onClose, onUpdate }: LeadDraw
     }
   }, [isOpen]);
 
+  /* ── Forget bot payloads of the previous lead ─── */
+  useEffect(() => {
+    setBotPayloads(null);
+    setBotPayloadVersion(null);
+  }, [lead?.id]);
+
+  /* ── Fetch raw bot payloads when the bot tab opens ─── */
+  useEffect(() => {
+    if (!isOpen || !lead || activeTab !== 'bot' || botPayloads !== null) return;
+
+    let cancelled = false;
+    setLoadingBotPayloads(true);
+
+    leadsApi
+      .botPayloads(lead.id)
+      .then((payloads) => {
+        if (!cancelled) {
+          setBotPayloads(payloads);
+          setBotPayloadVersion(payloads[0]?.version ?? null);
+        }
+      })
+      .catch(() => {
+        if (!cancelled) setBotPayloads([]);
+      })
+      .finally(() => {
+        if (!cancelled) setLoadingBotPayloads(false);
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [isOpen, lead, activeTab, botPayloads]);
+
   /* ── Fetch closers ─── */
   useEffect(() => {
     if (!isOpen) return;
@@ -534,13 +572,34 @@ export default function LeadDrawer({ lead, isOpen, onClose, onUpdate }: LeadDraw
 
               {/* ── Raw bot payload ─── */}
               <div>
-                <h3 className="text-sm font-semibold text-gray-700 mb-3">נתוני בוט (גולמי)</h3>
-                {lead.bot_payload ? (
+                <div className="flex items-center justify-between mb-3">
+                  <h3 className="text-sm font-semibold text-gray-700">נתוני בוט (גולמי)</h3>
+                  {botPayloads && botPayloads.length > 1 && (
+                    <select
+                      value={botPayloadVersion ?? ''}
+                      onChange={(e) => setBotPayloadVersion(Number(e.target.value))}
+                      className="rounded-md border border-gray-300 px-2 py-1 text-xs text-gray-700 focus:border-blue-500 focus:outline-none"
+                    >
+                      {botPayloads.map((p) => (
+                        <option key={p.version} value={p.version}>
+                          {`גרסה ${p.version} – ${new Date(p.received_at).toLocaleString('he-IL')}`}
+                        </option>
+                      ))}
+                    </select>
+                  )}
+                </div>
+                {loadingBotPayloads || botPayloads === null ? (
+                  <p className="text-sm text-gray-500 text-center py-6">טוען...</p>
+                ) : botPayloads.length > 0 ? (
                   <pre
                     dir="ltr"
                     className="rounded-lg border border-gray-200 bg-gray-900 p-4 text-xs text-green-400 overflow-x-auto max-h-96 overflow-y-auto whitespace-pre-wrap"
                   >
-                    {JSON.stringify(lead.bot_payload, null, 2)}
+                    {JSON.stringify(
+                      (botPayloads.find((p) => p.version === botPayloadVersion) ?? botPayloads[0]).payload,
+                      null,
+                      2,
+                    )}
                   </pre>
                 ) : (
                   <p className="text-sm text-gray-500 text-center py-6 bg-gray-50 rounded-lg border border-gray-200">
@@ -1,6 +1,6 @@
 'use client';
 
-import type { Lead } from '@/lib/types';
+import type { LeadSummary } from '@/lib/types';
 import { formatPhoneDisplay } from '@/lib/phone';
 import {
   getStatusLabel,
@@ -12,11 +12,11 @@ import {
 import StatusBadge from './StatusBadge';
 
 interface LeadTableProps {
-  leads: Lead[];
+  leads: LeadSummary[];
   page: number;
   totalPages: number;
   onPageChange: (page: number) => void;
-  onLeadClick: (lead: Lead) => void;
+  onLeadClick: (lead: LeadSummary) => void;
 }
 
 function formatDate(dateString: string): string {
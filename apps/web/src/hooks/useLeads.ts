@@ -1,17 +1,17 @@
 'use client';
 
 import { useState, useEffect, useCallback } from 'react';
-import type { Lead, LeadFilters, PaginatedResponse } from '@/lib/types';
+import type { LeadFilters, LeadSummary, PaginatedResponse } from '@/lib/types';
 import { leadsApi } from '@/lib/api';
 
 interface UseLeadsOptions {
   project_type_key?: string;
-  filters?: Omit<LeadFilters, 'project_type_key' | 'page'>;
+  filters?: Omit<LeadFilters, 'project_type_key' | 'page' | 'view' | 'fields'>;
   pageSize?: number;
 }
 
 interface UseLeadsReturn {
-  leads: Lead[];
+  leads: LeadSummary[];
   total: number;
   loading: boolean;
   error: string | null;
@@ -26,7 +26,7 @@ export function useLeads({
   filters = {},
   pageSize = 25,
 }: UseLeadsOptions = {}): UseLeadsReturn {
-  const [leads, setLeads] = useState<Lead[]>([]);
+  const [leads, setLeads] = useState<LeadSummary[]>([]);
   const [total, setTotal] = useState(0);
   const [pages, setPages] = useState(0);
   const [loading, setLoading] = useState(true);
@@ -53,12 +53,13 @@ export function useLeads({
       queryFilters.project_type_key = project_type_key;
     }
 
+    // Cards and table rows only need the summary; the drawer loads the full lead
     leadsApi
-      .list(queryFilters)
-      .then((res: PaginatedResponse<Lead>) => {
+      .listSummaries(queryFilters)
+      .then((res: PaginatedResponse<LeadSummary>) => {
         if (!cancelled) {
           setLeads(res.items);
-          setTotal(res.total);
+          setTotal(res.total ?? 0);
           setPages(res.pages);
         }
       })
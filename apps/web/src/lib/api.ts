@@ -1,18 +1,23 @@
 import type {
   User,
   Lead,
+  LeadSummary,
+  LeadBotPayload,
   Activity,
   Offer,
   CampaignMapping,
+  ProjectType,
   LoginRequest,
   LoginResponse,
   UserCreateRequest,
   UserUpdateRequest,
   LeadUpdateRequest,
   LeadFilters,
+  LeadBoardResponse,
   PaginatedResponse,
   ActivityCreateRequest,
   OfferCreateRequest,
+  OfferUploadTarget,
   CampaignMappingCreateRequest,
   CampaignMappingUpdateRequest,
   DashboardStats,
@@ -186,6 +191,23 @@ export const leadsApi = {
     return request<PaginatedResponse<Lead>>(`/leads${buildLeadQuery(filters)}`);
   },
 
+  listSummaries(
+    filters: Omit<LeadFilters, 'view' | 'fields'> = {},
+  ): Promise<PaginatedResponse<LeadSummary>> {
+    return request<PaginatedResponse<LeadSummary>>(
+      `/leads${buildLeadQuery({ ...filters, view: 'summary' })}`,
+    );
+  },
+
+  board(
+    projectTypeKey: string,
+    filters: Omit<LeadFilters, 'project_type_key' | 'status'> & { limit?: number } = {},
+  ): Promise<LeadBoardResponse> {
+    return request<LeadBoardResponse>(
+      `/leads/board/${projectTypeKey}${buildLeadQuery(filters)}`,
+    );
+  },
+
   get(id: string): Promise<Lead> {
     return request<Lead>(`/leads/${id}`);
   },
@@ -217,6 +239,10 @@ export const leadsApi = {
       body: JSON.stringify({ closer_id: closerId }),
     });
   },
+
+  botPayloads(id: string): Promise<LeadBotPayload[]> {
+    return request<LeadBotPayload[]>(`/leads/${id}/bot-payloads`);
+  },
 };
 
 /* ──────────────────────────────────────────────
@@ -245,7 +271,36 @@ export const offersApi = {
     return request<Offer[]>(`/leads/${leadId}/offers`);
   },
 
-  create(leadId: string, formData: FormData): Promise<Offer> {
+  /**
+   * Upload an offer PDF. The API answers with where the bytes should go:
+   * nowhere if the same PDF is already stored, straight to object storage
+   * with a presigned URL, or (local storage) through the API as before.
+   */
+  async create(leadId: string, formData: FormData): Promise<Offer> {
+    const file = formData.get('file');
+    if (file instanceof File && typeof crypto !== 'undefined' && crypto.subtle) {
+      const digest = await crypto.subtle.digest('SHA-256', await file.arrayBuffer());
+      const sha256 = Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, '0')).join('');
+      const target = await request<OfferUploadTarget>(`/leads/${leadId}/offers/uploads`, {
+        method: 'POST',
+        body: JSON.stringify({ sha256, size: file.size }),
+      });
+      if (target.mode !== 'api') {
+        if (target.mode === 'direct' && target.url) {
+          const res = await fetch(target.url, { method: 'PUT', headers: target.headers, body: file });
+          if (!res.ok) throw new ApiError('העלאת הקובץ נכשלה', res.status);
+        }
+        const amount = formData.get('amount_estimated');
+        return request<Offer>(`/leads/${leadId}/offers/uploaded`, {
+          method: 'POST',
+          body: JSON.stringify({
+            sha256,
+            status: formData.get('offer_status') ?? 'draft',
+            amount_estimated: amount ? Number(amount) : null,
+          }),
+        });
+      }
+    }
     return request<Offer>(`/leads/${leadId}/offers`, {
       method: 'POST',
       body: formData,
@@ -285,6 +340,16 @@ export const campaignMappingsApi = {
   },
 };
 
+/* ──────────────────────────────────────────────
+   Project Types
+   ────────────────────────────────────────────── */
+
+export const projectTypesApi = {
+  list(): Promise<ProjectType[]> {
+    return request<ProjectType[]>('/project-types');
+  },
+};
+
 /* ──────────────────────────────────────────────
    Dashboard
    ────────────────────────────────────────────── */
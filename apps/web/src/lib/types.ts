@@ -62,8 +62,7 @@ export interface Lead {
   qualifier_id: string | null;
   closer_id: string | null;
 
-  // Bot fields
-  bot_payload: Record<string, unknown> | null;
+  // Bot fields (raw payloads: leadsApi.botPayloads)
   bot_track: string | null;
   bot_completed: boolean;
 
@@ -93,6 +92,7 @@ export interface Lead {
   reno_type: string | null;
   reno_has_plan: string | null;
 
+  status_entered_at: string;
   created_at: string;
   updated_at: string;
 
@@ -130,11 +130,17 @@ export interface LeadStatusHistory {
   lead_id: string;
   from_status: string | null;
   to_status: string;
-  changed_by: string;
+  changed_by: string | null;
   changed_at: string;
   changed_by_user?: User;
 }
 
+export interface LeadBotPayload {
+  version: number;
+  payload: Record<string, unknown>;
+  received_at: string;
+}
+
 export interface CampaignMapping {
   id: string;
   contains_text: string;
@@ -220,14 +226,51 @@ export interface LeadFilters {
   search?: string;
   page?: number;
   page_size?: number;
+  sort?: 'created_at' | 'updated_at' | 'status' | 'temperature';
+  order?: 'asc' | 'desc';
+  cursor?: string;
+  count?: 'exact' | 'estimate' | 'none';
+  view?: 'full' | 'summary';
+  fields?: string;
 }
 
 export interface PaginatedResponse<T> {
   items: T[];
-  total: number;
+  total: number | null;
+  total_kind?: 'exact' | 'estimate' | 'none';
   page: number;
   page_size: number;
   pages: number;
+  next_cursor?: string | null;
+}
+
+export type LeadSummary = Pick<
+  Lead,
+  | 'id'
+  | 'project_type_id'
+  | 'full_name'
+  | 'phone'
+  | 'source'
+  | 'city'
+  | 'temperature'
+  | 'status'
+  | 'qualifier_id'
+  | 'closer_id'
+  | 'bot_completed'
+  | 'status_entered_at'
+  | 'created_at'
+  | 'updated_at'
+>;
+
+export interface LeadBoardColumn {
+  status: LeadStatus;
+  total: number;
+  items: LeadSummary[];
+}
+
+export interface LeadBoardResponse {
+  project_type_key: string;
+  columns: LeadBoardColumn[];
 }
 
 export interface ActivityCreateRequest {
@@ -242,6 +285,12 @@ export interface OfferCreateRequest {
   status?: OfferStatus;
 }
 
+export interface OfferUploadTarget {
+  mode: 'exists' | 'direct' | 'api';
+  url: string | null;
+  headers: Record<string, string>;
+}
+
 export interface CampaignMappingCreateRequest {
   contains_text: string;
   project_type_key: string;